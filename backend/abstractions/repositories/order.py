@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional, AsyncIterator
 from datetime import datetime
 from uuid import UUID
 
 from abstractions.repositories import CRUDRepositoryInterface
 from domain.dto import CreateOrderDTO, UpdateOrderDTO
-from domain.models.order import Order
+from domain.models.order import Order, OrderListItem
+from domain.models.order_reminder import OrderReminder
+from domain.responses.seller_report import SellerReport
+from infrastructure.enums.order_status import OrderStatus
 
 
 class OrderRepositoryInterface(
@@ -13,7 +16,12 @@ class OrderRepositoryInterface(
     ABC):
 
     @abstractmethod
-    async def get_orders_by_user(self, user_id: UUID) -> List[Order]:
+    async def get_list(self, limit: int = 100, offset: int = 0) -> list[OrderListItem]:
+        """Компактные строки для списков; полный заказ — через get."""
+        ...
+
+    @abstractmethod
+    async def get_orders_by_user(self, user_id: UUID) -> list[OrderListItem]:
         ...
 
     @abstractmethod
@@ -21,11 +29,47 @@ class OrderRepositoryInterface(
         ...
 
     @abstractmethod
-    async def get_orders_by_seller(self, seller_id: UUID) -> list[Order]:
+    async def get_orders_by_seller(self, seller_id: UUID) -> list[OrderListItem]:
+        ...
+
+    @abstractmethod
+    async def get_all_orders_by_seller(self, seller_id: UUID) -> list[OrderListItem]:
         ...
 
     @abstractmethod
-    async def get_all_orders_by_seller(self, seller_id: UUID) -> list[Order]:
+    async def get_seller_report(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+    ) -> SellerReport:
+        """Агрегаты по заказам продавца за период: статусы, шаги, кешбэк, выплаты по дням, товары."""
+        ...
+
+    @abstractmethod
+    async def get_seller_report_orders(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+            status: Optional[OrderStatus] = None,
+            step: Optional[int] = None,
+            product_id: Optional[UUID] = None,
+            limit: int = 50,
+            offset: int = 0,
+    ) -> list[OrderListItem]:
+        """Страница заказов за отчётом — под фильтры, по которым кликнули в сводке."""
+        ...
+
+    @abstractmethod
+    def stream_seller_orders(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+            status: Optional[OrderStatus] = None,
+    ) -> AsyncIterator[OrderListItem]:
+        """Все заказы продавца за период потоком, без загрузки результата целиком."""
         ...
 
     @abstractmethod
@@ -46,6 +90,21 @@ class OrderRepositoryInterface(
         """Вернуть заказы без движения после отправленного напоминания (для отмены)."""
         ...
 
+    @abstractmethod
+    async def claim_reminders(self, cutoff: datetime, limit: int) -> list[OrderReminder]:
+        """Забрать пачку заказов под напоминание и отметить их REMINDER_SENT."""
+        ...
+
+    @abstractmethod
+    async def release_reminders(self, reminders: list[OrderReminder]) -> None:
+        """Снять отметку с напоминаний, которые не удалось отправить."""
+        ...
+
+    @abstractmethod
+    async def cancel_inactive(self, reminded_before: datetime, limit: int) -> list[UUID]:
+        """Отменить пачку заказов без движения после напоминания и вернуть раздачи."""
+        ...
+
     @abstractmethod
     async def set_reminder_sent(self, order_id: UUID, when: datetime) -> None:
         # Совместимость (пока колонка удалена)
@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
 from abstractions.repositories import CRUDRepositoryInterface
 from domain.dto import CreateProductDTO, UpdateProductDTO
 from domain.models import Product
+from domain.models.product import ProductListItem
+from domain.models.product_reservation import ProductReservation
+from infrastructure.enums.product_status import ProductStatus
 
 
 class ProductRepositoryInterface(
@@ -20,13 +24,40 @@ class ProductRepositoryInterface(
         ...
 
     @abstractmethod
-    async def get_by_seller(self, seller_id: UUID) -> Optional[list[Product]]:
+    async def get_list(self, limit: int = 100, offset: int = 0) -> list[ProductListItem]:
+        """Компактные строки для списков; полный товар — через get."""
         ...
 
     @abstractmethod
-    async def get_products_to_review(self) -> list[Product]:
+    async def get_by_seller(self, seller_id: UUID) -> list[ProductListItem]:
         ...
 
     @abstractmethod
-    async def get_active_products(self, limit: int = 100, offset: int = 9, search: Optional[str] = None) -> list[Product]:
+    async def get_products_to_review(self) -> list[ProductListItem]:
+        ...
+
+    @abstractmethod
+    async def reserve_unit(self, product_id: UUID) -> Optional[ProductReservation]:
+        """Атомарно списывает одну раздачу; None — если остаток закончился, NotFoundException — если товара нет."""
+        ...
+
+    @abstractmethod
+    async def release_unit(self, product_id: UUID, status: Optional[ProductStatus] = None) -> None:
+        """Возвращает одну раздачу; без status архивный товар снова становится активным."""
+        ...
+
+    @abstractmethod
+    async def get_active_products(
+            self,
+            limit: int = 100,
+            offset: int = 9,
+            search: Optional[str] = None,
+            after: Optional[tuple[datetime, UUID] | tuple[float, datetime, UUID]] = None,
+            ranked: bool = False,
+    ) -> list[Product]:
+        """Каталог, от новых к старым; after — (created_at, id) последнего товара предыдущей страницы.
+
+        ranked=True вместе с search сортирует по релевантности и возвращает ProductSearchHit;
+        after тогда — (rank, created_at, id) последнего результата.
+        """
         ...
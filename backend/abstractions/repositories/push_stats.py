@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from domain.models.push_stats import PushStats
+
+
+class PushStatsRepositoryInterface(ABC):
+    @abstractmethod
+    async def get_by_push(self, push_id: UUID) -> PushStats:
+        """Вернуть счётчики пуша (нули, если пуш ещё не активировали)."""
+        ...
+
+    @abstractmethod
+    async def get_all(self) -> list[PushStats]:
+        """Счётчики всех не удалённых пушей, у которых была активация."""
+        ...
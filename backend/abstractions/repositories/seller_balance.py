@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from domain.models.seller_balance import SellerBalance
+
+
+class SellerBalanceRepositoryInterface(ABC):
+    @abstractmethod
+    async def get_by_seller(self, seller_id: UUID) -> SellerBalance:
+        """Вернуть агрегат продавца (нули, если у продавца ещё нет товаров и заказов)."""
+        ...
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from typing import AsyncContextManager
+
+
+class UnitOfWorkInterface(ABC):
+    @abstractmethod
+    def begin(self) -> AsyncContextManager[None]:
+        """Все обращения репозиториев внутри блока идут через одну сессию и один коммит.
+
+        Вложенный begin() присоединяется к уже открытой транзакции.
+        """
+        ...
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager
+from typing import Collection
+
+
+class UploadReferenceRepositoryInterface(ABC):
+    @abstractmethod
+    async def get_referenced(self, paths: Collection[str]) -> set[str]:
+        """Какие из переданных путей загрузок ещё упоминаются в товарах, пушах или скриншотах заказов."""
+        ...
+
+    @abstractmethod
+    def gc_lock(self) -> AbstractAsyncContextManager[bool]:
+        """Блокировка сборки мусора на весь кластер: True — взяли, False — уже собирает другой процесс."""
+        ...
@@ -1,8 +1,10 @@
 from abc import ABC
+from datetime import datetime
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 from abstractions.repositories import CRUDRepositoryInterface
-from domain.dto.user_history import CreateUserHistoryDTO, UpdateUserHistoryDTO
+from domain.dto.user_history import CreateUserHistoryDTO, UpdateUserHistoryDTO, UserHistoryFilter
 from infrastructure.entities import UserHistory
 
 
@@ -10,5 +12,17 @@ class UserHistoryRepositoryInterface(
     CRUDRepositoryInterface[UserHistory, CreateUserHistoryDTO, UpdateUserHistoryDTO],
     ABC,
 ):
-    async def get_by_user(self, user_id: UUID) -> list[UserHistory]:
+    async def get_by_user(
+            self,
+            user_id: UUID,
+            limit: int = 100,
+            after: Optional[tuple[datetime, UUID]] = None,
+            filters: Optional[UserHistoryFilter] = None,
+            with_snapshots: bool = True,
+    ) -> list[UserHistory]:
+        """Страница истории от новых к старым; after — (date, id) последней отданной строки."""
+        ...
+
+    def stream_by_user(self, user_id: UUID) -> AsyncIterator[UserHistory]:
+        """История пользователя по порядку дат, потоком через серверный курсор."""
         ...
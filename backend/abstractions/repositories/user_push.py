@@ -4,7 +4,7 @@ from typing import Optional
 from uuid import UUID
 
 from abstractions.repositories import CRUDRepositoryInterface
-from domain.dto.user_push import CreateUserPushDTO, UpdateUserPushDTO
+from domain.dto.user_push import CreateUserPushDTO, UpdateUserPushDTO, PushAudience
 from domain.models.user_push import UserPush
 from infrastructure.enums.push_status import PushStatus
 
@@ -20,3 +20,8 @@ class UserPushRepositoryInterface(
     @abstractmethod
     async def set_status(self, user_push_id: UUID, status: PushStatus, sent_at: Optional[datetime] = None):
         ...
+
+    @abstractmethod
+    async def enqueue_audience(self, push_id: UUID, audience: PushAudience) -> int:
+        """Ставит пуш в очередь всем подходящим пользователям, возвращает число новых записей."""
+        ...
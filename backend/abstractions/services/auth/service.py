@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Optional
 from uuid import UUID
 
+from domain.models.principal import Principal
 from domain.responses.auth import AuthTokens
 
 
@@ -10,6 +11,10 @@ class AuthServiceInterface(ABC):
     async def get_user_id_from_jwt(self, token: str) -> UUID:
         ...
 
+    @abstractmethod
+    async def get_principal_from_jwt(self, token: str) -> Principal:
+        ...
+
     @abstractmethod
     async def create_token(self, init_data: str, ref_user_id: Optional[UUID] = None) -> AuthTokens:
         ...
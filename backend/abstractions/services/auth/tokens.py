@@ -1,10 +1,7 @@
-import logging
 from abc import ABC, abstractmethod
 
 from domain.responses.auth import AuthTokens
 
-logger = logging.getLogger(__name__)
-
 
 class TokenServiceInterface(ABC):
     @abstractmethod
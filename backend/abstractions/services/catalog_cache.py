@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Hashable
+
+from domain.models.cached_response import CachedResponse
+
+
+class CatalogCacheInterface(ABC):
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        ...
+
+    @abstractmethod
+    def bump(self) -> None:
+        """Каталог изменился — все закэшированные ответы устарели."""
+        ...
+
+    @abstractmethod
+    async def get_or_load(
+            self,
+            key: Hashable,
+            loader: Callable[[], Awaitable[CachedResponse]],
+    ) -> CachedResponse:
+        """Ответ из кэша; loader вызывается только при промахе, один раз на ключ."""
+        ...
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+from domain.dto.user_history import CreateUserHistoryDTO
+
+
+class HistoryWriterInterface(ABC):
+    @abstractmethod
+    async def write(self, dto: CreateUserHistoryDTO) -> None:
+        ...
+
+    @abstractmethod
+    async def write_many(self, dtos: Iterable[CreateUserHistoryDTO]) -> None:
+        """Ставит записи в очередь; в БД они попадут при ближайшем сбросе."""
+        ...
+
+    @abstractmethod
+    async def flush(self) -> None:
+        """Пишет всё накопленное прямо сейчас."""
+        ...
+
+    @abstractmethod
+    def start(self) -> None:
+        ...
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Останавливает фоновый сброс и дописывает остаток буфера."""
+        ...
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class ImageVariantServiceInterface(ABC):
+    @abstractmethod
+    def schedule(self, path: Optional[str]) -> None:
+        """Ставит в очередь построение вариантов загруженной картинки; ответ запроса не ждёт."""
+        ...
+
+    @abstractmethod
+    async def render(self, path: str) -> list[str]:
+        """Строит варианты сразу и возвращает имена созданных."""
+        ...
+
+    @abstractmethod
+    def start(self) -> None:
+        ...
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Дожидается поставленных задач и останавливает пул процессов."""
+        ...
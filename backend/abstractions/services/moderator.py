@@ -4,14 +4,17 @@ from uuid import UUID
 
 from domain.dto import CreatePushDTO, UpdatePushDTO
 from domain.dto.moderator_review import CreateModeratorReviewDTO
+from domain.dto.user_push import PushAudience
 from domain.models import Product, User, Push
+from domain.models.product import ProductListItem
+from domain.models.push_stats import PushStats
 from infrastructure.entities import ModeratorReview
 from routes.requests.moderator import UpdateProductStatusRequest
 
 
 class ModeratorServiceInterface(ABC):
     @abstractmethod
-    async def get_products(self) -> list[Product]:
+    async def get_products(self) -> list[ProductListItem]:
         ...
 
     @abstractmethod
@@ -19,7 +22,7 @@ class ModeratorServiceInterface(ABC):
         ...
 
     @abstractmethod
-    async def get_products_to_review(self) -> list[Product]:
+    async def get_products_to_review(self) -> list[ProductListItem]:
         ...
 
     @abstractmethod
@@ -79,13 +82,21 @@ class ModeratorServiceInterface(ABC):
         ...
 
     @abstractmethod
-    async def activate_push(self, push_id: UUID, user_ids: list[UUID]) -> None:
+    async def activate_push(self, push_id: UUID, audience: PushAudience) -> int:
         ...
 
     @abstractmethod
     async def get_pushes(self) -> list[Push]:
         ...
 
+    @abstractmethod
+    async def get_push_stats(self, push_id: UUID) -> PushStats:
+        ...
+
+    @abstractmethod
+    async def get_pushes_stats(self) -> list[PushStats]:
+        ...
+
     @abstractmethod
     async def get_push(self, push_id: UUID) -> Push:
         ...
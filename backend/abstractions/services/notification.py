@@ -2,7 +2,10 @@ from abc import ABC, abstractmethod
 from uuid import UUID
 
 from domain.dto import CreatePushDTO, UpdatePushDTO
+from domain.dto.user_push import PushAudience
 from domain.models import Push
+from domain.models.push_stats import PushStats
+from domain.models.order_reminder import OrderReminder
 
 
 class NotificationServiceInterface(ABC):
@@ -22,13 +25,21 @@ class NotificationServiceInterface(ABC):
         ...
 
     @abstractmethod
-    async def activate_push(self, push_id: UUID, user_ids: list[UUID]) -> None:
+    async def activate_push(self, push_id: UUID, audience: PushAudience) -> int:
         ...
 
     @abstractmethod
     async def get_pushes(self) -> list[Push]:
         ...
 
+    @abstractmethod
+    async def get_push_stats(self, push_id: UUID) -> PushStats:
+        ...
+
+    @abstractmethod
+    async def get_pushes_stats(self) -> list[PushStats]:
+        ...
+
     @abstractmethod
     async def get_push(self, push_id: UUID) -> Push:
         ...
@@ -49,3 +60,8 @@ class NotificationServiceInterface(ABC):
     async def send_order_progress_reminder(self, user_id: UUID, order_id: UUID) -> None:
         """Отправить пользователю напоминание о продолжении выкупа по заказу."""
         ...
+
+    @abstractmethod
+    async def send_order_progress_reminders(self, reminders: list[OrderReminder]) -> list[OrderReminder]:
+        """Разослать пачку напоминаний; возвращает те, что отправить не удалось."""
+        ...
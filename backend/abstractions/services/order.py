@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, AsyncIterator
 from uuid import UUID
 
 from domain.dto.order import CreateOrderDTO, UpdateOrderDTO
-from domain.models.order import Order
+from domain.models.order import Order, OrderListItem
 from domain.responses.order_report import OrderReport
+from domain.responses.seller_report import SellerReport
+from infrastructure.enums.order_status import OrderStatus
 
 
 class OrderServiceInterface(ABC):
@@ -19,6 +22,11 @@ class OrderServiceInterface(ABC):
     async def trigger_inactivity_check(self, force: bool = False, order_id: Optional[UUID] = None) -> None:
         ...
 
+    @abstractmethod
+    async def process_inactive_orders(self, remind_before: datetime, cancel_reminded_before: datetime) -> None:
+        """Напомнить о заказах без движения и отменить те, по которым напоминание не помогло."""
+        ...
+
 
     @abstractmethod
     async def get_order(self, order_id: UUID) -> Order:
@@ -41,14 +49,14 @@ class OrderServiceInterface(ABC):
         """
 
     @abstractmethod
-    async def get_orders(self, limit: int = 100, offset: int = 0) -> None:
+    async def get_orders(self, limit: int = 100, offset: int = 0) -> list[OrderListItem]:
         """
-        Удаляет заказ с указанным ID.
+        Возвращает страницу всех заказов в компактном виде.
         """
         ...
 
     @abstractmethod
-    async def get_orders_by_user(self, user_id: UUID) -> List[Order]:
+    async def get_orders_by_user(self, user_id: UUID) -> list[OrderListItem]:
         """
         Возвращает список заказов для указанного пользователя.
         """
@@ -59,11 +67,53 @@ class OrderServiceInterface(ABC):
         ...
 
     @abstractmethod
-    async def get_orders_by_seller(self, seller_id: UUID) -> list[Order]:
+    async def get_orders_by_seller(self, seller_id: UUID) -> list[OrderListItem]:
+        ...
+
+    @abstractmethod
+    async def get_all_orders_by_seller(self, seller_id: UUID) -> list[OrderListItem]:
         ...
 
     @abstractmethod
-    async def get_all_orders_by_seller(self, seller_id: UUID) -> list[Order]:
+    async def get_seller_report(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+    ) -> SellerReport:
+        """
+        Сводный отчёт продавца за период, посчитанный в БД.
+        """
+        ...
+
+    @abstractmethod
+    async def get_seller_report_orders(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+            status: Optional[OrderStatus] = None,
+            step: Optional[int] = None,
+            product_id: Optional[UUID] = None,
+            limit: int = 50,
+            offset: int = 0,
+    ) -> list[OrderListItem]:
+        """
+        Возвращает страницу заказов продавца под фильтры отчёта.
+        """
+        ...
+
+    @abstractmethod
+    def stream_seller_orders(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+            status: Optional[OrderStatus] = None,
+    ) -> AsyncIterator[OrderListItem]:
+        """
+        Заказы продавца потоком — для выгрузок.
+        """
         ...
 
     @abstractmethod
@@ -10,3 +10,13 @@ class PermissionServiceInterface(ABC):
     @abstractmethod
     async def is_admin(self, user_id: UUID) -> None:
         ...
+
+    @abstractmethod
+    async def is_seller_or_moderator(self, user_id: UUID, seller_id: UUID) -> None:
+        """Данные продавца видит сам продавец и модераторы/админы."""
+        ...
+
+    @abstractmethod
+    async def is_self_or_moderator(self, user_id: UUID, owner_id: UUID) -> None:
+        """Личные данные пользователя видит он сам и модераторы/админы."""
+        ...
@@ -3,7 +3,8 @@ from typing import List, Optional
 from uuid import UUID
 
 from domain.dto.product import CreateProductDTO, UpdateProductDTO
-from domain.models.product import Product
+from domain.models.product import Product, ProductListItem
+from domain.responses.product import ProductPage
 
 
 class ProductServiceInterface(ABC):
@@ -37,9 +38,28 @@ class ProductServiceInterface(ABC):
         ...
 
     @abstractmethod
-    async def get_by_seller(self, seller_id: UUID) -> Optional[list[Product]]:
+    async def get_by_seller(self, seller_id: UUID) -> list[ProductListItem]:
         ...
 
     @abstractmethod
     async def get_active_products(self, limit: int = 100, offset: int = 0, search: Optional[str] = None) -> list[Product]:
         ...
+
+    @abstractmethod
+    async def get_catalog_page(
+            self,
+            limit: int = 100,
+            cursor: Optional[str] = None,
+            search: Optional[str] = None,
+    ) -> ProductPage:
+        """Страница каталога по keyset-курсору; ValueError — если курсор битый."""
+        ...
+
+    @abstractmethod
+    async def search_products(self, search: str, limit: int = 100, cursor: Optional[str] = None) -> ProductPage:
+        """
+        Поиск по каталогу, отсортированный по релевантности, с подсвеченными фрагментами (ProductSearchHit).
+        Листается своим keyset-курсором по (rank, created_at, id); ValueError — если курсор битый
+        или выдан не поиском.
+        """
+        ...
@@ -15,3 +15,7 @@ class UploadServiceInterface(ABC):
     @abstractmethod
     async def initialize(self) -> None:
         ...
+
+    @abstractmethod
+    async def collect_garbage(self) -> int:
+        ...
@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, AsyncIterator
 from uuid import UUID
 
 from domain.dto.user import CreateUserDTO, UpdateUserDTO
+from domain.dto.user_history import UserHistoryFilter
+from domain.models.principal import Principal
+from domain.models.seller_balance import SellerBalance
 from domain.models.user import User
+from domain.responses.user_history import UserHistoryPage
 from infrastructure.entities import UserHistory, IncreasingBalance
 
 
@@ -90,9 +94,32 @@ class UserServiceInterface(ABC):
         ...
 
     @abstractmethod
-    async def get_user_history(self, user_id: UUID) -> list[UserHistory]:
+    async def get_user_history(
+            self,
+            user_id: UUID,
+            limit: int = 100,
+            cursor: Optional[str] = None,
+            filters: Optional[UserHistoryFilter] = None,
+            with_snapshots: bool = True,
+    ) -> UserHistoryPage:
+        """Страница истории пользователя от новых к старым; курсор — из next_cursor прошлой страницы."""
+        ...
+
+    @abstractmethod
+    def stream_user_history(self, user_id: UUID) -> AsyncIterator[UserHistory]:
+        """История пользователя потоком — для выгрузок."""
         ...
 
     @abstractmethod
     async def get_user_history_balance(self, user_id: UUID) -> Optional[list[IncreasingBalance]]:
         ...
+
+    @abstractmethod
+    async def get_principal(self, user_id: UUID) -> Principal:
+        """Роль и флаг бана из кэша процесса; в БД идём только при промахе."""
+        ...
+
+    @abstractmethod
+    async def get_seller_balance(self, seller_id: UUID) -> SellerBalance:
+        """Агрегат продавца: резервы по товарам и число заказов в работе."""
+        ...
@@ -0,0 +1,9 @@
+from abstractions.repositories.push_stats import PushStatsRepositoryInterface
+from dependencies.repositories.session_maker import get_session_maker
+from infrastructure.repositories.push_stats import PushStatsRepository
+
+
+def get_push_stats_repository() -> PushStatsRepositoryInterface:
+    return PushStatsRepository(
+        session_maker=get_session_maker()
+    )
@@ -0,0 +1,9 @@
+from abstractions.repositories.seller_balance import SellerBalanceRepositoryInterface
+from dependencies.repositories.session_maker import get_session_maker
+from infrastructure.repositories.seller_balance import SellerBalanceRepository
+
+
+def get_seller_balance_repository() -> SellerBalanceRepositoryInterface:
+    return SellerBalanceRepository(
+        session_maker=get_session_maker()
+    )
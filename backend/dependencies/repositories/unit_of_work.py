@@ -0,0 +1,9 @@
+from abstractions.repositories.unit_of_work import UnitOfWorkInterface
+from dependencies.repositories.session_maker import get_session_maker
+from infrastructure.repositories.unit_of_work import SQLAlchemyUnitOfWork
+
+
+def get_unit_of_work() -> UnitOfWorkInterface:
+    return SQLAlchemyUnitOfWork(
+        session_maker=get_session_maker()
+    )
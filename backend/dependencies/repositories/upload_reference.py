@@ -0,0 +1,9 @@
+from abstractions.repositories.upload_reference import UploadReferenceRepositoryInterface
+from dependencies.repositories.session_maker import get_session_maker
+from infrastructure.repositories.upload_reference import UploadReferenceRepository
+
+
+def get_upload_reference_repository() -> UploadReferenceRepositoryInterface:
+    return UploadReferenceRepository(
+        session_maker=get_session_maker()
+    )
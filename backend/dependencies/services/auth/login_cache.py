@@ -0,0 +1,23 @@
+from uuid import UUID
+
+from domain.responses.auth import AuthTokens
+from settings import settings
+from utils.ttl_cache import TTLCache
+
+# по экземпляру на процесс, как и кэш принципалов
+_login_cache: TTLCache[tuple[int, AuthTokens]] = TTLCache(
+    maxsize=settings.cache.login_max_entries,
+    ttl=settings.cache.login_ttl,
+)
+_known_user_cache: TTLCache[UUID] = TTLCache(
+    maxsize=settings.cache.known_user_max_entries,
+    ttl=settings.cache.known_user_ttl,
+)
+
+
+def get_login_cache() -> TTLCache[tuple[int, AuthTokens]]:
+    return _login_cache
+
+
+def get_known_user_cache() -> TTLCache[UUID]:
+    return _known_user_cache
@@ -1,4 +1,5 @@
 from abstractions.services.auth.service import AuthServiceInterface
+from dependencies.services.auth.login_cache import get_login_cache, get_known_user_cache
 from dependencies.services.auth.token import get_token_service
 from dependencies.services.user import get_user_service
 from services.auth.service import AuthService
@@ -11,4 +12,6 @@ def get_auth_service() -> AuthServiceInterface:
         jwt_secret=settings.jwt.secret_key.get_secret_value(),
         token_service=get_token_service(),
         user_service=get_user_service(),
+        login_cache=get_login_cache(),
+        known_user_cache=get_known_user_cache(),
     )
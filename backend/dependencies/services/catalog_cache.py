@@ -0,0 +1,13 @@
+from abstractions.services.catalog_cache import CatalogCacheInterface
+from services.catalog_cache import CatalogCache
+from settings import settings
+
+# один экземпляр на процесс: версия и записи общие для всех запросов
+_catalog_cache = CatalogCache(
+    ttl=settings.cache.catalog_ttl,
+    maxsize=settings.cache.catalog_max_entries,
+)
+
+
+def get_catalog_cache() -> CatalogCacheInterface:
+    return _catalog_cache
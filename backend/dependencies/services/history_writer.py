@@ -0,0 +1,18 @@
+from abstractions.services.history_writer import HistoryWriterInterface
+from dependencies.repositories.user_history import get_user_history_repository
+from services.history_writer import HistoryWriter
+from settings import settings
+
+# один буфер на процесс: его запускает и дописывает при остановке lifespan
+_history_writer = HistoryWriter(
+    user_history_repository=get_user_history_repository(),
+    batch_size=settings.history.batch_size,
+    flush_interval=settings.history.flush_interval,
+    max_buffer=settings.history.max_buffer,
+    sync=settings.history.sync,
+    shutdown_retries=settings.history.shutdown_retries,
+)
+
+
+def get_history_writer() -> HistoryWriterInterface:
+    return _history_writer
@@ -0,0 +1,14 @@
+from abstractions.services.image_variants import ImageVariantServiceInterface
+from services.image_variants import ImageVariantService
+from settings import settings
+
+# один пул процессов на воркер приложения: его запускает и останавливает lifespan
+_image_variant_service = ImageVariantService(
+    images_dir=settings.upload.images_dir,
+    workers=settings.upload.variant_workers,
+    quality=settings.upload.variant_quality,
+)
+
+
+def get_image_variant_service() -> ImageVariantServiceInterface:
+    return _image_variant_service
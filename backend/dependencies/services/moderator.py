@@ -2,6 +2,9 @@ from abstractions.services.moderator import ModeratorServiceInterface
 from dependencies.repositories.increasing_balance import get_increasing_balance_repository
 from dependencies.repositories.moderator_review import get_moderator_review_repository
 from dependencies.repositories.product import get_product_repository
+from dependencies.repositories.unit_of_work import get_unit_of_work
+from dependencies.services.catalog_cache import get_catalog_cache
+from dependencies.services.history_writer import get_history_writer
 from dependencies.services.notification import get_notification_service
 from dependencies.services.user import get_user_service
 from services.moderator import ModeratorService
@@ -13,5 +16,8 @@ def get_moderator_service() -> ModeratorServiceInterface:
         user_service=get_user_service(),
         moderator_review_repository=get_moderator_review_repository(),
         notification_service=get_notification_service(),
-        increasing_balance_repository=get_increasing_balance_repository()
+        increasing_balance_repository=get_increasing_balance_repository(),
+        catalog_cache=get_catalog_cache(),
+        unit_of_work=get_unit_of_work(),
+        history_writer=get_history_writer(),
     )
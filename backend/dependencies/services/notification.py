@@ -2,6 +2,7 @@ from abstractions.services.notification import NotificationServiceInterface
 from dependencies.repositories.order import get_order_repository
 from dependencies.repositories.product import get_product_repository
 from dependencies.repositories.push import get_push_repository
+from dependencies.repositories.push_stats import get_push_stats_repository
 from dependencies.repositories.user import get_user_repository
 from dependencies.repositories.user_push import get_user_push_repository
 from dependencies.services.deeplink import get_deeplink_service
@@ -16,8 +17,10 @@ def get_notification_service() -> NotificationServiceInterface:
         orders_repository=get_order_repository(),
         push_repository=get_push_repository(),
         user_push_repository=get_user_push_repository(),
+        push_stats_repository=get_push_stats_repository(),
         products_repository=get_product_repository(),
         upload_service=get_upload_service(),
         bot_token=settings.bot.token,
         deeplink_service=get_deeplink_service(),
+        reminder_concurrency=settings.inactivity.send_concurrency,
     )
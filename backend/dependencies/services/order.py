@@ -2,9 +2,13 @@ from abstractions.services import OrderServiceInterface
 from dependencies.repositories.order import get_order_repository
 from dependencies.repositories.product import get_product_repository
 from dependencies.repositories.user_history import get_user_history_repository
+from dependencies.repositories.unit_of_work import get_unit_of_work
+from dependencies.services.catalog_cache import get_catalog_cache
+from dependencies.services.history_writer import get_history_writer
 from dependencies.services.notification import get_notification_service
 from dependencies.repositories.user import get_user_repository
 from services.order import OrderService
+from settings import settings
 
 
 def get_order_service() -> OrderServiceInterface:
@@ -13,5 +17,9 @@ def get_order_service() -> OrderServiceInterface:
         product_repository=get_product_repository(),
         notification_service=get_notification_service(),
         user_repository=get_user_repository(),
-        user_history_repository=get_user_history_repository()
+        user_history_repository=get_user_history_repository(),
+        catalog_cache=get_catalog_cache(),
+        unit_of_work=get_unit_of_work(),
+        history_writer=get_history_writer(),
+        inactivity_batch_size=settings.inactivity.batch_size,
     )
@@ -0,0 +1,13 @@
+from domain.models.principal import Principal
+from settings import settings
+from utils.ttl_cache import TTLCache
+
+# один экземпляр на процесс; бан/смена роли чистят запись, остальное доживает до TTL
+_principal_cache: TTLCache[Principal] = TTLCache(
+    maxsize=settings.cache.principal_max_entries,
+    ttl=settings.cache.principal_ttl,
+)
+
+
+def get_principal_cache() -> TTLCache[Principal]:
+    return _principal_cache
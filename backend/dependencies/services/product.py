@@ -3,9 +3,13 @@ from abstractions.services.notification import NotificationServiceInterface
 from dependencies.repositories.increasing_balance import get_increasing_balance_repository
 from dependencies.repositories.product import get_product_repository
 from dependencies.repositories.push import get_push_repository
+from dependencies.repositories.seller_balance import get_seller_balance_repository
 from dependencies.repositories.user import get_user_repository
 from dependencies.repositories.user_history import get_user_history_repository
 from dependencies.repositories.user_push import get_user_push_repository
+from dependencies.repositories.unit_of_work import get_unit_of_work
+from dependencies.services.catalog_cache import get_catalog_cache
+from dependencies.services.history_writer import get_history_writer
 from dependencies.services.notification import get_notification_service
 from services.product import ProductService
 
@@ -18,5 +22,9 @@ def get_product_service() -> ProductServiceInterface:
         user_push_repository=get_user_push_repository(),
         notification_service=get_notification_service(),
         user_history_repository=get_user_history_repository(),
-        increasing_balance_repository=get_increasing_balance_repository()
+        increasing_balance_repository=get_increasing_balance_repository(),
+        seller_balance_repository=get_seller_balance_repository(),
+        catalog_cache=get_catalog_cache(),
+        unit_of_work=get_unit_of_work(),
+        history_writer=get_history_writer(),
     )
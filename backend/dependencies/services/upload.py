@@ -1,8 +1,14 @@
 from abstractions.services.upload import UploadServiceInterface
+from dependencies.repositories.upload_reference import get_upload_reference_repository
 from services.upload import UploadService
+from settings import settings
 
 
 def get_upload_service() -> UploadServiceInterface:
     return UploadService(
-
+        reference_repository=get_upload_reference_repository(),
+        images_dir=settings.upload.images_dir,
+        max_size=settings.upload.max_size,
+        chunk_size=settings.upload.chunk_size,
+        gc_min_age=settings.upload.gc_min_age,
     )
@@ -2,8 +2,12 @@ from abstractions.repositories import ProductRepositoryInterface
 from abstractions.services import UserServiceInterface
 from dependencies.repositories.increasing_balance import get_increasing_balance_repository
 from dependencies.repositories.product import get_product_repository
+from dependencies.repositories.seller_balance import get_seller_balance_repository
 from dependencies.repositories.user import get_user_repository
+from dependencies.repositories.unit_of_work import get_unit_of_work
+from dependencies.services.catalog_cache import get_catalog_cache
 from dependencies.services.notification import get_notification_service
+from dependencies.services.principal_cache import get_principal_cache
 from services.user import UserService
 from settings import settings
 
@@ -15,4 +19,8 @@ def get_user_service() -> UserServiceInterface:
         bot_username=settings.bot.username,
         product_repository=get_product_repository(),
         increasing_balance_repository=get_increasing_balance_repository(),
+        seller_balance_repository=get_seller_balance_repository(),
+        catalog_cache=get_catalog_cache(),
+        unit_of_work=get_unit_of_work(),
+        principal_cache=get_principal_cache(),
     )
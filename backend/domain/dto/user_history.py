@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Optional, Literal, Any
 from uuid import UUID
 
+from pydantic import BaseModel
 from pydantic.main import IncEx
 
 from domain.dto.base import CreateDTO, UpdateDTO
@@ -25,4 +26,12 @@ class UpdateUserHistoryDTO(UpdateDTO):
     action: Optional[Action] = None
     date: Optional[datetime] = None
     json_before: Optional[dict] = None
-    json_after: Optional[dict] = None
\ No newline at end of file
+    json_after: Optional[dict] = None
+
+
+class UserHistoryFilter(BaseModel):
+    """Фильтры ленты истории; всё, что не задано, не ограничивает выборку."""
+    actions: Optional[list[Action]] = None
+    product_id: Optional[UUID] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
@@ -2,9 +2,12 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
+from pydantic import BaseModel
+
 from domain.dto.base import CreateDTO, UpdateDTO
 from domain.models import User
 from infrastructure.entities import Push
+from infrastructure.enums.user_role import UserRole
 
 
 class CreateUserPushDTO(CreateDTO):
@@ -14,4 +17,20 @@ class CreateUserPushDTO(CreateDTO):
 class UpdateUserPushDTO(UpdateDTO):
     push_id: Optional[UUID] = None
     user_id: Optional[UUID] = None
-    sent_at: Optional[datetime] = None
\ No newline at end of file
+    sent_at: Optional[datetime] = None
+
+class PushAudience(BaseModel):
+    """
+    Кому ставить пуш в очередь. Условия складываются через AND,
+    пустая аудитория — все пользователи с telegram_id.
+    """
+    user_ids: Optional[list[UUID]] = None
+    roles: Optional[list[UserRole]] = None
+    # продавцы: роль SELLER или is_seller
+    sellers: Optional[bool] = None
+    include_banned: bool = False
+    # покупали у продавца / этот товар
+    ordered_from_seller_id: Optional[UUID] = None
+    ordered_product_id: Optional[UUID] = None
+    registered_after: Optional[datetime] = None
+    registered_before: Optional[datetime] = None
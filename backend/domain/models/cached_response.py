@@ -0,0 +1,18 @@
+import hashlib
+from typing import Any, Optional
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+class CachedResponse(BaseModel):
+    body: bytes
+    etag: str
+    headers: dict[str, str] = {}
+
+    @classmethod
+    def build(cls, payload: Any, headers: Optional[dict[str, str]] = None) -> "CachedResponse":
+        # сериализуем один раз при промахе, дальше отдаём готовые байты
+        body = to_json(payload)
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        return cls(body=body, etag=etag, headers=headers or {})
@@ -6,6 +6,7 @@ from pydantic import BaseModel, ConfigDict
 
 from domain.models import Product, User
 from infrastructure.enums.order_status import OrderStatus
+from infrastructure.enums.payout_time import PayoutTime
 from infrastructure.enums.product_status import ProductStatus
 
 
@@ -40,3 +41,56 @@ class Order(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+
+class OrderProductBrief(BaseModel):
+    """Товар в строке списка заказов — только то, что рисуют карточки."""
+    id: UUID
+    name: str
+    brand: str
+    article: str
+    image_path: Optional[str] = None
+    price: float
+    wb_price: float
+    payment_time: PayoutTime
+    seller_id: UUID
+    status: ProductStatus
+
+
+class OrderUserBrief(BaseModel):
+    id: UUID
+    nickname: Optional[str] = None
+
+
+class OrderListItem(BaseModel):
+    """
+    Строка списка заказов: колонки заказа и краткие товар/покупатель/продавец
+    вместо полных моделей — собирается из одного SELECT без загрузки связей.
+    """
+    id: UUID
+    transaction_code: str
+    user_id: UUID
+    product_id: Optional[UUID] = None
+    seller_id: UUID
+    step: int
+    search_screenshot_path: Optional[str]
+    cart_screenshot_path: Optional[str]
+    card_number: Optional[str]
+    phone_number: Optional[str]
+    name: Optional[str]
+    bank: Optional[str]
+    final_cart_screenshot_path: Optional[str]
+    delivery_screenshot_path: Optional[str]
+    barcodes_screenshot_path: Optional[str]
+    review_screenshot_path: Optional[str]
+    receipt_screenshot_path: Optional[str]
+    receipt_number: Optional[str]
+    status: OrderStatus
+    order_date: datetime
+    paid_at: Optional[datetime] = None
+
+    product: Optional[OrderProductBrief] = None
+    user: OrderUserBrief
+    seller: OrderUserBrief
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class OrderReminder(BaseModel):
+    # всё, что нужно для сообщения, — без дочитывания заказа, пользователя и товара
+    order_id: UUID
+    user_id: UUID
+    product_id: UUID
+    telegram_id: Optional[int]
+    step: int
+    product_name: Optional[str] = None
+    # отметка REMINDER_SENT, которой заказ «захвачен» под напоминание
+    reminded_at: datetime
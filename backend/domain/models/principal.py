@@ -0,0 +1,13 @@
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from infrastructure.enums.user_role import UserRole
+
+
+class Principal(BaseModel):
+    id: UUID
+    role: UserRole
+    is_banned: bool
+
+    model_config = ConfigDict(from_attributes=True)
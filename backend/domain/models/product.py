@@ -2,15 +2,26 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, computed_field
 
 from domain.models.moderator_review import ModeratorReview
 from infrastructure.enums.category import Category
 from infrastructure.enums.payout_time import PayoutTime
 from infrastructure.enums.product_status import ProductStatus
+from utils.image_paths import variant_paths
 
 
-class Product(BaseModel):
+class ImageVariantsMixin:
+    """Для моделей с image_path: пути уменьшенных WebP-копий картинки."""
+
+    @computed_field
+    @property
+    def image_variants(self) -> Optional[dict[str, str]]:
+        """thumb / card / full — как и image_path, относительно /upload."""
+        return variant_paths(self.image_path)
+
+
+class Product(ImageVariantsMixin, BaseModel):
     id: UUID
     name: str
     brand: str
@@ -37,3 +48,33 @@ class Product(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class ProductListItem(ImageVariantsMixin, BaseModel):
+    """
+    Строка списков товаров (кабинет продавца, модерация): без длинных текстовых полей,
+    ревью модератора — отдельным запросом по колонкам, а не joinedload по каждой строке.
+    """
+    id: UUID
+    name: str
+    brand: str
+    article: str
+    category: Category
+    general_repurchases: int
+    remaining_products: int
+    price: float
+    wb_price: float
+    payment_time: PayoutTime
+    image_path: str | None = None
+    seller_id: UUID
+    status: ProductStatus
+    always_show: bool = False
+    created_at: datetime
+    updated_at: datetime
+
+    moderator_reviews: Optional[list[ModeratorReview]] = None
+
+
+class ProductSearchHit(Product):
+    rank: float
+    # фрагмент name/brand/key_word с подсвеченными совпадениями (<b>…</b>)
+    snippet: Optional[str] = None
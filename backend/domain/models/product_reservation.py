@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+from domain.models.product import Product
+
+
+class ProductReservation(BaseModel):
+    # снимки товара до и после списания единицы — для истории
+    before: Product
+    after: Product
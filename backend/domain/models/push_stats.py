@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, computed_field
+
+
+class PushStats(BaseModel):
+    push_id: UUID
+    planned: int = 0
+    in_progress: int = 0
+    delivered: int = 0
+    failed: int = 0
+    first_sent_at: Optional[datetime] = None
+    last_sent_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @computed_field
+    @property
+    def total(self) -> int:
+        return self.planned + self.in_progress + self.delivered + self.failed
+
+    @computed_field
+    @property
+    def throughput(self) -> Optional[float]:
+        """Доставок в секунду от первой до последней доставки."""
+        if self.delivered < 2 or not self.first_sent_at or not self.last_sent_at:
+            return None
+        elapsed = (self.last_sent_at - self.first_sent_at).total_seconds()
+        if elapsed <= 0:
+            return None
+        return round((self.delivered - 1) / elapsed, 2)
+
+    @computed_field
+    @property
+    def eta_seconds(self) -> Optional[int]:
+        remaining = self.planned + self.in_progress
+        if remaining == 0:
+            return 0
+        if not self.throughput:
+            return None
+        return round(remaining / self.throughput)
@@ -0,0 +1,13 @@
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SellerBalance(BaseModel):
+    seller_id: UUID
+    reserved_active: int = 0
+    unpaid_plan: int = 0
+    active_plan: int = 0
+    in_progress: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
@@ -15,5 +15,7 @@ class UserHistory(BaseModel):
     date: datetime
     json_before: Optional[dict]
     json_after: Optional[dict]
+    # json_before/json_after — патчи из utils.json_diff, а не полные снимки
+    is_diff: bool = False
     created_at: datetime
     updated_at: datetime
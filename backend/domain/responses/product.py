@@ -4,13 +4,15 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
 
+from domain.models import Product
 from domain.models.moderator_review import ModeratorReview
+from domain.models.product import ImageVariantsMixin
 from infrastructure.enums.category import Category
 from infrastructure.enums.payout_time import PayoutTime
 from infrastructure.enums.product_status import ProductStatus
 
 
-class ProductResponse(BaseModel):
+class ProductResponse(ImageVariantsMixin, BaseModel):
     id: UUID
     name: str
     brand: str
@@ -35,4 +37,10 @@ class ProductResponse(BaseModel):
 
     last_moderator_review: Optional[ModeratorReview] = None
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductPage(BaseModel):
+    items: list[Product]
+    # непрозрачный курсор следующей страницы; None — страница последняя
+    next_cursor: Optional[str] = None
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+
+class ActivatePushResponse(BaseModel):
+    # сколько пользователей получили пуш в очередь (без уже стоящих в ней)
+    queued: int
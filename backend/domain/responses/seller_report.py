@@ -0,0 +1,62 @@
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, computed_field
+
+from infrastructure.enums.order_status import OrderStatus
+
+
+class StatusCount(BaseModel):
+    status: OrderStatus
+    count: int
+
+
+class StepCount(BaseModel):
+    step: int
+    count: int
+
+
+class PaidDay(BaseModel):
+    day: date
+    orders: int
+    cashback: float
+
+
+class ProductConversion(BaseModel):
+    product_id: Optional[UUID] = None
+    article: Optional[str] = None
+    name: Optional[str] = None
+    orders: int
+    # дошли до последнего шага
+    completed: int
+    paid: int
+    cancelled: int
+
+    @computed_field
+    @property
+    def conversion(self) -> float:
+        """Доля заказов по товару, закончившихся выплатой кешбэка."""
+        return round(self.paid / self.orders, 4) if self.orders else 0.0
+
+
+class SellerReport(BaseModel):
+    """
+    Сводка по заказам продавца, посчитанная в БД. Период фильтрует разные колонки:
+    total_orders, by_status, by_step, cashback_pending и products — заказы с created_at в периоде;
+    cashback_paid и paid_by_day — выплаты с paid_at в периоде, в том числе по заказам,
+    созданным раньше. Поэтому cashback_paid не выводится из by_status того же отчёта.
+    Заказы без товара (товар удалён) считаются, но их кешбэк — 0.
+    """
+    seller_id: UUID
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+
+    total_orders: int = 0
+    by_status: list[StatusCount] = []
+    by_step: list[StepCount] = []
+    cashback_paid: float = 0
+    # кешбэк по заказам, которые ещё ждут выплаты
+    cashback_pending: float = 0
+    paid_by_day: list[PaidDay] = []
+    products: list[ProductConversion] = []
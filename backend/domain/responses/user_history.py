@@ -0,0 +1,11 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from domain.models.user_history import UserHistory
+
+
+class UserHistoryPage(BaseModel):
+    items: list[UserHistory]
+    # непрозрачный курсор следующей страницы; None — страница последняя
+    next_cursor: Optional[str] = None
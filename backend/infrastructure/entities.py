@@ -211,6 +211,37 @@ class IncreasingBalance(AbstractBase):
     sum: Mapped[int]
 
 
+class SellerBalance(Base):
+    """Агрегат по продавцу, поддерживается триггерами на products и orders."""
+    __tablename__ = 'seller_balances'
+
+    seller_id: Mapped[pyUUID] = mapped_column(ForeignKey('users.id', ondelete="CASCADE"), primary_key=True)
+    # сумма remaining_products по ACTIVE
+    reserved_active: Mapped[int] = mapped_column(server_default=text('0'))
+    # сумма remaining_products по NOT_PAID
+    unpaid_plan: Mapped[int] = mapped_column(server_default=text('0'))
+    # сумма general_repurchases по ACTIVE
+    active_plan: Mapped[int] = mapped_column(server_default=text('0'))
+    # заказы в статусе CASHBACK_NOT_PAID
+    in_progress: Mapped[int] = mapped_column(server_default=text('0'))
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+
+class PushStats(Base):
+    """Счётчики доставки по пушу, поддерживаются триггерами на user_pushes."""
+    __tablename__ = 'push_stats'
+
+    push_id: Mapped[pyUUID] = mapped_column(ForeignKey('pushes.id', ondelete="CASCADE"), primary_key=True)
+    planned: Mapped[int] = mapped_column(server_default=text('0'))
+    in_progress: Mapped[int] = mapped_column(server_default=text('0'))
+    delivered: Mapped[int] = mapped_column(server_default=text('0'))
+    failed: Mapped[int] = mapped_column(server_default=text('0'))
+    # первая и последняя доставка — по ним считаем скорость рассылки
+    first_sent_at: Mapped[Optional[datetime]]
+    last_sent_at: Mapped[Optional[datetime]]
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+
 class UserHistory(AbstractBase):
     __tablename__ = 'user_history'
 
@@ -225,3 +256,5 @@ class UserHistory(AbstractBase):
     )
     json_before: Mapped[Optional[dict]] = mapped_column(JSONB)
     json_after: Mapped[Optional[dict]] = mapped_column(JSONB)
+    # снимки хранят только изменённые поля (utils.json_diff), а не объект целиком
+    is_diff: Mapped[bool] = mapped_column(server_default=text('false'))
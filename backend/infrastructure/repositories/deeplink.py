@@ -1,4 +1,3 @@
-import logging
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -9,8 +8,9 @@ from domain.dto import CreateDeeplinkDTO, UpdateDeeplinkDTO
 from domain.models import Deeplink as DeeplinkModel
 from infrastructure.entities import Deeplink
 from infrastructure.repositories.sqlalchemy import AbstractSQLAlchemyRepository
+from utils.log import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -23,7 +23,7 @@ class DeeplinkRepository(
     })
 
     async def get_by_url(self, url: str) -> Optional[Deeplink]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.url == url)
@@ -1,4 +1,3 @@
-import logging
 from dataclasses import dataclass
 from typing import Optional
 from uuid import UUID
@@ -9,7 +8,8 @@ from domain.models.increasing_balance import IncreasingBalance as IncreasingBala
 from infrastructure.entities import IncreasingBalance
 from infrastructure.repositories.sqlalchemy import AbstractSQLAlchemyRepository
 from sqlalchemy import select
-logger = logging.getLogger(__name__)
+from utils.log import get_logger
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -19,7 +19,7 @@ class IncreasingBalanceRepository(
 ):
 
     async def get_balance_history_by_user(self, user_id: UUID) -> Optional[list[IncreasingBalance]]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.user_id == user_id)
@@ -14,7 +14,7 @@ class ModeratorReviewRepository(
 ):
 
     async def get_by_user(self, user_id: UUID) -> List[ModeratorReview]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             stmt = (
                 select(self.entity)
                 .join(Product, Product.id == self.entity.product_id)
@@ -1,23 +1,39 @@
-import logging
 from dataclasses import field, dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update, insert, delete, func, literal, null, case, tuple_, true, Select
+from sqlalchemy.orm import aliased
 from sqlalchemy.sql import exists
 
 from abstractions.repositories import OrderRepositoryInterface
 from domain.dto import CreateOrderDTO, UpdateOrderDTO
 from domain.models import Order, Product as ProductModel, User
 from domain.models import User as UserModel
-from domain.models.order import Order as OrderModel
-from infrastructure.entities import Order, Product, UserHistory
+from domain.models.order import Order as OrderModel, OrderListItem, OrderProductBrief, OrderUserBrief
+from domain.models.order_reminder import OrderReminder
+from domain.responses.seller_report import SellerReport, StatusCount, StepCount, PaidDay, ProductConversion
+from infrastructure.entities import Order, Product, UserHistory, User as UserEntity
 from infrastructure.enums.action import Action
 from infrastructure.enums.order_status import OrderStatus
-from infrastructure.repositories.sqlalchemy import AbstractSQLAlchemyRepository
+from infrastructure.enums.product_status import ProductStatus
+from infrastructure.repositories.sqlalchemy import AbstractSQLAlchemyRepository, STREAM_BATCH_SIZE
+from utils.log import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+# колонки товара, которые попадают в строку списка заказов
+_PRODUCT_BRIEF_FIELDS = (
+    'id', 'name', 'brand', 'article', 'image_path', 'price', 'wb_price', 'payment_time', 'seller_id', 'status',
+)
+
+# заказы, кешбэк по которым ещё предстоит выплатить
+_PENDING_CASHBACK_STATUSES = (
+    OrderStatus.CASHBACK_NOT_PAID,
+    OrderStatus.PAYMENT_CONFIRMED,
+    OrderStatus.REMINDER_SENT,
+)
 
 
 @dataclass
@@ -126,19 +142,49 @@ class OrderRepository(
             updated_at=entity.updated_at,
         )
 
-    async def get_orders_by_user(self, user_id: UUID) -> List[Order]:
-        async with self.session_maker() as session:
-            result = await session.execute(
-                select(self.entity)
-                .where(self.entity.user_id == user_id)
-                .options(*self.options)
+    def _list_query(self) -> Select:
+        # одна строка на заказ: связи не грузим, а берём нужные колонки join-ами
+        buyer = aliased(UserEntity)
+        seller = aliased(UserEntity)
+        return (
+            select(
+                *self.entity.__table__.columns,
+                *(getattr(Product, f).label(f'product__{f}') for f in _PRODUCT_BRIEF_FIELDS),
+                buyer.nickname.label('user_nickname'),
+                seller.nickname.label('seller_nickname'),
             )
-            orders = result.scalars().all()
-            return [self.entity_to_model(order) for order in orders]
+            .outerjoin(Product, Product.id == self.entity.product_id)
+            .join(buyer, buyer.id == self.entity.user_id)
+            .join(seller, seller.id == self.entity.seller_id)
+        )
+
+    def _list_item(self, row) -> OrderListItem:
+        # данные из БД уже валидны — model_construct без повторной валидации
+        return OrderListItem.model_construct(
+            **{c.name: row[c.name] for c in self.entity.__table__.columns},
+            product=OrderProductBrief.model_construct(
+                **{f: row[f'product__{f}'] for f in _PRODUCT_BRIEF_FIELDS}
+            ) if row['product__id'] is not None else None,
+            user=OrderUserBrief.model_construct(id=row['user_id'], nickname=row['user_nickname']),
+            seller=OrderUserBrief.model_construct(id=row['seller_id'], nickname=row['seller_nickname']),
+        )
 
+    async def _fetch_list(self, stmt: Select) -> list[OrderListItem]:
+        async with self._session() as session:
+            rows = (await session.execute(stmt)).mappings().all()
+
+        return [self._list_item(row) for row in rows]
+
+    async def get_list(self, limit: int = 100, offset: int = 0) -> list[OrderListItem]:
+        return await self._fetch_list(self._list_query().limit(limit).offset(offset))
+
+    async def get_orders_by_user(self, user_id: UUID) -> list[OrderListItem]:
+        return await self._fetch_list(
+            self._list_query().where(self.entity.user_id == user_id)
+        )
 
     async def get_user_report(self, order_id: UUID) -> Order:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.id == order_id)
@@ -147,41 +193,184 @@ class OrderRepository(
             order = result.scalars().first()
             return self.entity_to_model(order)
 
-    async def get_orders_by_seller(self, seller_id: UUID) -> list[Order]:
-        async with self.session_maker() as session:
-            result = await session.execute(
-                select(self.entity)
-                .where(self.entity.seller_id == seller_id, self.entity.step == 7)
-                .order_by(self.entity.paid_at.desc().nullslast(), self.entity.created_at.desc())
-                .options(*self.options)
+    async def get_orders_by_seller(self, seller_id: UUID) -> list[OrderListItem]:
+        orders = await self._fetch_list(
+            self._list_query()
+            .where(self.entity.seller_id == seller_id, self.entity.step == 7)
+            .order_by(self.entity.paid_at.desc().nullslast(), self.entity.created_at.desc())
+        )
+        logger.debug("orders found", seller_id=seller_id, count=len(orders))
+        return orders
+
+    async def get_all_orders_by_seller(self, seller_id: UUID) -> list[OrderListItem]:
+        orders = await self._fetch_list(
+            self._list_query().where(self.entity.seller_id == seller_id)
+        )
+        logger.debug("orders found (all)", seller_id=seller_id, count=len(orders))
+        return orders
+
+    def _seller_period(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime],
+            date_to: Optional[datetime],
+            column=None,
+    ) -> list:
+        column = self.entity.created_at if column is None else column
+        conditions = [self.entity.seller_id == seller_id]
+        if date_from is not None:
+            conditions.append(column >= date_from)
+        if date_to is not None:
+            conditions.append(column < date_to)
+        return conditions
+
+    async def get_seller_report(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+    ) -> SellerReport:
+        # все агрегаты — GROUP BY в БД по индексу (seller_id, status, paid_at), строки заказов не читаем
+        cashback = func.coalesce(Product.wb_price - Product.price, 0)
+        created_in_period = self._seller_period(seller_id, date_from, date_to)
+
+        by_status_step = (
+            select(
+                self.entity.status,
+                self.entity.step,
+                func.count().label('orders'),
+                func.sum(cashback).label('cashback'),
             )
-            orders = result.scalars().all()
-            logger.info(f"orders found {len(orders)} orders for seller {seller_id}")
-            logger.info([x.__dict__ for x in orders])
-            return [self.entity_to_model(order) for order in orders]
+            .outerjoin(Product, Product.id == self.entity.product_id)
+            .where(*created_in_period)
+            .group_by(self.entity.status, self.entity.step)
+        )
 
-    async def get_all_orders_by_seller(self, seller_id: UUID) -> list[Order]:
-        async with self.session_maker() as session:
-            result = await session.execute(
-                select(self.entity)
-                .where(self.entity.seller_id == seller_id)
-                .options(*self.options)
+        paid_day = func.date_trunc('day', self.entity.paid_at).label('day')
+        paid_by_day = (
+            select(
+                paid_day,
+                func.count().label('orders'),
+                func.sum(cashback).label('cashback'),
             )
-            orders = result.scalars().all()
-            logger.info(f"orders found {len(orders)} orders(all) for seller {seller_id}")
-            logger.info([x.__dict__ for x in orders])
-            return [self.entity_to_model(order) for order in orders]
+            .outerjoin(Product, Product.id == self.entity.product_id)
+            .where(
+                *self._seller_period(seller_id, date_from, date_to, column=self.entity.paid_at),
+                self.entity.status == OrderStatus.CASHBACK_PAID,
+                self.entity.paid_at.is_not(None),
+            )
+            .group_by(paid_day)
+            .order_by(paid_day)
+        )
+
+        per_product = (
+            select(
+                self.entity.product_id,
+                func.count().label('orders'),
+                func.count().filter(self.entity.step == 7).label('completed'),
+                func.count().filter(self.entity.status == OrderStatus.CASHBACK_PAID).label('paid'),
+                func.count().filter(self.entity.status == OrderStatus.CANCELLED).label('cancelled'),
+            )
+            .where(*created_in_period)
+            .group_by(self.entity.product_id)
+            .subquery()
+        )
+        products = (
+            select(per_product, Product.article, Product.name)
+            .outerjoin(Product, Product.id == per_product.c.product_id)
+            .order_by(per_product.c.orders.desc())
+        )
+
+        async with self._session() as session:
+            status_rows = (await session.execute(by_status_step)).all()
+            day_rows = (await session.execute(paid_by_day)).all()
+            product_rows = (await session.execute(products)).mappings().all()
+
+        # строк тут столько, сколько пар (статус, шаг) — досуммировать их дешевле ещё одного запроса
+        by_status: dict[OrderStatus, int] = {}
+        by_step: dict[int, int] = {}
+        cashback_pending = 0
+        for status, step, count, cashback_sum in status_rows:
+            by_status[status] = by_status.get(status, 0) + count
+            by_step[step] = by_step.get(step, 0) + count
+            if status in _PENDING_CASHBACK_STATUSES:
+                cashback_pending += cashback_sum or 0
+
+        paid_days = [
+            PaidDay(day=day.date(), orders=count, cashback=cashback_sum or 0)
+            for day, count, cashback_sum in day_rows
+        ]
+
+        return SellerReport(
+            seller_id=seller_id,
+            date_from=date_from,
+            date_to=date_to,
+            total_orders=sum(by_status.values()),
+            by_status=[StatusCount(status=s, count=c) for s, c in by_status.items()],
+            by_step=[StepCount(step=s, count=c) for s, c in sorted(by_step.items())],
+            cashback_paid=sum(d.cashback for d in paid_days),
+            cashback_pending=cashback_pending,
+            paid_by_day=paid_days,
+            products=[ProductConversion(**row) for row in product_rows],
+        )
+
+    async def get_seller_report_orders(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+            status: Optional[OrderStatus] = None,
+            step: Optional[int] = None,
+            product_id: Optional[UUID] = None,
+            limit: int = 50,
+            offset: int = 0,
+    ) -> list[OrderListItem]:
+        stmt = self._list_query().where(*self._seller_period(seller_id, date_from, date_to))
+        if status is not None:
+            stmt = stmt.where(self.entity.status == status)
+        if step is not None:
+            stmt = stmt.where(self.entity.step == step)
+        if product_id is not None:
+            stmt = stmt.where(self.entity.product_id == product_id)
+
+        return await self._fetch_list(
+            stmt
+            .order_by(self.entity.created_at.desc(), self.entity.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+
+    async def stream_seller_orders(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+            status: Optional[OrderStatus] = None,
+    ) -> AsyncIterator[OrderListItem]:
+        stmt = self._list_query().where(*self._seller_period(seller_id, date_from, date_to))
+        if status is not None:
+            stmt = stmt.where(self.entity.status == status)
+        stmt = (
+            stmt
+            .order_by(self.entity.created_at.desc(), self.entity.id.desc())
+            # серверный курсор: строки приходят пачками, весь результат в памяти не собирается
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+
+        async with self._session() as session:
+            result = await session.stream(stmt)
+            async for row in result.mappings():
+                yield self._list_item(row)
 
     async def get_in_progress_orders_by_seller(self, seller_id: UUID) -> list[Order]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.seller_id == seller_id, self.entity.status == OrderStatus.CASHBACK_NOT_PAID)
                 .options(*self.options)
             )
             orders = result.scalars().all()
-            logger.info(f"orders found {len(orders)} orders(all) for seller {seller_id}")
-            logger.info([x.__dict__ for x in orders])
+            logger.debug("orders in progress found", seller_id=seller_id, count=len(orders))
             return [self.entity_to_model(order) for order in orders]
 
     async def get_inactive_orders(self, cutoff: datetime) -> list[Order]:
@@ -189,7 +378,7 @@ class OrderRepository(
         Заказы без движения (step == 0) со статусом CASHBACK_NOT_PAID, созданные не позже cutoff.
         Используется для автонотификации и автокансела.
         """
-        async with self.session_maker() as session:
+        async with self._session() as session:
             reminder_exists = (
                 select(UserHistory.id)
                 .where(
@@ -217,7 +406,7 @@ class OrderRepository(
         Заказы, по которым уже отправляли напоминание (есть запись в user_history с action=REMINDER_SENT
         и date <= cutoff) и всё ещё нет движения (step == 0) — под отмену.
         """
-        async with self.session_maker() as session:
+        async with self._session() as session:
             reminder_exists = (
                 select(UserHistory.id)
                 .where(
@@ -240,9 +429,200 @@ class OrderRepository(
             orders = result.scalars().all()
             return [self.entity_to_model(order) for order in orders]
 
+    async def claim_reminders(self, cutoff: datetime, limit: int) -> list[OrderReminder]:
+        """
+        Одним запросом забирает пачку заказов под напоминание и пишет по ним REMINDER_SENT.
+        SKIP LOCKED пропускает строки, которые сейчас забирает другая реплика, а запись
+        в истории исключает заказ из следующих выборок.
+        """
+        now = datetime.now()
+        reminder_exists = (
+            select(UserHistory.id)
+            .where(
+                UserHistory.user_id == self.entity.user_id,
+                UserHistory.product_id == self.entity.product_id,
+                UserHistory.action == Action.REMINDER_SENT,
+            )
+            .exists()
+        )
+        due = (
+            select(self.entity.id, self.entity.user_id, self.entity.product_id, self.entity.step)
+            .where(
+                self.entity.step == 0,
+                self.entity.status == OrderStatus.CASHBACK_NOT_PAID,
+                self.entity.created_at <= cutoff,
+                ~reminder_exists,
+            )
+            .order_by(self.entity.created_at)
+            .limit(limit)
+            .with_for_update(of=self.entity, skip_locked=True)
+            .cte('due')
+        )
+        marked = (
+            insert(UserHistory)
+            .from_select(
+                ['id', 'user_id', 'creator_id', 'product_id', 'action', 'date', 'created_at', 'updated_at'],
+                select(
+                    func.gen_random_uuid(),
+                    due.c.user_id,
+                    null(),
+                    due.c.product_id,
+                    literal(Action.REMINDER_SENT, UserHistory.action.type),
+                    literal(now),
+                    literal(now),
+                    literal(now),
+                ),
+            )
+            .cte('marked')
+        )
+        stmt = (
+            select(
+                due.c.id,
+                due.c.user_id,
+                due.c.product_id,
+                due.c.step,
+                UserEntity.telegram_id,
+                Product.name,
+            )
+            .join(UserEntity, UserEntity.id == due.c.user_id)
+            .outerjoin(Product, Product.id == due.c.product_id)
+            .add_cte(marked)
+        )
+        async with self._transaction() as session:
+            rows = (await session.execute(stmt)).all()
+
+        return [
+            OrderReminder(
+                order_id=order_id,
+                user_id=user_id,
+                product_id=product_id,
+                telegram_id=telegram_id,
+                step=step,
+                product_name=product_name,
+                reminded_at=now,
+            )
+            for order_id, user_id, product_id, step, telegram_id, product_name in rows
+        ]
+
+    async def release_reminders(self, reminders: list[OrderReminder]) -> None:
+        """Снимает отметки REMINDER_SENT с неотправленных напоминаний — их заберут в следующий раз."""
+        if not reminders:
+            return
+
+        async with self._transaction() as session:
+            for reminded_at in {reminder.reminded_at for reminder in reminders}:
+                pairs = [
+                    (reminder.user_id, reminder.product_id)
+                    for reminder in reminders
+                    if reminder.reminded_at == reminded_at
+                ]
+                await session.execute(
+                    delete(UserHistory)
+                    .where(
+                        UserHistory.action == Action.REMINDER_SENT,
+                        UserHistory.date == reminded_at,
+                        tuple_(UserHistory.user_id, UserHistory.product_id).in_(pairs),
+                    )
+                )
+
+    async def cancel_inactive(self, reminded_before: datetime, limit: int) -> list[UUID]:
+        """
+        Отменяет пачку заказов без движения после напоминания одним запросом:
+        статус заказов, возврат раздач товарам и записи STATUS_CHANGED.
+        """
+        now = datetime.now()
+        status_type = Product.status.type
+        reminder_exists = (
+            select(UserHistory.id)
+            .where(
+                UserHistory.user_id == self.entity.user_id,
+                UserHistory.product_id == self.entity.product_id,
+                UserHistory.action == Action.REMINDER_SENT,
+                UserHistory.date <= reminded_before,
+            )
+            .exists()
+        )
+        due = (
+            select(self.entity.id, self.entity.step, self.entity.updated_at)
+            .where(
+                self.entity.step == 0,
+                self.entity.status == OrderStatus.CASHBACK_NOT_PAID,
+                reminder_exists,
+            )
+            .order_by(self.entity.created_at)
+            .limit(limit)
+            .with_for_update(of=self.entity, skip_locked=True)
+            .cte('due')
+        )
+        cancelled = (
+            update(self.entity)
+            .where(self.entity.id == due.c.id)
+            .values(status=OrderStatus.CANCELLED, updated_at=now)
+            .returning(
+                self.entity.id, self.entity.user_id, self.entity.product_id, self.entity.updated_at,
+                due.c.step, due.c.updated_at.label('updated_before'),
+            )
+            .cte('cancelled')
+        )
+        returned = (
+            select(cancelled.c.product_id, func.count().label('units'))
+            .where(cancelled.c.product_id.is_not(None))
+            .group_by(cancelled.c.product_id)
+            .cte('returned')
+        )
+        # как и при ручной отмене: раздача возвращается, архивный товар снова активен
+        restocked = (
+            update(Product)
+            .where(Product.id == returned.c.product_id)
+            .values(
+                remaining_products=Product.remaining_products + returned.c.units,
+                status=case(
+                    (Product.status == ProductStatus.ARCHIVED, literal(ProductStatus.ACTIVE, status_type)),
+                    else_=Product.status,
+                ),
+                updated_at=now,
+            )
+            .cte('restocked')
+        )
+        # патчи в формате utils.json_diff: изменённые поля плюс CONTEXT_KEYS
+        logged = (
+            insert(UserHistory)
+            .from_select(
+                ['id', 'user_id', 'creator_id', 'product_id', 'action', 'date',
+                 'json_before', 'json_after', 'is_diff', 'created_at', 'updated_at'],
+                select(
+                    func.gen_random_uuid(),
+                    cancelled.c.user_id,
+                    null(),
+                    cancelled.c.product_id,
+                    literal(Action.STATUS_CHANGED, UserHistory.action.type),
+                    literal(now),
+                    func.jsonb_build_object(
+                        'id', cancelled.c.id,
+                        'status', OrderStatus.CASHBACK_NOT_PAID.value,
+                        'step', cancelled.c.step,
+                        'updated_at', cancelled.c.updated_before,
+                    ),
+                    func.jsonb_build_object(
+                        'id', cancelled.c.id,
+                        'status', OrderStatus.CANCELLED.value,
+                        'step', cancelled.c.step,
+                        'updated_at', cancelled.c.updated_at,
+                    ),
+                    true(),
+                    literal(now),
+                    literal(now),
+                ),
+            )
+            .cte('logged')
+        )
+        stmt = select(cancelled.c.id).add_cte(restocked, logged)
+
+        async with self._transaction() as session:
+            return list((await session.execute(stmt)).scalars().all())
 
     async def exists_by_code(self, transaction_code: str) -> bool:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.transaction_code == transaction_code)
@@ -1,20 +1,31 @@
-import logging
+import re
+from collections import defaultdict
 from dataclasses import field, dataclass
+from datetime import datetime
 from typing import Optional, Any
 from uuid import UUID
 
-from sqlalchemy import select, case, String, cast, func
+from sqlalchemy import select, update, case, literal, String, cast, func, tuple_, Select
 from sqlalchemy.orm import joinedload
 
 from abstractions.repositories import ProductRepositoryInterface
 from domain.dto import CreateProductDTO, UpdateProductDTO
 from domain.models import Product as ProductModel
+from domain.models.product import ProductSearchHit, ProductListItem
+from domain.models.product_reservation import ProductReservation
 from domain.models.moderator_review import ModeratorReview as ModeratorReviewModel
 from infrastructure.entities import Product, ModeratorReview
 from infrastructure.enums.product_status import ProductStatus
+from infrastructure.repositories.exceptions import NotFoundException
 from infrastructure.repositories.sqlalchemy import AbstractSQLAlchemyRepository
+from utils.log import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+_SEARCH_TOKEN_RE = re.compile(r'\w+')
+
+# колонки товара для списков — без длинных текстов и search_vector
+_LIST_FIELDS = tuple(ProductListItem.model_fields.keys() - {'moderator_reviews'})
 
 
 @dataclass
@@ -34,8 +45,20 @@ class ProductRepository(
             joinedload(self.entity.moderator_reviews),
         ]
 
-    async def get_active_products(self, limit=100, offset=0, search: Optional[str] = None):
-        async with self.session_maker() as session:
+    async def get_active_products(
+            self,
+            limit=100,
+            offset=0,
+            search: Optional[str] = None,
+            after: Optional[tuple[datetime, UUID] | tuple[float, datetime, UUID]] = None,
+            ranked: bool = False,
+    ):
+        tsq = self._search_query(search) if search else None
+        if search and tsq is None:
+            # в запросе не осталось ни одного слова — совпадений быть не может
+            return []
+
+        async with self._session() as session:
             # Показываем активные товары, а также тестовые (show_even_if_empty),
             # даже если remaining_products == 0
             stmt = select(self.entity).where(
@@ -45,18 +68,91 @@ class ProductRepository(
                     (self.entity.always_show == True)
                 )
             )
-            if search:
-                # разбиваем запрос на слова и делаем префиксный поиск по каждому
-                tokens = [tok for tok in search.strip().split() if tok]
-                prefix_query = ' & '.join(f"{tok}:*" for tok in tokens)
-                tsq = func.to_tsquery('russian', prefix_query)
+            if tsq is not None:
                 stmt = stmt.where(self.entity.search_vector.op('@@')(tsq))
 
-            result = await session.execute(stmt.limit(limit).offset(offset))
-            products = result.scalars().all()
+            if tsq is not None and ranked:
+                # порядок по релевантности; ts_headline Postgres считает уже после LIMIT
+                rank = func.ts_rank_cd(self.entity.search_vector, tsq)
+                snippet = func.ts_headline(
+                    'russian',
+                    func.concat_ws(' ', self.entity.name, self.entity.brand, self.entity.key_word),
+                    tsq,
+                    'StartSel=<b>, StopSel=</b>, MaxWords=20, MinWords=5',
+                )
+                if after:
+                    # keyset по (rank, created_at, id): rank пересчитывается и для пропущенных строк,
+                    # но ts_headline и выдача стабильны при вставках, в отличие от OFFSET
+                    stmt = stmt.where(
+                        tuple_(rank, self.entity.created_at, self.entity.id) < tuple_(*after)
+                    )
+                stmt = (
+                    stmt.add_columns(rank.label('rank'), snippet.label('snippet'))
+                    .order_by(rank.desc(), self.entity.created_at.desc(), self.entity.id.desc())
+                )
+                result = await session.execute(stmt.limit(limit).offset(offset))
+                rows = result.all()
+            else:
+                rows = None
+                if after:
+                    # keyset: строго после последней отданной строки, по индексу ix_products_catalog_keyset
+                    stmt = stmt.where(
+                        tuple_(self.entity.created_at, self.entity.id) < tuple_(*after)
+                    )
+
+                stmt = stmt.order_by(self.entity.created_at.desc(), self.entity.id.desc())
+                result = await session.execute(stmt.limit(limit).offset(offset))
+                products = result.scalars().all()
+
+        if rows is not None:
+            return [
+                ProductSearchHit(**self.entity_to_model(p).model_dump(), rank=r, snippet=snip)
+                for p, r, snip in rows
+            ]
         return [self.entity_to_model(p) for p in products]
 
-    async def get_by_seller(self, user_id: UUID) -> Optional[list[ProductModel]]:
+    @staticmethod
+    def _search_query(search: str):
+        # только буквы/цифры: спецсимволы tsquery (&, |, !, :, скобки) иначе роняют запрос
+        tokens = _SEARCH_TOKEN_RE.findall(search.lower())
+        if not tokens:
+            return None
+        # префиксный поиск по каждому слову
+        prefix_query = ' & '.join(f"{tok}:*" for tok in tokens)
+        return func.to_tsquery('russian', prefix_query)
+
+    def _list_query(self) -> Select:
+        return (
+            select(*(getattr(self.entity, f) for f in _LIST_FIELDS))
+            .where(self.entity.deleted_at == None)
+        )
+
+    async def _fetch_list(self, stmt: Select) -> list[ProductListItem]:
+        async with self._session() as session:
+            rows = (await session.execute(stmt)).mappings().all()
+            if not rows:
+                return []
+
+            # ревью одним запросом по колонкам вместо joinedload, который дублирует строку товара на каждое ревью
+            reviews = await session.execute(
+                select(*ModeratorReview.__table__.columns)
+                .where(ModeratorReview.product_id.in_([row['id'] for row in rows]))
+                .order_by(ModeratorReview.created_at)
+            )
+            reviews_by_product = defaultdict(list)
+            for review in reviews.mappings():
+                reviews_by_product[review['product_id']].append(ModeratorReviewModel.model_construct(**review))
+
+        # данные из БД уже валидны — model_construct без повторной валидации
+        return [
+            ProductListItem.model_construct(**row, moderator_reviews=reviews_by_product[row['id']])
+            for row in rows
+        ]
+
+    async def get_list(self, limit: int = 100, offset: int = 0) -> list[ProductListItem]:
+        return await self._fetch_list(self._list_query().limit(limit).offset(offset))
+
+    async def get_by_seller(self, user_id: UUID) -> list[ProductListItem]:
         priority_case = case(
             {
                 ProductStatus.CREATED.value.upper(): 1,
@@ -68,30 +164,88 @@ class ProductRepository(
             value=func.upper(cast(Product.status, String)),
             else_=99
         )
-        async with self.session_maker() as session:
-            result = await session.execute(
-                select(Product)
-                .where(Product.seller_id == user_id, Product.deleted_at == None)
-                .order_by(
-                    priority_case.asc(),
-                    Product.created_at.asc(),
-                )
-                .options(*self.options)
+        return await self._fetch_list(
+            self._list_query()
+            .where(Product.seller_id == user_id)
+            .order_by(
+                priority_case.asc(),
+                Product.created_at.asc(),
             )
-            products = result.unique().scalars().all()
+        )
 
-        return [self.entity_to_model(product) for product in products]
+    async def get_products_to_review(self) -> list[ProductListItem]:
+        return await self._fetch_list(
+            self._list_query()
+            .order_by(self.entity.updated_at.asc())  # ← сортировка по возрастанию
+        )
 
-    async def get_products_to_review(self) -> list[ProductModel]:
-        async with self.session_maker() as session:
-            result = await session.execute(
-                select(self.entity)
-                .where(self.entity.deleted_at == None)
-                .options(*self.options)
-                .order_by(self.entity.updated_at.asc())  # ← сортировка по возрастанию
+    async def reserve_unit(self, product_id: UUID) -> Optional[ProductReservation]:
+        status_type = self.entity.status.type
+        # строка блокируется в CTE, чтобы вместе с новым состоянием вернуть и прежнее;
+        # конкурирующие покупатели ждут блокировку и перепроверяют остаток
+        locked = (
+            select(self.entity.id, self.entity.status, self.entity.updated_at)
+            .where(
+                self.entity.id == product_id,
+                self.entity.deleted_at == None,
+                self.entity.remaining_products > 0,
+            )
+            .with_for_update()
+            .cte('locked')
+        )
+        stmt = (
+            update(self.entity)
+            .where(self.entity.id == locked.c.id)
+            .values(
+                remaining_products=self.entity.remaining_products - 1,
+                status=case(
+                    (self.entity.remaining_products == 1, literal(ProductStatus.ARCHIVED, status_type)),
+                    else_=self.entity.status,
+                ),
+                updated_at=datetime.now(),
+            )
+            .returning(self.entity, locked.c.status, locked.c.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        async with self._transaction() as session:
+            row = (await session.execute(stmt)).one_or_none()
+            if row is None:
+                # промах — редкий путь: отличаем «нет такого товара» от «закончился»
+                found = await session.scalar(
+                    select(self.entity.id).where(self.entity.id == product_id, self.entity.deleted_at == None)
+                )
+                if found is None:
+                    raise NotFoundException
+
+        if row is None:
+            return None
+
+        entity, status_before, updated_before = row
+        after = self.entity_to_model(entity)
+        before = after.model_copy(update={
+            'remaining_products': after.remaining_products + 1,
+            'status': status_before,
+            'updated_at': updated_before,
+        })
+        return ProductReservation(before=before, after=after)
+
+    async def release_unit(self, product_id: UUID, status: Optional[ProductStatus] = None) -> None:
+        status_type = self.entity.status.type
+        new_status = literal(status, status_type) if status else case(
+            (self.entity.status == ProductStatus.ARCHIVED, literal(ProductStatus.ACTIVE, status_type)),
+            else_=self.entity.status,
+        )
+        async with self._transaction() as session:
+            await session.execute(
+                update(self.entity)
+                .where(self.entity.id == product_id)
+                .values(
+                    remaining_products=self.entity.remaining_products + 1,
+                    status=new_status,
+                    updated_at=datetime.now(),
+                )
+                .execution_options(synchronize_session=False)
             )
-            result = result.unique().scalars().all()
-        return [self.entity_to_model(x) for x in result]
 
     def create_dto_to_entity(self, dto: CreateProductDTO) -> Product:
         return Product(
@@ -151,7 +305,7 @@ class ProductRepository(
         )
 
     async def get_by_article(self, article: str) -> Optional[Product]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.article == article)
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from abstractions.repositories.push_stats import PushStatsRepositoryInterface
+from domain.models.push_stats import PushStats as PushStatsModel
+from infrastructure.entities import PushStats, Push
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class PushStatsRepository(PushStatsRepositoryInterface):
+    """
+    Только чтение: строки push_stats пишут триггеры на user_pushes,
+    поэтому прогресс рассылки — чтение по PK, а не COUNT(*) по user_pushes.
+    """
+    session_maker: async_sessionmaker
+
+    async def get_by_push(self, push_id: UUID) -> PushStatsModel:
+        async with self.session_maker() as session:
+            entity = await session.get(PushStats, push_id)
+
+        if entity is None:
+            return PushStatsModel(push_id=push_id)
+
+        return PushStatsModel.model_validate(entity)
+
+    async def get_all(self) -> list[PushStatsModel]:
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(PushStats)
+                .join(Push, Push.id == PushStats.push_id)
+                .where(Push.deleted_at.is_(None))
+                .order_by(PushStats.updated_at.desc())
+            )
+            entities = result.scalars().all()
+
+        return [PushStatsModel.model_validate(entity) for entity in entities]
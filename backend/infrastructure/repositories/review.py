@@ -36,7 +36,7 @@ class ReviewRepository(AbstractSQLAlchemyRepository[Review, Review, CreateReview
         )
 
     async def get_reviews_by_product(self, product_id: UUID) -> List[Review]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity).where(self.entity.product_id == product_id)
             )
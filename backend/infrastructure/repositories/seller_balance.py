@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from abstractions.repositories.seller_balance import SellerBalanceRepositoryInterface
+from domain.models.seller_balance import SellerBalance as SellerBalanceModel
+from infrastructure.entities import SellerBalance
+from infrastructure.repositories.unit_of_work import get_current_session
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class SellerBalanceRepository(SellerBalanceRepositoryInterface):
+    """
+    Только чтение: строки seller_balances пишут триггеры на products/orders
+    в той же транзакции, что и изменение товара или заказа.
+    """
+    session_maker: async_sessionmaker
+
+    async def get_by_seller(self, seller_id: UUID) -> SellerBalanceModel:
+        shared = get_current_session()
+        if shared is not None:
+            # строку меняют триггеры в этой же транзакции — identity map не верим
+            entity = await shared.get(SellerBalance, seller_id, populate_existing=True)
+        else:
+            async with self.session_maker() as session:
+                entity = await session.get(SellerBalance, seller_id)
+
+        if entity is None:
+            return SellerBalanceModel(seller_id=seller_id)
+
+        return SellerBalanceModel.model_validate(entity)
@@ -16,7 +16,7 @@ CreateSellerReviewDTO, UpdateSellerReviewDTO],
                        SellerReviewRepositoryInterface):
 
     async def get_seller_reviews_by_seller(self, seller_id: UUID):
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.seller_id == seller_id)
@@ -1,21 +1,26 @@
-import logging
 from abc import abstractmethod
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Type, Optional, Any
+from typing import Type, Optional, Any, AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, inspect
 from sqlalchemy.exc import NoResultFound, MissingGreenlet
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 from sqlalchemy.orm import joinedload, InstrumentedAttribute
 from sqlalchemy.orm.exc import DetachedInstanceError
 
 from abstractions.repositories import CRUDRepositoryInterface
 from infrastructure.entities import UserHistory
 from infrastructure.repositories.exceptions import NotFoundException
+from infrastructure.repositories.unit_of_work import get_current_session
+from utils.log import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+# размер пачки серверного курсора для потоковых выборок (выгрузки)
+STREAM_BATCH_SIZE = 500
 
 
 @dataclass
@@ -84,18 +89,39 @@ class AbstractSQLAlchemyRepository[Entity, Model, CreateDTO, UpdateDTO](
 
         self.options.extend(options_to_add)
 
-    async def create(self, obj: CreateDTO) -> None:
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[AsyncSession]:
+        """Сессия для чтения: общая, если открыта единица работы, иначе своя."""
+        shared = get_current_session()
+        if shared is not None:
+            yield shared
+            return
+
         async with self.session_maker() as session:
-            async with session.begin():
-                session.add(self.create_dto_to_entity(obj))
+            yield session
+
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[AsyncSession]:
+        """Сессия для записи: внутри единицы работы коммитит она, иначе — своя транзакция."""
+        shared = get_current_session()
+        if shared is not None:
+            yield shared
+            return
 
-    async def create_many(self, objs: list[CreateDTO]) -> None:
         async with self.session_maker() as session:
             async with session.begin():
-                session.add_all([self.create_dto_to_entity(obj) for obj in objs])
+                yield session
+
+    async def create(self, obj: CreateDTO) -> None:
+        async with self._transaction() as session:
+            session.add(self.create_dto_to_entity(obj))
+
+    async def create_many(self, objs: list[CreateDTO]) -> None:
+        async with self._transaction() as session:
+            session.add_all([self.create_dto_to_entity(obj) for obj in objs])
 
     async def get(self, obj_id: UUID) -> Model:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             try:
                 stmt = (
                         select(self.entity)
@@ -117,32 +143,30 @@ class AbstractSQLAlchemyRepository[Entity, Model, CreateDTO, UpdateDTO](
                 raise NotFoundException
 
     async def update(self, obj_id: UUID, obj: UpdateDTO) -> None:
-        async with self.session_maker() as session:
-            async with session.begin():
-                entity = await session.get(self.entity, obj_id)
-                if self._soft_delete and entity.deleted_at:
-                    raise NotFoundException()
+        async with self._transaction() as session:
+            entity = await session.get(self.entity, obj_id)
+            if self._soft_delete and entity.deleted_at:
+                raise NotFoundException()
 
-                for key, value in obj.model_dump(exclude_unset=True).items():
-                    setattr(entity, key, value)
+            for key, value in obj.model_dump(exclude_unset=True).items():
+                setattr(entity, key, value)
 
     async def delete(self, obj_id: UUID) -> None:
-        async with self.session_maker() as session:
-            async with session.begin():
-                obj = await session.get(self.entity, obj_id)
-                if not obj:
-                    raise NotFoundException
+        async with self._transaction() as session:
+            obj = await session.get(self.entity, obj_id)
+            if not obj:
+                raise NotFoundException
 
-                if self._soft_delete:
-                    if obj.deleted_at:
-                        raise NotFoundException
-                    else:
-                        obj.deleted_at = datetime.now()
+            if self._soft_delete:
+                if obj.deleted_at:
+                    raise NotFoundException
                 else:
-                    await session.delete(obj)
+                    obj.deleted_at = datetime.now()
+            else:
+                await session.delete(obj)
 
     async def get_all(self, limit: int = 100, offset: int = 0, joined: bool = True) -> list[Model]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             stmt = (
                 select(self.entity)
                 .limit(limit)
@@ -173,8 +197,11 @@ class AbstractSQLAlchemyRepository[Entity, Model, CreateDTO, UpdateDTO](
 
     @staticmethod
     def _get_relation(entity: Entity, relation: str, use_list: bool = False) -> Optional[Any]:
+        # внутри единицы работы сессия ещё открыта — ленивую загрузку не запускаем
+        if relation in inspect(entity).unloaded:
+            return [] if use_list else None
         try:
             return getattr(entity, relation)
         except DetachedInstanceError:
-            logger.error(f"Could not get {relation} from {entity.id}")
+            logger.error("relation is not loaded on detached entity", relation=relation, entity_id=entity.id)
             return [] if use_list else None
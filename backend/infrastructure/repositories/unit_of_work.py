@@ -0,0 +1,34 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from abstractions.repositories.unit_of_work import UnitOfWorkInterface
+
+# сессия текущей единицы работы; у каждой asyncio-задачи свой контекст
+_current_session: ContextVar[Optional[AsyncSession]] = ContextVar('uow_session', default=None)
+
+
+def get_current_session() -> Optional[AsyncSession]:
+    return _current_session.get()
+
+
+@dataclass
+class SQLAlchemyUnitOfWork(UnitOfWorkInterface):
+    session_maker: async_sessionmaker
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[None]:
+        if _current_session.get() is not None:
+            yield
+            return
+
+        async with self.session_maker() as session:
+            async with session.begin():
+                token = _current_session.set(session)
+                try:
+                    yield
+                finally:
+                    _current_session.reset(token)
@@ -0,0 +1,55 @@
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Collection, AsyncIterator
+
+from sqlalchemy import select, union, func
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from abstractions.repositories.upload_reference import UploadReferenceRepositoryInterface
+from infrastructure.entities import Product, Push, Order
+
+# все колонки, в которых лежат пути к файлам из каталога загрузок
+_REFERENCE_COLUMNS = (
+    Product.image_path,
+    Push.image_path,
+    Order.search_screenshot_path,
+    Order.cart_screenshot_path,
+    Order.final_cart_screenshot_path,
+    Order.delivery_screenshot_path,
+    Order.barcodes_screenshot_path,
+    Order.review_screenshot_path,
+    Order.receipt_screenshot_path,
+)
+
+# ключ pg_advisory_lock сборщика мусора загрузок (произвольная константа)
+_GC_LOCK_KEY = 0x75706c6f6164
+
+
+@dataclass
+class UploadReferenceRepository(UploadReferenceRepositoryInterface):
+    """
+    Только чтение. Удалённые мягко (deleted_at) строки тоже считаются ссылками:
+    их ещё можно восстановить или показать в истории.
+    """
+    session_maker: async_sessionmaker
+
+    async def get_referenced(self, paths: Collection[str]) -> set[str]:
+        if not paths:
+            return set()
+
+        paths = list(paths)
+        query = union(*(
+            select(column.label('path')).where(column.in_(paths))
+            for column in _REFERENCE_COLUMNS
+        ))
+        async with self.session_maker() as session:
+            result = await session.execute(query)
+            return set(result.scalars().all())
+
+    @asynccontextmanager
+    async def gc_lock(self) -> AsyncIterator[bool]:
+        # xact-блокировка снимается вместе с транзакцией — даже если процесс упадёт посреди сборки
+        async with self.session_maker() as session:
+            async with session.begin():
+                acquired = await session.scalar(select(func.pg_try_advisory_xact_lock(_GC_LOCK_KEY)))
+                yield bool(acquired)
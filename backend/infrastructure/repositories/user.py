@@ -1,4 +1,3 @@
-import logging
 from dataclasses import dataclass, field
 from typing import Optional
 from uuid import UUID
@@ -11,8 +10,9 @@ from domain.models import User as UserModel
 from infrastructure.entities import User
 from infrastructure.enums.user_role import UserRole
 from infrastructure.repositories.sqlalchemy import AbstractSQLAlchemyRepository
+from utils.log import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -25,41 +25,36 @@ class UserRepository(
     })
 
     async def update(self, obj_id: UUID, obj: UpdateUserDTO) -> None:
-        async with self.session_maker() as session:
-            async with session.begin():
-                user = await session.get(self.entity, obj_id, with_for_update=True)
-
-                payload = obj.model_dump(exclude_unset=True).copy()
-
-                # если в апдейте передана новая роль — проверим
-                if "role" in payload and payload["role"] is not None:
-                    new_role = payload["role"]
-                    # на случай если пришла строка
-                    if isinstance(new_role, str):
-                        new_role = UserRole(new_role)
-
-                    # запрещаем понижения MODERATOR/ADMIN -> CLIENT/SELLER
-                    if user.role in {UserRole.MODERATOR, UserRole.ADMIN} and \
-                            new_role in {UserRole.CLIENT, UserRole.SELLER}:
-                        # просто выбрасываем поле из апдейта
-                        logging.info(
-                            "Blocked role downgrade for %s: %s -> %s",
-                            obj_id, user.role, new_role
-                        )
-                        payload.pop("role")
-
-                # применяем оставшиеся поля
-                for key, value in payload.items():
-                    setattr(user, key, value)
+        async with self._transaction() as session:
+            user = await session.get(self.entity, obj_id, with_for_update=True)
+
+            payload = obj.model_dump(exclude_unset=True).copy()
+
+            # если в апдейте передана новая роль — проверим
+            if "role" in payload and payload["role"] is not None:
+                new_role = payload["role"]
+                # на случай если пришла строка
+                if isinstance(new_role, str):
+                    new_role = UserRole(new_role)
+
+                # запрещаем понижения MODERATOR/ADMIN -> CLIENT/SELLER
+                if user.role in {UserRole.MODERATOR, UserRole.ADMIN} and \
+                        new_role in {UserRole.CLIENT, UserRole.SELLER}:
+                    # просто выбрасываем поле из апдейта
+                    logger.info("role downgrade blocked", user_id=obj_id, role=user.role, new_role=new_role)
+                    payload.pop("role")
+
+            # применяем оставшиеся поля
+            for key, value in payload.items():
+                setattr(user, key, value)
 
     async def increase_referrer_bonus(self, user_id: UUID, bonus: int) -> None:
-        async with self.session_maker() as session:
-            async with session.begin():
-                user = await session.get(self.entity, user_id)
-                user.referrer_bonus += bonus
+        async with self._transaction() as session:
+            user = await session.get(self.entity, user_id)
+            user.referrer_bonus += bonus
 
     async def get_moderators(self) -> list[UserModel]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.role == UserRole.MODERATOR)
@@ -70,7 +65,7 @@ class UserRepository(
         return [self.entity_to_model(x) for x in result]
 
     async def get_sellers(self) -> list[UserModel]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.role == UserRole.SELLER or self.entity.is_seller == True)
@@ -81,7 +76,7 @@ class UserRepository(
         return [self.entity_to_model(x) for x in result]
 
     async def get_clients(self) -> list[UserModel]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.role == UserRole.CLIENT)
@@ -92,7 +87,7 @@ class UserRepository(
         return [self.entity_to_model(x) for x in result]
 
     async def get_banned(self) -> list[UserModel]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.is_banned == True)
@@ -103,7 +98,7 @@ class UserRepository(
         return [self.entity_to_model(x) for x in result]
 
     async def get_by_telegram_id(self, telegram_id: int) -> Optional[UserModel]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.telegram_id == telegram_id)
@@ -116,7 +111,7 @@ class UserRepository(
         return None
 
     async def get_by_nickname(self, nickname: str) -> Optional[User]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.nickname == nickname)
@@ -129,13 +124,12 @@ class UserRepository(
         return None
 
     async def become_seller(self, user_id: UUID):
-        async with self.session_maker() as session:
+        async with self._transaction() as session:
             user = await session.get(self.entity, user_id)
-            async with session.begin():
-                user.is_seller = True
+            user.is_seller = True
 
     async def ensure_user(self, dto: CreateUserDTO) -> UserModel:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             result = await session.execute(
                 select(self.entity)
                 .where(self.entity.telegram_id == dto.telegram_id)
@@ -1,15 +1,20 @@
-import logging
 from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Optional
 from uuid import UUID
 
 from abstractions.repositories.user_history import UserHistoryRepositoryInterface
-from domain.dto.user_history import CreateUserHistoryDTO, UpdateUserHistoryDTO
+from domain.dto.user_history import CreateUserHistoryDTO, UpdateUserHistoryDTO, UserHistoryFilter
 from domain.models.user_history import UserHistory as UserHistoryModel
 from infrastructure.entities import UserHistory
-from infrastructure.repositories.sqlalchemy import AbstractSQLAlchemyRepository
-from sqlalchemy import select
+from infrastructure.repositories.sqlalchemy import AbstractSQLAlchemyRepository, STREAM_BATCH_SIZE
+from sqlalchemy import select, insert, tuple_
+from utils.json_diff import diff_snapshots
+from utils.log import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+_SNAPSHOT_COLUMNS = ('json_before', 'json_after')
 
 
 @dataclass
@@ -18,31 +23,76 @@ class UserHistoryRepository(
     UserHistoryRepositoryInterface,
 ):
 
-    async def get_by_user(self, user_id: UUID) -> list[UserHistory]:
-        async with self.session_maker() as session:
-            result = await session.execute(
+    async def get_by_user(
+            self,
+            user_id: UUID,
+            limit: int = 100,
+            after: Optional[tuple[datetime, UUID]] = None,
+            filters: Optional[UserHistoryFilter] = None,
+            with_snapshots: bool = True,
+    ) -> list[UserHistoryModel]:
+        # без снимков не тянем JSONB вовсе — строки ленты остаются короткими
+        columns = [
+            c for c in self.entity.__table__.columns
+            if with_snapshots or c.name not in _SNAPSHOT_COLUMNS
+        ]
+        stmt = select(*columns).where(self.entity.user_id == user_id)
+
+        if filters is not None:
+            if filters.actions:
+                stmt = stmt.where(self.entity.action.in_(filters.actions))
+            if filters.product_id is not None:
+                stmt = stmt.where(self.entity.product_id == filters.product_id)
+            if filters.date_from is not None:
+                stmt = stmt.where(self.entity.date >= filters.date_from)
+            if filters.date_to is not None:
+                stmt = stmt.where(self.entity.date < filters.date_to)
+
+        if after:
+            # keyset: строго после последней отданной строки, по индексам (user_id, [action|product_id,] date, id)
+            stmt = stmt.where(tuple_(self.entity.date, self.entity.id) < tuple_(*after))
+
+        stmt = stmt.order_by(self.entity.date.desc(), self.entity.id.desc()).limit(limit)
+
+        async with self._session() as session:
+            rows = (await session.execute(stmt)).mappings().all()
+
+        return [
+            UserHistoryModel.model_construct(**{**dict.fromkeys(_SNAPSHOT_COLUMNS), **row})
+            for row in rows
+        ]
+
+    async def stream_by_user(self, user_id: UUID) -> AsyncIterator[UserHistoryModel]:
+        async with self._session() as session:
+            result = await session.stream_scalars(
                 select(self.entity)
                 .where(self.entity.user_id == user_id)
+                .order_by(self.entity.date, self.entity.id)
+                .execution_options(yield_per=STREAM_BATCH_SIZE)
             )
+            async for history in result:
+                yield self.entity_to_model(history)
 
-            result = result.scalars().all()
+    async def create_many(self, objs: list[CreateUserHistoryDTO]) -> None:
+        # одна инструкция INSERT ... VALUES (...), (...) на всю пачку вместо INSERT на строку
+        if not objs:
+            return
 
-        return [self.entity_to_model(history) for history in result]
+        async with self._transaction() as session:
+            await session.execute(
+                insert(self.entity).values([self._compact_row(dto.model_dump()) for dto in objs])
+            )
 
+    @staticmethod
+    def _compact_row(row: dict) -> dict:
+        # вместо двух полных дампов храним только изменённые поля
+        row['is_diff'] = row['json_before'] is not None and row['json_after'] is not None
+        if row['is_diff']:
+            row['json_before'], row['json_after'] = diff_snapshots(row['json_before'], row['json_after'])
+        return row
 
     def create_dto_to_entity(self, dto: CreateUserHistoryDTO) -> UserHistory:
-        return UserHistory(
-            id=dto.id,
-            user_id=dto.user_id,
-            creator_id=dto.creator_id,
-            product_id=dto.product_id,
-            action=dto.action,
-            date=dto.date,
-            json_before=dto.json_before,
-            json_after=dto.json_after,
-            created_at=dto.created_at,
-            updated_at=dto.updated_at,
-        )
+        return UserHistory(**self._compact_row(dto.model_dump()))
 
     def entity_to_model(self, entity: UserHistory) -> UserHistoryModel:
         return UserHistoryModel(
@@ -54,6 +104,7 @@ class UserHistoryRepository(
             date=entity.date,
             json_before=entity.json_before,
             json_after=entity.json_after,
+            is_diff=entity.is_diff,
             created_at=entity.created_at,
             updated_at=entity.updated_at,
         )
@@ -3,13 +3,15 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, func, literal, exists, or_
+from sqlalchemy.dialects.postgresql import insert
 
 from abstractions.repositories.user_push import UserPushRepositoryInterface
-from domain.dto.user_push import CreateUserPushDTO, UpdateUserPushDTO
+from domain.dto.user_push import CreateUserPushDTO, UpdateUserPushDTO, PushAudience
 from domain.models import UserPush as UserPushModel, User as UserModel, Push as PushModel
-from infrastructure.entities import UserPush, User, Push
+from infrastructure.entities import UserPush, User, Push, Order
 from infrastructure.enums.push_status import PushStatus
+from infrastructure.enums.user_role import UserRole
 from infrastructure.repositories.sqlalchemy import AbstractSQLAlchemyRepository
 
 @dataclass
@@ -23,15 +25,14 @@ class UserPushRepository(
     })
 
     async def set_status(self, user_push_id: UUID, status: PushStatus, sent_at: Optional[datetime] = None):
-        async with self.session_maker() as session:
-            async with session.begin():
-                user_push = await session.get(self.entity, user_push_id)
-                user_push.status = status
-                if sent_at:
-                    user_push.sent_at = sent_at
+        async with self._transaction() as session:
+            user_push = await session.get(self.entity, user_push_id)
+            user_push.status = status
+            if sent_at:
+                user_push.sent_at = sent_at
 
     async def get_queued_pushes(self, size: int = 10) -> list[UserPush]:
-        async with self.session_maker() as session:
+        async with self._session() as session:
             res = await session.execute(
                 select(self.entity.status == PushStatus.PLANNED)
                 .options(*self.options)
@@ -42,6 +43,70 @@ class UserPushRepository(
 
         return [self.entity_to_model(x) for x in res]  # noqa
 
+    async def enqueue_audience(self, push_id: UUID, audience: PushAudience) -> int:
+        # одна вставка INSERT ... SELECT FROM users вместо объекта на каждого получателя;
+        # тем, у кого этот пуш уже в очереди, второй не ставим
+        queued = (
+            select(self.entity.id)
+            .where(
+                self.entity.push_id == push_id,
+                self.entity.user_id == User.id,
+                self.entity.status.in_([PushStatus.PLANNED, PushStatus.IN_PROGRESS]),
+            )
+        )
+        recipients = (
+            select(
+                func.gen_random_uuid(),
+                literal(push_id),
+                User.id,
+                literal(PushStatus.PLANNED, type_=self.entity.status.type),
+                func.localtimestamp(),
+                func.localtimestamp(),
+            )
+            .where(
+                User.telegram_id.is_not(None),
+                ~exists(queued),
+                *self._audience_filters(audience),
+            )
+        )
+        stmt = (
+            insert(self.entity)
+            .from_select(['id', 'push_id', 'user_id', 'status', 'created_at', 'updated_at'], recipients)
+            .on_conflict_do_nothing(
+                index_elements=[self.entity.push_id, self.entity.user_id],
+                index_where=self.entity.status.in_([PushStatus.PLANNED, PushStatus.IN_PROGRESS]),
+            )
+        )
+        async with self._transaction() as session:
+            result = await session.execute(stmt)
+
+        return result.rowcount
+
+    @staticmethod
+    def _audience_filters(audience: PushAudience) -> list:
+        filters = []
+        if not audience.include_banned:
+            filters.append(User.is_banned.is_(False))
+        if audience.user_ids is not None:
+            filters.append(User.id.in_(audience.user_ids))
+        if audience.roles:
+            filters.append(User.role.in_(audience.roles))
+        if audience.sellers is not None:
+            is_seller = or_(User.role == UserRole.SELLER, User.is_seller.is_(True))
+            filters.append(is_seller if audience.sellers else ~is_seller)
+        if audience.ordered_from_seller_id is not None or audience.ordered_product_id is not None:
+            orders = select(Order.id).where(Order.user_id == User.id)
+            if audience.ordered_from_seller_id is not None:
+                orders = orders.where(Order.seller_id == audience.ordered_from_seller_id)
+            if audience.ordered_product_id is not None:
+                orders = orders.where(Order.product_id == audience.ordered_product_id)
+            filters.append(exists(orders))
+        if audience.registered_after is not None:
+            filters.append(User.created_at >= audience.registered_after)
+        if audience.registered_before is not None:
+            filters.append(User.created_at < audience.registered_before)
+        return filters
+
     def create_dto_to_entity(self, dto: CreateUserPushDTO) -> UserPush:
         return UserPush(
             id=dto.id,
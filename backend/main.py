@@ -1,4 +1,3 @@
-import logging
 import subprocess
 from contextlib import asynccontextmanager
 from asyncio import create_task, sleep
@@ -8,23 +7,26 @@ from typing import AsyncGenerator
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 from starlette.middleware.cors import CORSMiddleware
-from starlette.staticfiles import StaticFiles
 
 import migrations
+from dependencies.services.history_writer import get_history_writer
+from dependencies.services.image_variants import get_image_variant_service
 from dependencies.services.upload import get_upload_service
 from dependencies.services.order import get_order_service
-from dependencies.services.notification import get_notification_service
-from domain.dto import UpdateOrderDTO
-from infrastructure.enums.order_status import OrderStatus
 from middlewares.auth_middleware import check_for_auth
 from routes import (
     router as api_router,
 )
-
-logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+from routes.upload import static_router as upload_static_router
+from settings import settings
+from utils.log import setup_logging, get_logger
+
+logger = get_logger(__name__)
+setup_logging(
+    level=settings.logging.level,
+    as_json=settings.logging.json_format,
+    debug_payloads=settings.logging.debug_payloads,
+    sample_rates=settings.logging.sample_rates,
 )
 
 
@@ -50,58 +52,63 @@ async def lifespan(_) -> AsyncGenerator[None, None]:
     upload_service = get_upload_service()
     await upload_service.initialize()
 
+    # история пишется пачками в фоне; при остановке дописываем остаток
+    history_writer = get_history_writer()
+    history_writer.start()
+
+    # WebP-варианты картинок товаров строятся в отдельных процессах
+    image_variants = get_image_variant_service()
+    image_variants.start()
+
     # Фоновая задача: напоминания и автокансел неактивных заказов
     async def inactivity_watcher():
         order_service = get_order_service()
-        notification_service = get_notification_service()
         while True:
             try:
-                # 1) cutoff для напоминания: 3 дня назад
-                cutoff_reminder = datetime.now() - timedelta(days=3)
-                repo = order_service.order_repository
-                for order in await repo.get_inactive_orders(cutoff_reminder):
-                    try:
-                        await notification_service.send_order_progress_reminder(order.user_id, order.id)
-                        # фиксируем отметку, чтобы не слать повторно
-                        # отметка отключена (колонка убрана), используем только history
-                        # и событие в истории
-                        from dependencies.repositories.user_history import get_user_history_repository
-                        from domain.dto.user_history import CreateUserHistoryDTO
-                        from infrastructure.enums.action import Action
-                        user_history_repository = get_user_history_repository()
-                        await user_history_repository.create(CreateUserHistoryDTO(
-                            user_id=order.user_id,
-                            creator_id=None,
-                            product_id=order.product_id,
-                            action=Action.REMINDER_SENT,
-                            date=datetime.now(),
-                            json_before=None,
-                            json_after=None,
-                        ))
-                    except Exception:
-                        logging.exception("Failed to send reminder")
-
-                # 2) cutoff для отмены: 4 дня назад (сутки после напоминания)
-                cutoff_cancel = datetime.now() - timedelta(days=4)
-                for order in await repo.get_inactive_after_reminder(cutoff_cancel):
-                    try:
-                        await order_service.update_order(order.id, UpdateOrderDTO(status=OrderStatus.CANCELLED))
-                    except Exception:
-                        logging.exception("Failed to cancel inactive order")
+                now = datetime.now()
+                await order_service.process_inactive_orders(
+                    # напоминание: 3 дня без движения
+                    remind_before=now - timedelta(days=3),
+                    # отмена: напоминание отправлено 4 дня назад и больше
+                    cancel_reminded_before=now - timedelta(days=4),
+                )
             except Exception:
-                logging.exception("inactivity_watcher iteration failed")
+                logger.exception("inactivity_watcher iteration failed")
 
             # выполнять раз в час
             await sleep(3600)
 
     create_task(inactivity_watcher())
 
+    # старые строки истории с полными снимками сжимаем в фоне, не задерживая старт
+    async def compact_history():
+        try:
+            await migrations.compact_user_history()
+        except Exception:
+            logger.exception("user_history compaction failed")
+
+    create_task(compact_history())
+
+    # файлы без ссылок в БД (заменённые картинки, удалённые заказы) чистим раз в gc_interval
+    async def upload_gc():
+        while True:
+            try:
+                await upload_service.collect_garbage()
+            except Exception:
+                logger.exception("upload garbage collection failed")
+
+            await sleep(settings.upload.gc_interval)
+
+    if settings.upload.gc_interval:
+        create_task(upload_gc())
+
     yield
 
+    await history_writer.close()
+    await image_variants.close()
 
-app = FastAPI(lifespan=lifespan)
 
-app.mount("/static/images", StaticFiles(directory="upload"), name="upload")
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -110,10 +117,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 app.middleware('http')(check_for_auth)
 
 app.include_router(api_router)
+app.include_router(upload_static_router)
 
 
 def custom_openapi():
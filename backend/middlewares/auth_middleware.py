@@ -1,5 +1,3 @@
-import logging
-
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
@@ -7,6 +5,9 @@ from dependencies.services.auth import get_auth_service
 from infrastructure.repositories.exceptions import NotFoundException
 from services.auth.exceptions import InvalidTokenException, ExpiredTokenException
 from services.exceptions import PermissionException, BannedUserException
+from utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 async def check_for_auth(
@@ -38,9 +39,9 @@ async def check_for_auth(
     auth_service = get_auth_service()
     try:
         # user_id = UUID('')
-        user_id = await auth_service.get_user_id_from_jwt(access_token)
+        principal = await auth_service.get_principal_from_jwt(access_token)
     except Exception as e:
-        logging.getLogger(__name__).error(f"fuuuck {access_token}", exc_info=True)
+        logger.warning("authorization failed", path=url_path, error=type(e).__name__)
         code, detail = 401, 'Unknown authorization exception'
         match e:
             case InvalidTokenException():
@@ -60,7 +61,8 @@ async def check_for_auth(
             }
         )
 
-    request.scope['x_user_id'] = user_id
+    # роль и бан уже прочитаны (из кэша принципалов) — обработчики берут их отсюда
+    request.state.principal = principal
     try:
         response = await call_next(request)
         return response
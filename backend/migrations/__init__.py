@@ -1 +1,2 @@
 from .backfill_order_id import backfill
+from .compact_user_history import compact_user_history
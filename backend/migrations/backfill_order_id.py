@@ -1,4 +1,3 @@
-import logging
 from typing import Iterable, Any
 
 from sqlalchemy import select
@@ -6,8 +5,9 @@ from sqlalchemy import select
 from dependencies.repositories.session_maker import get_session_maker
 from dependencies.services.order import get_order_service
 from infrastructure.entities import Order
+from utils.log import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 async def backfill() -> bool:
     order_service = get_order_service()
@@ -0,0 +1,53 @@
+import asyncio
+
+from sqlalchemy import select, update, func
+
+from dependencies.repositories.session_maker import get_session_maker
+from infrastructure.entities import UserHistory
+from utils.json_diff import diff_snapshots
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+BATCH_SIZE = 500
+# пауза между пачками, чтобы не мешать рабочей нагрузке
+BATCH_PAUSE = 0.1
+
+
+async def compact_user_history() -> int:
+    """
+    Переписывает старые строки user_history с полными снимками в патчи.
+    Идёт пачками по ix_user_history_not_compacted, каждая пачка — своя транзакция,
+    поэтому прерывание безопасно: следующий запуск продолжит с оставшихся строк.
+    """
+    session_maker = get_session_maker()
+    compacted = 0
+    while True:
+        async with session_maker() as session:
+            async with session.begin():
+                rows = (await session.execute(
+                    select(UserHistory.id, UserHistory.json_before, UserHistory.json_after)
+                    .where(
+                        ~UserHistory.is_diff,
+                        func.jsonb_typeof(UserHistory.json_before) == 'object',
+                        func.jsonb_typeof(UserHistory.json_after) == 'object',
+                    )
+                    .order_by(UserHistory.id)
+                    .limit(BATCH_SIZE)
+                    .with_for_update(skip_locked=True)
+                )).all()
+                if not rows:
+                    break
+
+                patches = []
+                for row_id, before, after in rows:
+                    before, after = diff_snapshots(before, after)
+                    patches.append({'id': row_id, 'json_before': before, 'json_after': after, 'is_diff': True})
+                await session.execute(update(UserHistory), patches)
+
+        compacted += len(rows)
+        await asyncio.sleep(BATCH_PAUSE)
+
+    if compacted:
+        logger.info("user_history compacted", rows=compacted)
+    return compacted
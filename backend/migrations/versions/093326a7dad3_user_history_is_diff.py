@@ -0,0 +1,39 @@
+"""user_history is_diff
+
+Revision ID: 093326a7dad3
+Revises: d6f182030b73
+Create Date: 2025-11-08 10:21:37.640218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '093326a7dad3'
+down_revision: Union[str, None] = 'd6f182030b73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('user_history', sa.Column('is_diff', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+    # очередь для фонового сжатия старых строк (migrations.compact_user_history);
+    # новые записи сразу пишутся патчами, так что после прохода индекс пуст
+    op.create_index(
+        'ix_user_history_not_compacted',
+        'user_history',
+        ['id'],
+        unique=False,
+        # пустой снимок бывает и SQL NULL, и JSON null — сжимать есть смысл только пары объектов
+        postgresql_where=sa.text(
+            "NOT is_diff AND jsonb_typeof(json_before) = 'object' AND jsonb_typeof(json_after) = 'object'"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_history_not_compacted', table_name='user_history')
+    op.drop_column('user_history', 'is_diff')
@@ -0,0 +1,81 @@
+"""weighted products search_vector
+
+Revision ID: 216d23fd8a6a
+Revises: 798851bc8917
+Create Date: 2025-11-04 15:02:11.640982
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '216d23fd8a6a'
+down_revision: Union[str, None] = '798851bc8917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 1) функция: name — A, brand — B, key_word — C, артикул — точным токеном без стемминга
+    op.execute("""
+    CREATE OR REPLACE FUNCTION products_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+      NEW.search_vector :=
+        setweight(to_tsvector('russian', coalesce(NEW.name,'')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(NEW.brand,'')), 'B') ||
+        setweight(to_tsvector('russian', coalesce(NEW.key_word,'')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(NEW.article,'')), 'A');
+      RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """)
+
+    # 2) триггер только на текстовые колонки — остатки и статусы его больше не дёргают
+    op.execute("DROP TRIGGER IF EXISTS trg_products_search_vector ON products;")
+    op.execute("""
+    CREATE TRIGGER trg_products_search_vector
+    BEFORE INSERT OR UPDATE OF name, key_word, brand, article ON products
+    FOR EACH ROW EXECUTE FUNCTION products_search_vector_update();
+    """)
+
+    # 3) пересчитываем существующие строки
+    op.execute("""
+      UPDATE products
+      SET search_vector =
+        setweight(to_tsvector('russian', coalesce(name,'')), 'A') ||
+        setweight(to_tsvector('russian', coalesce(brand,'')), 'B') ||
+        setweight(to_tsvector('russian', coalesce(key_word,'')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(article,'')), 'A');
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    CREATE OR REPLACE FUNCTION products_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+      NEW.search_vector := to_tsvector(
+        'russian',
+        coalesce(NEW.name,'') || ' ' || coalesce(NEW.key_word,'')
+      );
+      RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """)
+    op.execute("DROP TRIGGER IF EXISTS trg_products_search_vector ON products;")
+    op.execute("""
+    CREATE TRIGGER trg_products_search_vector
+    BEFORE INSERT OR UPDATE ON products
+    FOR EACH ROW EXECUTE FUNCTION products_search_vector_update();
+    """)
+    op.execute("""
+      UPDATE products
+      SET search_vector = to_tsvector(
+        'russian',
+        coalesce(name,'') || ' ' || coalesce(key_word,'')
+      );
+    """)
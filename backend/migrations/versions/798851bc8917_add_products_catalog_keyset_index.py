@@ -0,0 +1,33 @@
+"""add products catalog keyset index
+
+Revision ID: 798851bc8917
+Revises: f523c4719874
+Create Date: 2025-11-04 10:27:36.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '798851bc8917'
+down_revision: Union[str, None] = 'f523c4719874'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # частичный индекс ровно под предикат и порядок каталога (ProductRepository.get_active_products)
+    op.create_index(
+        'ix_products_catalog_keyset',
+        'products',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text("deleted_at IS NULL AND (status = 'ACTIVE' OR always_show)"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_catalog_keyset', table_name='products')
@@ -0,0 +1,125 @@
+"""add push_stats
+
+Revision ID: 79f2a27e9223
+Revises: 7bb360224f83
+Create Date: 2025-11-06 15:08:41.772604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '79f2a27e9223'
+down_revision: Union[str, None] = '7bb360224f83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('push_stats',
+    sa.Column('push_id', sa.UUID(), nullable=False),
+    sa.Column('planned', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('in_progress', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('delivered', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('failed', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('first_sent_at', sa.DateTime(), nullable=True),
+    sa.Column('last_sent_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['push_id'], ['pushes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('push_id')
+    )
+
+    # 1) триггеры уровня оператора: пачка из сотни тысяч строк (активация рассылки,
+    #    пакетное обновление статусов в notificator) даёт один upsert на пуш, а не на строку.
+    #    У триггера с transition table может быть только одно событие — функция общая, триггеров три.
+    op.execute("""
+    CREATE OR REPLACE FUNCTION push_stats_user_pushes_update()
+    RETURNS trigger AS $$
+    DECLARE
+      delta text;
+    BEGIN
+      -- new_rows/old_rows существуют только для своих событий, поэтому дельту собираем динамически
+      IF TG_OP = 'INSERT' THEN
+        delta := 'SELECT push_id, status, 1 AS n, sent_at FROM new_rows';
+      ELSIF TG_OP = 'DELETE' THEN
+        delta := 'SELECT push_id, status, -1 AS n, NULL::timestamp AS sent_at FROM old_rows';
+      ELSE
+        delta := 'SELECT push_id, status, 1 AS n, sent_at FROM new_rows '
+                 'UNION ALL SELECT push_id, status, -1, NULL FROM old_rows';
+      END IF;
+
+      EXECUTE format($q$
+        INSERT INTO push_stats AS ps
+          (push_id, planned, in_progress, delivered, failed, first_sent_at, last_sent_at, updated_at)
+        SELECT
+          push_id,
+          COALESCE(SUM(n) FILTER (WHERE status = 'PLANNED'), 0),
+          COALESCE(SUM(n) FILTER (WHERE status = 'IN_PROGRESS'), 0),
+          COALESCE(SUM(n) FILTER (WHERE status = 'DELIVERED'), 0),
+          COALESCE(SUM(n) FILTER (WHERE status = 'FAILED'), 0),
+          MIN(sent_at),
+          MAX(sent_at),
+          now()
+        FROM (%s) delta
+        GROUP BY push_id
+        -- один порядок блокировок для параллельных пачек
+        ORDER BY push_id
+        ON CONFLICT (push_id) DO UPDATE SET
+          planned = ps.planned + EXCLUDED.planned,
+          in_progress = ps.in_progress + EXCLUDED.in_progress,
+          delivered = ps.delivered + EXCLUDED.delivered,
+          failed = ps.failed + EXCLUDED.failed,
+          first_sent_at = LEAST(ps.first_sent_at, EXCLUDED.first_sent_at),
+          last_sent_at = GREATEST(ps.last_sent_at, EXCLUDED.last_sent_at),
+          updated_at = now()
+      $q$, delta);
+
+      RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+    CREATE TRIGGER trg_user_pushes_stats_insert
+    AFTER INSERT ON user_pushes
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION push_stats_user_pushes_update();
+    """)
+    op.execute("""
+    CREATE TRIGGER trg_user_pushes_stats_update
+    AFTER UPDATE ON user_pushes
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION push_stats_user_pushes_update();
+    """)
+    op.execute("""
+    CREATE TRIGGER trg_user_pushes_stats_delete
+    AFTER DELETE ON user_pushes
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION push_stats_user_pushes_update();
+    """)
+
+    # 2) заполняем агрегат текущими данными
+    op.execute("""
+    INSERT INTO push_stats (push_id, planned, in_progress, delivered, failed, first_sent_at, last_sent_at, updated_at)
+    SELECT
+      push_id,
+      COUNT(*) FILTER (WHERE status = 'PLANNED'),
+      COUNT(*) FILTER (WHERE status = 'IN_PROGRESS'),
+      COUNT(*) FILTER (WHERE status = 'DELIVERED'),
+      COUNT(*) FILTER (WHERE status = 'FAILED'),
+      MIN(sent_at),
+      MAX(sent_at),
+      now()
+    FROM user_pushes
+    GROUP BY push_id;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_user_pushes_stats_delete ON user_pushes;")
+    op.execute("DROP TRIGGER IF EXISTS trg_user_pushes_stats_update ON user_pushes;")
+    op.execute("DROP TRIGGER IF EXISTS trg_user_pushes_stats_insert ON user_pushes;")
+    op.execute("DROP FUNCTION IF EXISTS push_stats_user_pushes_update();")
+    op.drop_table('push_stats')
@@ -0,0 +1,42 @@
+"""user_pushes queued unique index
+
+Revision ID: 7bb360224f83
+Revises: 216d23fd8a6a
+Create Date: 2025-11-06 11:42:18.350912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7bb360224f83'
+down_revision: Union[str, None] = '216d23fd8a6a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # повторная активация не должна ставить пользователю второй такой же пуш в очередь
+    op.execute("""
+    DELETE FROM user_pushes up
+    USING user_pushes dup
+    WHERE up.push_id = dup.push_id
+      AND up.user_id = dup.user_id
+      AND up.status IN ('PLANNED', 'IN_PROGRESS')
+      AND dup.status IN ('PLANNED', 'IN_PROGRESS')
+      AND (up.created_at, up.id) > (dup.created_at, dup.id);
+    """)
+    op.create_index(
+        'ux_user_pushes_queued',
+        'user_pushes',
+        ['push_id', 'user_id'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('PLANNED', 'IN_PROGRESS')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ux_user_pushes_queued', table_name='user_pushes')
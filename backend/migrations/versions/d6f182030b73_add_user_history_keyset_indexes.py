@@ -0,0 +1,47 @@
+"""add user_history keyset indexes
+
+Revision ID: d6f182030b73
+Revises: e681d1ac8f27
+Create Date: 2025-11-07 16:05:52.117380
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6f182030b73'
+down_revision: Union[str, None] = 'e681d1ac8f27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # лента истории (UserHistoryRepository.get_by_user): keyset по (date, id) внутри пользователя,
+    # отдельно — с фильтром по действию и по товару
+    op.create_index(
+        'ix_user_history_user_date',
+        'user_history',
+        ['user_id', sa.text('date DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_user_history_user_action_date',
+        'user_history',
+        ['user_id', 'action', sa.text('date DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_user_history_user_product_date',
+        'user_history',
+        ['user_id', 'product_id', sa.text('date DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_history_user_product_date', table_name='user_history')
+    op.drop_index('ix_user_history_user_action_date', table_name='user_history')
+    op.drop_index('ix_user_history_user_date', table_name='user_history')
@@ -0,0 +1,33 @@
+"""add orders seller report index
+
+Revision ID: e681d1ac8f27
+Revises: 79f2a27e9223
+Create Date: 2025-11-07 11:42:18.304915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e681d1ac8f27'
+down_revision: Union[str, None] = '79f2a27e9223'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # под агрегаты отчёта продавца (OrderRepository.get_seller_report):
+    # GROUP BY status и диапазон выплат по paid_at внутри одного продавца
+    op.create_index(
+        'ix_orders_seller_status_paid_at',
+        'orders',
+        ['seller_id', 'status', 'paid_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_seller_status_paid_at', table_name='orders')
@@ -0,0 +1,168 @@
+"""add seller_balances
+
+Revision ID: f523c4719874
+Revises: 0fda0452a004
+Create Date: 2025-11-03 12:14:51.502317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f523c4719874'
+down_revision: Union[str, None] = '0fda0452a004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('seller_balances',
+    sa.Column('seller_id', sa.UUID(), nullable=False),
+    sa.Column('reserved_active', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('unpaid_plan', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('active_plan', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('in_progress', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('seller_id')
+    )
+
+    # 1) общий upsert дельт по продавцу
+    op.execute("""
+    CREATE OR REPLACE FUNCTION seller_balances_apply(
+      p_seller_id uuid,
+      p_reserved_active integer,
+      p_unpaid_plan integer,
+      p_active_plan integer,
+      p_in_progress integer
+    ) RETURNS void AS $$
+    BEGIN
+      IF p_seller_id IS NULL OR (
+        p_reserved_active = 0 AND p_unpaid_plan = 0 AND p_active_plan = 0 AND p_in_progress = 0
+      ) THEN
+        RETURN;
+      END IF;
+
+      INSERT INTO seller_balances AS sb
+        (seller_id, reserved_active, unpaid_plan, active_plan, in_progress, updated_at)
+      VALUES
+        (p_seller_id, p_reserved_active, p_unpaid_plan, p_active_plan, p_in_progress, now())
+      ON CONFLICT (seller_id) DO UPDATE SET
+        reserved_active = sb.reserved_active + EXCLUDED.reserved_active,
+        unpaid_plan = sb.unpaid_plan + EXCLUDED.unpaid_plan,
+        active_plan = sb.active_plan + EXCLUDED.active_plan,
+        in_progress = sb.in_progress + EXCLUDED.in_progress,
+        updated_at = now();
+    END
+    $$ LANGUAGE plpgsql;
+    """)
+
+    # 2) товары: вычитаем вклад старой строки, прибавляем вклад новой
+    op.execute("""
+    CREATE OR REPLACE FUNCTION seller_balances_products_update()
+    RETURNS trigger AS $$
+    BEGIN
+      IF TG_OP <> 'INSERT' THEN
+        IF OLD.deleted_at IS NULL THEN
+          PERFORM seller_balances_apply(
+            OLD.seller_id,
+            -(CASE WHEN OLD.status = 'ACTIVE' THEN OLD.remaining_products ELSE 0 END),
+            -(CASE WHEN OLD.status = 'NOT_PAID' THEN OLD.remaining_products ELSE 0 END),
+            -(CASE WHEN OLD.status = 'ACTIVE' THEN OLD.general_repurchases ELSE 0 END),
+            0
+          );
+        END IF;
+      END IF;
+
+      IF TG_OP <> 'DELETE' THEN
+        IF NEW.deleted_at IS NULL THEN
+          PERFORM seller_balances_apply(
+            NEW.seller_id,
+            CASE WHEN NEW.status = 'ACTIVE' THEN NEW.remaining_products ELSE 0 END,
+            CASE WHEN NEW.status = 'NOT_PAID' THEN NEW.remaining_products ELSE 0 END,
+            CASE WHEN NEW.status = 'ACTIVE' THEN NEW.general_repurchases ELSE 0 END,
+            0
+          );
+        END IF;
+      END IF;
+
+      RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+    CREATE TRIGGER trg_products_seller_balances
+    AFTER INSERT OR DELETE OR UPDATE OF status, remaining_products, general_repurchases, seller_id, deleted_at
+    ON products
+    FOR EACH ROW EXECUTE FUNCTION seller_balances_products_update();
+    """)
+
+    # 3) заказы: счётчик заказов в работе (CASHBACK_NOT_PAID)
+    op.execute("""
+    CREATE OR REPLACE FUNCTION seller_balances_orders_update()
+    RETURNS trigger AS $$
+    BEGIN
+      IF TG_OP <> 'INSERT' THEN
+        IF OLD.status = 'CASHBACK_NOT_PAID' THEN
+          PERFORM seller_balances_apply(OLD.seller_id, 0, 0, 0, -1);
+        END IF;
+      END IF;
+
+      IF TG_OP <> 'DELETE' THEN
+        IF NEW.status = 'CASHBACK_NOT_PAID' THEN
+          PERFORM seller_balances_apply(NEW.seller_id, 0, 0, 0, 1);
+        END IF;
+      END IF;
+
+      RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+    CREATE TRIGGER trg_orders_seller_balances
+    AFTER INSERT OR DELETE OR UPDATE OF status, seller_id
+    ON orders
+    FOR EACH ROW EXECUTE FUNCTION seller_balances_orders_update();
+    """)
+
+    # 4) заполняем агрегат текущими данными
+    op.execute("""
+    INSERT INTO seller_balances (seller_id, reserved_active, unpaid_plan, active_plan, in_progress, updated_at)
+    SELECT
+      u.id,
+      COALESCE(p.reserved_active, 0),
+      COALESCE(p.unpaid_plan, 0),
+      COALESCE(p.active_plan, 0),
+      COALESCE(o.in_progress, 0),
+      now()
+    FROM users u
+    LEFT JOIN (
+      SELECT
+        seller_id,
+        SUM(CASE WHEN status = 'ACTIVE' THEN remaining_products ELSE 0 END) AS reserved_active,
+        SUM(CASE WHEN status = 'NOT_PAID' THEN remaining_products ELSE 0 END) AS unpaid_plan,
+        SUM(CASE WHEN status = 'ACTIVE' THEN general_repurchases ELSE 0 END) AS active_plan
+      FROM products
+      WHERE deleted_at IS NULL
+      GROUP BY seller_id
+    ) p ON p.seller_id = u.id
+    LEFT JOIN (
+      SELECT seller_id, COUNT(*) AS in_progress
+      FROM orders
+      WHERE status = 'CASHBACK_NOT_PAID'
+      GROUP BY seller_id
+    ) o ON o.seller_id = u.id
+    WHERE p.seller_id IS NOT NULL OR o.seller_id IS NOT NULL;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_orders_seller_balances ON orders;")
+    op.execute("DROP TRIGGER IF EXISTS trg_products_seller_balances ON products;")
+    op.execute("DROP FUNCTION IF EXISTS seller_balances_orders_update();")
+    op.execute("DROP FUNCTION IF EXISTS seller_balances_products_update();")
+    op.execute("DROP FUNCTION IF EXISTS seller_balances_apply(uuid, integer, integer, integer, integer);")
+    op.drop_table('seller_balances')
@@ -1,16 +1,16 @@
-import logging
 
 from fastapi import APIRouter, Request, HTTPException
 
 from dependencies.services.deeplink import get_deeplink_service
 from domain.responses.deeplink import DeeplinkResponse
+from utils.log import get_logger
 
 router = APIRouter(
     prefix="/deeplink",
     tags=["Deeplink"],
 )
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 @router.get("/resolve")
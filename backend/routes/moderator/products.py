@@ -3,6 +3,7 @@ from uuid import UUID
 from fastapi import APIRouter, Request
 
 from domain.models import Product
+from domain.models.product import ProductListItem
 from routes.moderator.utils import moderator_pre_request
 from routes.requests.moderator import UpdateProductStatusRequest
 
@@ -13,7 +14,7 @@ router = APIRouter(
 @router.get('')
 async def get_products(
         request: Request,
-) -> list[Product]:
+) -> list[ProductListItem]:
     _, moderator_service, _ = await moderator_pre_request(request)
 
     return await moderator_service.get_products()
@@ -22,7 +23,7 @@ async def get_products(
 @router.get('/to-review')
 async def get_products_to_review(
         request: Request,
-) -> list[Product]:
+) -> list[ProductListItem]:
     _, moderator_service, _ = await moderator_pre_request(request)
 
     return await moderator_service.get_products_to_review()
@@ -1,18 +1,27 @@
-from typing import Annotated
+import asyncio
+from typing import Annotated, Union
 from uuid import UUID
 
 from fastapi import APIRouter, Request, Form, HTTPException
+from fastapi.responses import StreamingResponse
 
 from dependencies.services.upload import get_upload_service
 from domain.dto import CreatePushDTO, UpdatePushDTO
+from domain.dto.user_push import PushAudience
 from domain.models import Push
+from domain.models.push_stats import PushStats
+from domain.responses.push import ActivatePushResponse
 from routes.moderator.utils import moderator_pre_request
-from routes.requests.push import CreatePushRequest, UpdatePushRequest
+from routes.requests.push import CreatePushRequest, UpdatePushRequest, ActivatePushRequest
 
 router = APIRouter(
     prefix='/pushes'
 )
 
+# как часто SSE-поток перечитывает счётчики и шлёт keepalive, сек.
+PROGRESS_POLL_INTERVAL = 1.0
+PROGRESS_KEEPALIVE_INTERVAL = 15.0
+
 
 @router.get('')
 async def get_pushes(request: Request) -> list[Push]:
@@ -21,6 +30,13 @@ async def get_pushes(request: Request) -> list[Push]:
     return await moderator_service.get_pushes()
 
 
+@router.get('/stats')
+async def get_pushes_stats(request: Request) -> list[PushStats]:
+    _, moderator_service, _ = await moderator_pre_request(request)
+
+    return await moderator_service.get_pushes_stats()
+
+
 @router.get('/{push_id}')
 async def get_push(
         push_id: UUID,
@@ -99,12 +115,69 @@ async def delete_push(
 @router.post('/{push_id}/activate')
 async def activate_push(
         push_id: UUID,
-        user_ids: list[UUID],
         request: Request,
-) -> None:
+        activate_request: Union[list[UUID], ActivatePushRequest, None] = None,
+) -> ActivatePushResponse:
+    """
+    Тело — фильтры аудитории (ActivatePushRequest) или, в старом формате, список id.
+    Без тела (или с {}) — рассылка всем.
+    """
     moderator_id, moderator_service, _ = await moderator_pre_request(request)
 
-    await moderator_service.activate_push(
+    if activate_request is None:
+        audience = PushAudience()
+    # старый формат — явный список id — тоже фильтр аудитории
+    elif isinstance(activate_request, list):
+        audience = PushAudience(user_ids=activate_request)
+    else:
+        audience = PushAudience.model_validate(activate_request.model_dump())
+
+    queued = await moderator_service.activate_push(
         push_id=push_id,
-        user_ids=user_ids,
+        audience=audience,
+    )
+    return ActivatePushResponse(queued=queued)
+
+
+@router.get('/{push_id}/stats')
+async def get_push_stats(
+        push_id: UUID,
+        request: Request,
+) -> PushStats:
+    _, moderator_service, _ = await moderator_pre_request(request)
+
+    return await moderator_service.get_push_stats(push_id)
+
+
+@router.get('/{push_id}/stats/stream')
+async def stream_push_stats(
+        push_id: UUID,
+        request: Request,
+) -> StreamingResponse:
+    _, moderator_service, _ = await moderator_pre_request(request)
+
+    async def events():
+        # счётчики — одна строка по PK, поэтому опрашиваем часто, а отправляем только изменения
+        last_payload = None
+        idle = 0.0
+        while not await request.is_disconnected():
+            stats = await moderator_service.get_push_stats(push_id)
+            payload = stats.model_dump_json()
+            if payload != last_payload:
+                last_payload, idle = payload, 0.0
+                yield f"event: progress\ndata: {payload}\n\n"
+                if stats.total and not stats.planned and not stats.in_progress:
+                    yield "event: done\ndata: {}\n\n"
+                    return
+            elif idle >= PROGRESS_KEEPALIVE_INTERVAL:
+                idle = 0.0
+                yield ": keepalive\n\n"
+
+            await asyncio.sleep(PROGRESS_POLL_INTERVAL)
+            idle += PROGRESS_POLL_INTERVAL
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
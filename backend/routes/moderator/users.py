@@ -1,4 +1,3 @@
-import logging
 from typing import List
 from uuid import UUID
 
@@ -7,12 +6,13 @@ from fastapi import APIRouter, Request
 from domain.models import User
 from domain.models.moderator_review import ModeratorReview
 from routes.moderator.utils import moderator_pre_request
+from utils.log import get_logger
 
 router = APIRouter(
     prefix='/users',
 )
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 @router.get('')
 async def get_users(
@@ -66,7 +66,7 @@ async def get_user(
     _, moderator_service, _ = await moderator_pre_request(request)
 
     res = await moderator_service.get_user(user_id)
-    logger.info(f'inviter {res.inviter}')
+    logger.info("moderator viewed user", user_id=user_id, inviter=res.inviter)
     return res
 
 @router.post('/{user_id}/ban')
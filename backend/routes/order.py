@@ -1,9 +1,8 @@
-import logging
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Request, Depends
+from fastapi import APIRouter, Request, Depends, HTTPException
 from fastapi import UploadFile, Form, File
 
 from abstractions.services.upload import UploadServiceInterface
@@ -12,13 +11,15 @@ from dependencies.services.upload import get_upload_service
 from domain.dto import UpdateOrderDTO
 from domain.dto.order import CreateOrderDTO
 from infrastructure.enums.order_status import OrderStatus
+from infrastructure.repositories.exceptions import NotFoundException
+from utils.log import get_logger
 
 router = APIRouter(
     prefix="/orders",
     tags=["Orders"],
 )
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 @router.get("")
@@ -55,7 +56,10 @@ async def create_order(
 
     # Допустим, у вас есть OrderService со методом create_order
     order_service = get_order_service()
-    new_order_id = await order_service.create_order(order_data)
+    try:
+        new_order_id = await order_service.create_order(order_data)
+    except NotFoundException:
+        raise HTTPException(status_code=404, detail="Product not found")
     return new_order_id
 
 
@@ -123,9 +127,12 @@ async def update_order(
         path = await upload_service.upload(cart_screenshot_path)
         update_data["cart_screenshot_path"] = path
 
-    logger.info('ФАЙЛЫ')
-    logger.info(search_screenshot_path)
-    logger.info(cart_screenshot_path)
+    logger.debug(
+        "order screenshots",
+        order_id=order_id,
+        search=getattr(search_screenshot_path, "filename", None),
+        cart=getattr(cart_screenshot_path, "filename", None),
+    )
 
     # Шаг 4: реквизиты
     if card_number is not None:
@@ -1,39 +1,71 @@
-import logging
 from typing import Optional, Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request, Depends
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request, Depends, Query
 
+from abstractions.services.catalog_cache import CatalogCacheInterface
+from abstractions.services.image_variants import ImageVariantServiceInterface
 from abstractions.services.upload import UploadServiceInterface
+from dependencies.services.catalog_cache import get_catalog_cache
+from dependencies.services.image_variants import get_image_variant_service
 from dependencies.services.product import get_product_service  # функция, возвращающая экземпляр ProductService
 from dependencies.services.upload import get_upload_service
 from dependencies.services.user_context import get_me_cached
 from domain.dto import CreateProductDTO, UpdateProductDTO
 from domain.dto.user_with_balance import UserWithBalanceDTO
 from domain.models import Product
+from domain.models.cached_response import CachedResponse
+from domain.models.product import ProductSearchHit, ProductListItem
 from domain.responses.product import ProductResponse
 from infrastructure.enums.category import Category
 from infrastructure.enums.payout_time import PayoutTime
 from infrastructure.enums.product_status import ProductStatus
 from routes.requests.update_product import UpdateProductForm
-from routes.utils import get_user_id_from_request
+from routes.utils import get_user_id_from_request, cached_json_response
+from utils.log import get_logger, Payload
 
 router = APIRouter(
     prefix="/products",
     tags=["Products"],
 )
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 @router.get("")
 async def get_products(
         request: Request,
         search: Optional[str] = None,
-):
+        limit: Annotated[int, Query(ge=1, le=100)] = 100,
+        cursor: Optional[str] = None,
+        ranked: bool = True,
+        catalog_cache: CatalogCacheInterface = Depends(get_catalog_cache),
+) -> list[Product] | list[ProductSearchHit]:
+    """
+    Каталог от новых к старым или, при search и ranked, поиск по релевантности.
+    Оба режима листаются курсором из заголовка X-Next-Cursor; курсоры режимов
+    несовместимы — чужой курсор даёт 400.
+    """
     product_service = get_product_service()
-    products = await product_service.get_active_products(search=search)
-    return products
+
+    async def load() -> CachedResponse:
+        if search and ranked:
+            page = await product_service.search_products(search, limit=limit, cursor=cursor)
+        else:
+            page = await product_service.get_catalog_page(limit=limit, cursor=cursor, search=search)
+        # тело остаётся списком, курсор следующей страницы — в заголовке
+        headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+        return CachedResponse.build(page.items, headers)
+
+    try:
+        cached = await catalog_cache.get_or_load(
+            ("products", search, limit, cursor, ranked),
+            load,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return cached_json_response(request, cached)
 
 
 @router.get("/article")
@@ -42,7 +74,7 @@ async def get_by_article(article: str) -> Product:
     return await product_service.get_by_article(article)
 
 @router.get("/user/{user_id}")
-async def get_by_user(user_id: UUID) -> list[Product]:
+async def get_by_user(user_id: UUID) -> list[ProductListItem]:
     product_service = get_product_service()
     return await product_service.get_by_seller(user_id)
 
@@ -68,8 +100,7 @@ async def get_by_seller(
       - products: список продуктов
       """
 
-    logger.info("me!!!")
-    logger.info(me)
+    logger.debug("seller products requested", me=Payload(me))
     prods = await product_service.get_by_seller(me.id)
     return {
         "free_balance": me.free_balance,
@@ -82,19 +113,26 @@ async def get_by_seller(
 
 @router.get("/{product_id}")
 async def get_product(
+        request: Request,
         product_id: UUID,
+        catalog_cache: CatalogCacheInterface = Depends(get_catalog_cache),
 ) -> ProductResponse:
     product_service = get_product_service()
-    product = await product_service.get_product(product_id)
 
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
+    async def load() -> CachedResponse:
+        product = await product_service.get_product(product_id)
+
+        if not product:
+            raise HTTPException(status_code=404, detail="Product not found")
+
+        response = ProductResponse.model_validate(product)
+        if product.moderator_reviews:
+            response.last_moderator_review = product.moderator_reviews[-1]  # todo
 
-    response = ProductResponse.model_validate(product)
-    if product.moderator_reviews:
-        response.last_moderator_review = product.moderator_reviews[-1]  # todo
+        return CachedResponse.build(response)
 
-    return response
+    cached = await catalog_cache.get_or_load(("product", product_id), load)
+    return cached_json_response(request, cached)
 
 
 @router.post("")
@@ -115,9 +153,10 @@ async def create_product(
         requirements_agree: bool = Form(...),
         image: Optional[UploadFile] = File(None),
         upload_service: UploadServiceInterface = Depends(get_upload_service),
+        image_variants: ImageVariantServiceInterface = Depends(get_image_variant_service),
         always_show: bool = Form(False),
 ) -> UUID:
-    logger.info(f"Create product: {name}")
+    logger.info("create product", name=name)
     seller_id = get_user_id_from_request(request)
     image_path = None
 
@@ -144,6 +183,9 @@ async def create_product(
     if image is not None:
         try:
             image_path = await upload_service.upload(image)
+            image_variants.schedule(image_path)
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=500,
@@ -166,6 +208,7 @@ async def update_product(
         product_id: UUID,
         data: Annotated[UpdateProductForm, Form()],
         upload_service: UploadServiceInterface = Depends(get_upload_service),
+        image_variants: ImageVariantServiceInterface = Depends(get_image_variant_service),
 ) -> dict:
     user_id=get_user_id_from_request(request)
 
@@ -190,8 +233,11 @@ async def update_product(
         try:
             image_path = await upload_service.upload(data.image)
             update_dto.image_path = image_path
+            image_variants.schedule(image_path)
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(e, exc_info=True)
+            logger.error("product image upload failed", exc_info=True)
             raise HTTPException(
                 status_code=500,
                 detail="Не удалось сохранить файл"
@@ -220,7 +266,7 @@ async def update_product_status(
 
 @router.delete("/{product_id}")
 async def delete_product(product_id: UUID):
-    logger.info(f"Delete product: {product_id}")
+    logger.info("delete product", product_id=product_id)
     product_service = get_product_service()
     await product_service.delete_product(product_id)
     return {"message": "Product deleted successfully"}
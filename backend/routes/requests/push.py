@@ -3,6 +3,8 @@ from typing import Optional
 from fastapi import UploadFile
 from pydantic import BaseModel
 
+from domain.dto.user_push import PushAudience
+
 
 class CreatePushRequest(BaseModel):
     title: str
@@ -18,3 +20,7 @@ class UpdatePushRequest(BaseModel):
     image: Optional[UploadFile] = None
     button_text: Optional[str] = None
     button_link: Optional[str] = None
+
+
+class ActivatePushRequest(PushAudience):
+    """Фильтры аудитории; пустой объект, как и запрос без тела, — рассылка всем."""
@@ -1,4 +1,3 @@
-import logging
 from uuid import UUID
 
 from fastapi import APIRouter, Request
@@ -6,13 +5,14 @@ from fastapi import APIRouter, Request
 from dependencies.services.review import get_review_service
 from domain.dto import CreateReviewDTO, UpdateReviewDTO
 from routes.requests.review import CreateReviewRequest, UpdateReviewRequest
+from utils.log import get_logger
 
 router = APIRouter(
     prefix="/reviews",
     tags=["Reviews"],
 )
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 @router.get("")
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from pydantic_core import to_json
 
+from abstractions.services.catalog_cache import CatalogCacheInterface
+from dependencies.services.catalog_cache import get_catalog_cache
 from dependencies.services.order import get_order_service
 from dependencies.services.product import get_product_service
 from dependencies.services.user_context import get_me_cached
+from domain.models.cached_response import CachedResponse
 
 router = APIRouter(prefix="", tags=["Init"])
 
@@ -11,14 +15,15 @@ async def init(
     me = Depends(get_me_cached),
     product_service = Depends(get_product_service),
     order_service   = Depends(get_order_service),
+    catalog_cache: CatalogCacheInterface = Depends(get_catalog_cache),
 ):
     # получаем первую страницу товаров (ваша реализация get_products возвращает Product[])
-    products = await product_service.get_products()
+    async def load_products() -> CachedResponse:
+        return CachedResponse.build(await product_service.get_products())
+
+    products = await catalog_cache.get_or_load(("init_products",), load_products)
     # список заказов текущего пользователя
     orders   = await order_service.get_orders_by_user(me.id)
-    # возвращаем всё в одном запросе
-    return {
-        "me":       me,
-        "products": products,
-        "orders":   orders,
-    }
+    # возвращаем всё в одном запросе; товары вклеиваем уже сериализованными
+    body = b'{"me":' + to_json(me) + b',"products":' + products.body + b',"orders":' + to_json(orders) + b'}'
+    return Response(content=body, media_type="application/json")
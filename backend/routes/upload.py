@@ -1,27 +1,66 @@
-import logging
 import os
 
-from fastapi.responses import FileResponse
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
+from abstractions.services.image_variants import ImageVariantServiceInterface
 from abstractions.services.upload import UploadServiceInterface
+from dependencies.services.image_variants import get_image_variant_service
 from dependencies.services.upload import get_upload_service
+from routes.utils import file_response
+from settings import settings
+from utils.files import is_content_addressed
+from utils.image_paths import source_path
+from utils.log import get_logger
 
 router = APIRouter(
     prefix="/upload",
     tags=["upload"]
 )
+# старый адрес тех же файлов (раньше был StaticFiles)
+static_router = APIRouter(
+    prefix="/static/images",
+    include_in_schema=False,
+)
+
+logger = get_logger(__name__)
+
+# имя выведено из содержимого — файл по этому адресу не изменится никогда
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
-logger = logging.getLogger(__name__)
 
-@router.get("/{filename}")
+@router.api_route("/{filename:path}", methods=["GET", "HEAD"])
+@static_router.api_route("/{filename:path}", methods=["GET", "HEAD"])
 async def get_file(
+        request: Request,
         filename: str,
         upload_service: UploadServiceInterface = Depends(get_upload_service),
-) -> FileResponse:
+        image_variants: ImageVariantServiceInterface = Depends(get_image_variant_service),
+) -> Response:
     file_path = upload_service.get_file_path(filename)
-    return FileResponse(
-        path=file_path,
-        media_type='application/octet-stream',
-        filename=filename
+    if is_content_addressed(filename):
+        cache_control = IMMUTABLE_CACHE_CONTROL
+    else:
+        cache_control = f"public, max-age={settings.upload.cache_max_age}"
+
+    if not os.path.exists(file_path) and (source := source_path(filename)):
+        # вариант ещё не построен (или оригинал не картинка) — отдаём оригинал,
+        # но без долгого кэша: позже по этому адресу появится сам вариант
+        logger.debug("variant not rendered yet, serving source", variant=filename, source=source)
+        filename = source
+        file_path = upload_service.get_file_path(filename)
+        cache_control = "public, no-cache"
+        # задача построения могла потеряться (рестарт, упавший пул) — ставим заново
+        if os.path.isfile(file_path):
+            image_variants.schedule(source)
+
+    if not os.path.isfile(file_path):
+        logger.debug("upload file not found", filename=filename)
+        raise HTTPException(status_code=404, detail="Файл не найден")
+
+    return await file_response(
+        request,
+        file_path,
+        filename,
+        cache_control=cache_control,
+        accel_redirect_prefix=settings.upload.accel_redirect_prefix,
     )
@@ -1,17 +1,27 @@
-import logging
+import json
+from datetime import datetime
+from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Request, HTTPException, Form, Depends
+from fastapi import APIRouter, Request, HTTPException, Form, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 
+from abstractions.services.permissions import PermissionServiceInterface
+from dependencies.services.permissions import get_permission_service
 from dependencies.services.user import get_user_service
 from dependencies.services.user_context import get_me_cached
 from domain.dto import CreateUserDTO, UpdateUserDTO
+from domain.dto.user_history import UserHistoryFilter
 from domain.dto.user_with_balance import UserWithBalanceDTO
 from domain.models import User
+from domain.models.user_history import UserHistory
+from infrastructure.enums.action import Action
 from routes.requests.user import CreateUserRequest, UpdateUserRequest
+from utils.export import ExportFormat
+from utils.log import get_logger
 from .order import router as order_router
 from .product import router as product_router
-from ..utils import get_user_id_from_request
+from ..utils import get_user_id_from_request, export_response
 
 router = APIRouter(
     prefix="/users",
@@ -20,7 +30,7 @@ router = APIRouter(
 router.include_router(product_router)
 router.include_router(order_router)
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 # todo: все ручки кроме get /me - в модераторский роутер и в модераторский сервис
@@ -110,10 +120,60 @@ async def get_balance(request: Request):
     return user.balance
 
 @router.get("/{user_id}/history")
-async def get_user_history(user_id: UUID, request: Request):
+async def get_user_history(
+        user_id: UUID,
+        request: Request,
+        response: Response,
+        limit: Annotated[int, Query(ge=1, le=500)] = 100,
+        cursor: Optional[str] = None,
+        action: Annotated[Optional[list[Action]], Query()] = None,
+        product_id: Optional[UUID] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        with_snapshots: bool = True,
+) -> list[UserHistory]:
     user_service = get_user_service()
-    user_history = await user_service.get_user_history(user_id=user_id)
-    return user_history
+    filters = UserHistoryFilter(actions=action, product_id=product_id, date_from=date_from, date_to=date_to)
+    try:
+        page = await user_service.get_user_history(
+            user_id=user_id,
+            limit=limit,
+            cursor=cursor,
+            filters=filters,
+            with_snapshots=with_snapshots,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # тело остаётся списком, курсор следующей страницы — в заголовке
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
+
+@router.get("/{user_id}/history/export")
+async def export_user_history(
+        user_id: UUID,
+        request: Request,
+        format: ExportFormat = ExportFormat.CSV,
+        permission_service: PermissionServiceInterface = Depends(get_permission_service),
+) -> StreamingResponse:
+    # в снимках заказов реквизиты (карта, телефон) — только самому пользователю и модерации
+    await permission_service.is_self_or_moderator(get_user_id_from_request(request), user_id)
+
+    user_service = get_user_service()
+    history = user_service.stream_user_history(user_id)
+
+    async def rows():
+        async for item in history:
+            # is_diff: json_before/json_after — не снимки, а патчи изменённых полей (utils.json_diff)
+            yield (
+                item.id, item.date, item.action, item.creator_id, item.product_id, item.is_diff,
+                json.dumps(item.json_before, ensure_ascii=False) if item.json_before is not None else None,
+                json.dumps(item.json_after, ensure_ascii=False) if item.json_after is not None else None,
+            )
+
+    header = ("id", "date", "action", "creator_id", "product_id", "is_diff", "json_before", "json_after")
+    return export_response(format, f"history_{user_id}", header, rows())
 
 @router.get("/{user_id}/balance_history")
 async def get_user_history_balance(user_id: UUID, request: Request):
@@ -1,11 +1,19 @@
+from datetime import datetime
+from typing import Annotated, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Request, Query, Depends
+from fastapi.responses import StreamingResponse
 
+from abstractions.services.permissions import PermissionServiceInterface
 from dependencies.services.order import get_order_service
-from domain.models import Order
+from dependencies.services.permissions import get_permission_service
+from domain.models.order import OrderListItem
 from domain.responses.order_report import OrderReport
-from routes.utils import get_user_id_from_request
+from domain.responses.seller_report import SellerReport
+from infrastructure.enums.order_status import OrderStatus
+from routes.utils import get_user_id_from_request, export_response
+from utils.export import ExportFormat
 
 router = APIRouter(
     prefix="/orders",
@@ -13,19 +21,97 @@ router = APIRouter(
 
 
 @router.get("")
-async def get_orders_by_user(request: Request) -> list[Order]:
+async def get_orders_by_user(request: Request) -> list[OrderListItem]:
     user_id = get_user_id_from_request(request)
     order_service = get_order_service()
     return await order_service.get_orders_by_user(user_id)
 
 
 @router.get("/reports/{seller_id}")
-async def get_orders_by_seller(request: Request, seller_id: UUID) -> list[Order]:
+async def get_orders_by_seller(request: Request, seller_id: UUID) -> list[OrderListItem]:
     order_service = get_order_service()
     return await order_service.get_orders_by_seller(seller_id)
 
+@router.get("/reports/{seller_id}/summary")
+async def get_seller_report(
+        request: Request,
+        seller_id: UUID,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+) -> SellerReport:
+    order_service = get_order_service()
+    return await order_service.get_seller_report(seller_id, date_from=date_from, date_to=date_to)
+
+
+@router.get("/reports/{seller_id}/orders")
+async def get_seller_report_orders(
+        request: Request,
+        seller_id: UUID,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        status: Optional[OrderStatus] = None,
+        step: Optional[int] = None,
+        product_id: Optional[UUID] = None,
+        limit: Annotated[int, Query(ge=1, le=200)] = 50,
+        offset: Annotated[int, Query(ge=0)] = 0,
+) -> list[OrderListItem]:
+    order_service = get_order_service()
+    return await order_service.get_seller_report_orders(
+        seller_id,
+        date_from=date_from,
+        date_to=date_to,
+        status=status,
+        step=step,
+        product_id=product_id,
+        limit=limit,
+        offset=offset,
+    )
+
+_ORDER_EXPORT_HEADER = (
+    "id", "created_at", "status", "step", "transaction_code",
+    "article", "product", "price", "wb_price", "cashback",
+    "buyer", "name", "phone_number", "bank", "card_number", "receipt_number", "paid_at",
+)
+
+
+def _order_export_row(order: OrderListItem) -> tuple:
+    product = order.product
+    return (
+        order.id, order.created_at, order.status, order.step, order.transaction_code,
+        product.article if product else None,
+        product.name if product else None,
+        product.price if product else None,
+        product.wb_price if product else None,
+        product.wb_price - product.price if product else None,
+        order.user.nickname, order.name, order.phone_number, order.bank, order.card_number,
+        order.receipt_number, order.paid_at,
+    )
+
+
+@router.get("/reports/{seller_id}/export")
+async def export_seller_orders(
+        request: Request,
+        seller_id: UUID,
+        format: ExportFormat = ExportFormat.CSV,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        status: Optional[OrderStatus] = None,
+        permission_service: PermissionServiceInterface = Depends(get_permission_service),
+) -> StreamingResponse:
+    # в выгрузке реквизиты покупателей (карта, телефон) — только самому продавцу и модерации
+    await permission_service.is_seller_or_moderator(get_user_id_from_request(request), seller_id)
+
+    order_service = get_order_service()
+    orders = order_service.stream_seller_orders(seller_id, date_from=date_from, date_to=date_to, status=status)
+
+    async def rows():
+        async for order in orders:
+            yield _order_export_row(order)
+
+    return export_response(format, f"orders_{seller_id}", _ORDER_EXPORT_HEADER, rows())
+
 @router.get("/all/reports/{seller_id}")
-async def get_all_orders_by_seller(request: Request, seller_id: UUID) -> list[Order]:
+async def get_all_orders_by_seller(request: Request, seller_id: UUID) -> list[OrderListItem]:
     order_service = get_order_service()
     return await order_service.get_all_orders_by_seller(seller_id)
 
@@ -1,8 +1,111 @@
-from typing import Optional
+import asyncio
+import os
+from typing import Optional, Any, AsyncIterable, Sequence
+from urllib.parse import quote
 from uuid import UUID
 
-from fastapi import Request
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse, FileResponse
+
+from domain.models.cached_response import CachedResponse
+from domain.models.principal import Principal
+from utils.export import ExportFormat, MEDIA_TYPES, export_rows
+from utils.files import get_file_info, DEFAULT_MEDIA_TYPE
+
+
+def get_principal_from_request(request: Request) -> Optional[Principal]:
+    """Пользователь запроса, которого положил check_for_auth; None — для открытых ручек."""
+    return getattr(request.state, 'principal', None)
 
 
 def get_user_id_from_request(request: Request) -> Optional[UUID]:
-    return request.scope.get('x_user_id', None)
+    principal = get_principal_from_request(request)
+    return principal.id if principal is not None else None
+
+
+def cached_json_response(request: Request, cached: CachedResponse) -> Response:
+    headers = {
+        "ETag": cached.etag,
+        # ответ зависит от авторизации, поэтому только приватный кэш с обязательной перепроверкой
+        "Cache-Control": "private, no-cache",
+        **cached.headers,
+    }
+
+    if _etag_matches(request, cached.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def content_disposition(disposition: str, filename: str) -> str:
+    """
+    Content-Disposition по RFC 6266/5987: filename* с UTF-8 для кириллицы
+    и ASCII-filename для клиентов, которые filename* не понимают.
+    """
+    fallback = filename.encode("ascii", "replace").decode("ascii").replace("?", "_")
+    fallback = fallback.replace("\\", "_").replace('"', "_")
+    return f"{disposition}; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+async def file_response(
+        request: Request,
+        path: str,
+        relative_path: str,
+        cache_control: str,
+        accel_redirect_prefix: str = "",
+) -> Response:
+    """
+    Отдача файла из каталога загрузок: content-type по сигнатуре, сильный ETag и 304,
+    Range — силами FileResponse. С accel_redirect_prefix байты отдаёт nginx (sendfile),
+    а приложение возвращает только заголовки.
+    """
+    info = await asyncio.to_thread(get_file_info, path, relative_path)
+    headers = {
+        "ETag": info.etag,
+        "Cache-Control": cache_control,
+        # тип определили сами — браузер не должен угадывать (html под видом картинки)
+        "X-Content-Type-Options": "nosniff",
+    }
+    if _etag_matches(request, info.etag):
+        return Response(status_code=304, headers=headers)
+
+    filename = os.path.basename(relative_path)
+    # картинки и pdf показываем, остальное только скачиваем
+    disposition = "attachment" if info.media_type == DEFAULT_MEDIA_TYPE else "inline"
+
+    # FileResponse для не-ASCII имён ставит только filename*, поэтому заголовок собираем сами
+    headers["Content-Disposition"] = content_disposition(disposition, filename)
+
+    if accel_redirect_prefix:
+        # ETag и X-Content-Type-Options nginx при X-Accel-Redirect из ответа не переносит —
+        # их выставляет location /_upload/ (см. nginx.conf)
+        headers["X-Accel-Redirect"] = accel_redirect_prefix.rstrip("/") + "/" + quote(relative_path)
+        return Response(media_type=info.media_type, headers=headers)
+
+    return FileResponse(path=path, media_type=info.media_type, headers=headers)
+
+
+def export_response(
+        fmt: ExportFormat,
+        filename: str,
+        header: Sequence[str],
+        rows: AsyncIterable[Sequence[Any]],
+) -> StreamingResponse:
+    return StreamingResponse(
+        export_rows(fmt, header, rows),
+        media_type=MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": content_disposition("attachment", f"{filename}.{fmt}"),
+            "Cache-Control": "no-store",
+            # отдаём по мере выборки — nginx не должен копить ответ целиком
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -1,10 +1,10 @@
 import hashlib
 import hmac
 import json
-import logging
 import re
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cache
 from typing import Optional
 from urllib.parse import parse_qs
 from uuid import UUID
@@ -13,13 +13,25 @@ from abstractions.services import UserServiceInterface
 from abstractions.services.auth.service import AuthServiceInterface
 from abstractions.services.auth.tokens import TokenServiceInterface
 from domain.dto import CreateUserDTO
+from domain.models.principal import Principal
 from domain.responses.auth import AuthTokens
 from infrastructure.repositories.exceptions import NotFoundException
 from services.auth.exceptions import ExpiredDataException, InvalidTokenException
 from services.exceptions import BannedUserException
 from utils.referral import b64url_to_uuid
+from utils.log import get_logger, Payload
+from utils.ttl_cache import TTLCache
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
+
+# initData старше суток не принимаем
+INIT_DATA_MAX_AGE = 86400
+
+
+@cache
+def webapp_secret_key(bot_token: str) -> bytes:
+    """HMAC-SHA256 токена бота с ключом 'WebAppData' — ключ проверки initData, один на процесс."""
+    return hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
 
 
 @dataclass
@@ -29,29 +41,52 @@ class AuthService(AuthServiceInterface):
 
     user_service: UserServiceInterface
     token_service: TokenServiceInterface
+    # init_data -> (auth_date, токены): повторный вход с теми же данными не проверяем заново
+    login_cache: Optional[TTLCache[tuple[int, AuthTokens]]] = None
+    # (telegram_id, nickname) -> id пользователя: строка есть и не менялась, ensure_user не нужен
+    known_user_cache: Optional[TTLCache[UUID]] = None
+
+    _secret_key: bytes = field(default=b"", init=False)
     _B64URL_RE = re.compile(r'^[A-Za-z0-9_-]{20,24}$')  # обычный UUID→b64url даёт 22
 
+    def __post_init__(self):
+        if self.bot_token:
+            self._secret_key = webapp_secret_key(self.bot_token)
+
     async def get_user_id_from_jwt(self, token: str) -> UUID:
+        principal = await self.get_principal_from_jwt(token)
+        return principal.id
+
+    async def get_principal_from_jwt(self, token: str) -> Principal:
         try:
             if token == 'abc':
-                return UUID('9cfed29e-9b5e-444f-8746-e1355ddd95b1')
+                return await self.user_service.get_principal(UUID('9cfed29e-9b5e-444f-8746-e1355ddd95b1'))
 
             payload = self.token_service.get_token_payload(token=token)
             user_id: str | None = payload.get('sub', None)
             if not user_id:
                 raise InvalidTokenException()
 
-            user = await self.user_service.get_user(UUID(user_id))  # todo: pk type
+            # роль и бан из кэша процесса — в БД только при промахе
+            principal = await self.user_service.get_principal(UUID(user_id))  # todo: pk type
 
-            if user.is_banned:
+            if principal.is_banned:
                 raise BannedUserException
 
-            return user.id
+            return principal
         except (InvalidTokenException, NotFoundException):
             raise
 
     async def create_token(self, init_data: str, ref_user_id: Optional[str] = None) -> AuthTokens:
         """Verifies Telegram Mini App auth data properly."""
+        # Mini App при каждом открытии логинится заново — те же init_data уже проверены
+        if self.login_cache is not None:
+            cached = self.login_cache.get(init_data)
+            if cached is not None:
+                auth_date, tokens = cached
+                if time.time() - auth_date <= INIT_DATA_MAX_AGE:
+                    return tokens
+
         # Parse initData properly (decode URL params)
         data_dict = {k: v[0] for k, v in parse_qs(init_data).items()}
 
@@ -62,26 +97,23 @@ class AuthService(AuthServiceInterface):
 
         # Check expiration
         auth_date = int(data_dict.get("auth_date", "0"))
-        if time.time() - auth_date > 86400:  # Expire after 1 day
+        if time.time() - auth_date > INIT_DATA_MAX_AGE:
             raise ExpiredDataException()
 
         # Step 1: Sort the key-value pairs in alphabetical order
         sorted_data_string = "\n".join(f"{k}={v}" for k, v in sorted(data_dict.items()))
 
-        # Step 2: Create HMAC-SHA256 signature of the bot token using 'WebAppData' as key
-        # secret_key = hmac.new(b"WebAppData", self.bot_token.encode(), hashlib.sha256).digest()
-        if not self.bot_token:
+        # Step 2: секрет (HMAC токена бота с ключом 'WebAppData') посчитан один раз в __post_init__
+        if not self._secret_key:
             raise RuntimeError("settings.bot.<env>.token is empty — заполни в settings.json")
 
-        secret_key = hmac.new(b"WebAppData", self.bot_token.encode(), hashlib.sha256).digest()
-
         # Step 3: Create final HMAC-SHA256 signature using the previous step result as the key
-        computed_hash = hmac.new(secret_key, sorted_data_string.encode(), hashlib.sha256).hexdigest()
+        computed_hash = hmac.new(self._secret_key, sorted_data_string.encode(), hashlib.sha256).hexdigest()
 
-        logger.info(f"Computed Hash: {computed_hash}, Received Hash: {received_hash}, InitData: {init_data}")
+        logger.debug("init data hash", computed=computed_hash, received=received_hash, init_data=Payload(init_data))
 
         # Step 4: Validate hash
-        if computed_hash != received_hash:
+        if not hmac.compare_digest(computed_hash, received_hash):
             raise InvalidTokenException("Invalid init data hash")
 
         # Extract Telegram User ID
@@ -89,6 +121,27 @@ class AuthService(AuthServiceInterface):
         telegram_user_id = int(user_data.get("id", 0))
         username = user_data.get("username", None)
 
+        user_id = await self._ensure_user_id(telegram_user_id, username, ref_user_id)
+
+        # Generate access & refresh tokens
+        tokens = self.token_service.create_auth_token(user_id=str(user_id))
+        if self.login_cache is not None:
+            self.login_cache.set(init_data, (auth_date, tokens))
+        return tokens
+
+    async def _ensure_user_id(
+            self,
+            telegram_user_id: int,
+            username: Optional[str],
+            ref_user_id: Optional[str],
+    ) -> UUID:
+        # пользователь уже входил с тем же ником — строка в БД есть, трогать её незачем
+        known_key = (telegram_user_id, username)
+        if self.known_user_cache is not None:
+            user_id = self.known_user_cache.get(known_key)
+            if user_id is not None:
+                return user_id
+
         inviter_uuid: Optional[UUID] = None
         if ref_user_id:
             try:
@@ -100,8 +153,9 @@ class AuthService(AuthServiceInterface):
         user_dto = CreateUserDTO(telegram_id=telegram_user_id, nickname=username, invited_by=inviter_uuid)
         user = await self.user_service.ensure_user(user_dto)
 
-        # Generate access & refresh tokens
-        return self.token_service.create_auth_token(user_id=str(user.id))
+        if self.known_user_cache is not None:
+            self.known_user_cache.set(known_key, user.id)
+        return user.id
 
     async def refresh_token(self, refresh_token: str) -> AuthTokens:
         try:
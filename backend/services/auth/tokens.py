@@ -1,4 +1,3 @@
-import logging
 from dataclasses import dataclass
 from datetime import datetime, timedelta, UTC
 
@@ -12,8 +11,9 @@ from abstractions.services.auth.tokens import TokenServiceInterface
 from domain.responses.auth import AuthTokens
 from services.auth.exceptions import InvalidTokenException, ExpiredTokenException
 from settings import JwtSettings
+from utils.log import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 @dataclass
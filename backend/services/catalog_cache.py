@@ -0,0 +1,78 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable
+
+from abstractions.services.catalog_cache import CatalogCacheInterface
+from domain.models.cached_response import CachedResponse
+from utils.ttl_cache import TTLCache
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class _LoadAbandoned(Exception):
+    """Ведущий запрос отменён до результата (например, клиент отключился)."""
+
+
+@dataclass
+class CatalogCache(CatalogCacheInterface):
+    ttl: float
+    maxsize: int
+
+    _version: int = field(default=0, init=False)
+    _entries: TTLCache[CachedResponse] = field(init=False)
+    _inflight: dict[Hashable, asyncio.Future] = field(default_factory=dict, init=False)
+
+    def __post_init__(self):
+        self._entries = TTLCache(maxsize=self.maxsize, ttl=self.ttl)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> None:
+        self._version += 1
+        self._entries.clear()
+
+    async def get_or_load(
+            self,
+            key: Hashable,
+            loader: Callable[[], Awaitable[CachedResponse]],
+    ) -> CachedResponse:
+        # ключ привязан к версии: всё, что загружено до bump(), больше не найдётся
+        versioned = (self._version, key)
+
+        while True:
+            cached = self._entries.get(versioned)
+            if cached is not None:
+                return cached
+
+            # одновременные промахи по одному ключу ждут один запрос в БД
+            pending = self._inflight.get(versioned)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except _LoadAbandoned:
+                # ведущего отменили — один из ждущих загрузит заново
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[versioned] = future
+        try:
+            response = await loader()
+        except Exception as e:
+            future.set_exception(e)
+            # исключение уже отдаём вызывающему; ждущих может и не быть
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            self._entries.set(versioned, response)
+            return response
+        finally:
+            if not future.done():
+                # отмену ведущего ждущим не передаём, иначе они получат CancelledError
+                future.set_exception(_LoadAbandoned())
+                future.exception()
+            self._inflight.pop(versioned, None)
@@ -1,4 +1,3 @@
-import logging
 import uuid
 from dataclasses import dataclass
 from typing import Optional
@@ -7,8 +6,9 @@ from abstractions.repositories.deeplink import DeeplinkRepositoryInterface
 from abstractions.services.deeplink import DeeplinkServiceInterface
 from domain.dto import CreateDeeplinkDTO
 from domain.models import Deeplink
+from utils.log import get_logger, Payload
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 @dataclass
 class DeeplinkService(DeeplinkServiceInterface):
@@ -29,8 +29,8 @@ class DeeplinkService(DeeplinkServiceInterface):
         try:
             deeplink_uuid = uuid.UUID(key)
             res = await self.deeplink_repository.get(deeplink_uuid)
-            logger.info(f"Deeplink {deeplink_uuid} resolved to {res}")
+            logger.debug("deeplink resolved", deeplink_id=deeplink_uuid, deeplink=Payload(res))
             return res
         except ValueError:
-            logger.warning(f"Could not resolve Deeplink {key}", exc_info=True)
+            logger.warning("could not resolve deeplink", key=key, exc_info=True)
             return None
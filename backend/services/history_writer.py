@@ -0,0 +1,116 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from abstractions.repositories.user_history import UserHistoryRepositoryInterface
+from abstractions.services.history_writer import HistoryWriterInterface
+from domain.dto.user_history import CreateUserHistoryDTO
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class HistoryWriter(HistoryWriterInterface):
+    """
+    Буфер записей user_history: запрос только кладёт DTO в память,
+    а фоновая задача пишет их пачками (один INSERT ... VALUES на пачку)
+    по достижении batch_size или раз в flush_interval секунд.
+
+    Пока фоновая задача не запущена (скрипты, тесты) или включён sync,
+    записи уходят в БД сразу.
+    """
+    user_history_repository: UserHistoryRepositoryInterface
+    batch_size: int = 200
+    flush_interval: float = 1.0
+    max_buffer: int = 10000
+    sync: bool = False
+    shutdown_retries: int = 3
+
+    _buffer: list[CreateUserHistoryDTO] = field(default_factory=list, init=False)
+    _wakeup: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+    _flush_lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+    _task: Optional[asyncio.Task] = field(default=None, init=False)
+
+    async def write(self, dto: CreateUserHistoryDTO) -> None:
+        await self.write_many([dto])
+
+    async def write_many(self, dtos: Iterable[CreateUserHistoryDTO]) -> None:
+        dtos = list(dtos)
+        if not dtos:
+            return
+
+        if self.sync or self._task is None:
+            await self.user_history_repository.create_many(dtos)
+            return
+
+        self._buffer.extend(dtos)
+        if len(self._buffer) >= self.max_buffer:
+            # БД не успевает — притормаживаем запрос, пока буфер не запишется
+            try:
+                await self.flush()
+            except Exception:
+                # сам запрос уже закоммичен — не роняем его, но и память не раздуваем
+                # трейсбек уже залогировал flush
+                logger.warning("history backpressure flush failed", buffered=len(self._buffer))
+                self._drop_overflow()
+        elif len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:len(batch)]
+                try:
+                    await self.user_history_repository.create_many(batch)
+                except Exception:
+                    # возвращаем пачку в начало очереди — повторим при следующем сбросе
+                    self._buffer[:0] = batch
+                    logger.error("history flush failed", records=len(batch), exc_info=True)
+                    raise
+
+    def _drop_overflow(self) -> None:
+        """Жёсткий предел буфера: пока БД лежит, теряем самые старые записи, а не всю память процесса."""
+        overflow = len(self._buffer) - self.max_buffer
+        if overflow > 0:
+            del self._buffer[:overflow]
+            logger.error("history buffer is full, oldest records dropped", dropped=overflow, max_buffer=self.max_buffer)
+
+    def start(self) -> None:
+        if self.sync or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        for attempt in range(1, self.shutdown_retries + 1):
+            try:
+                await self.flush()
+                return
+            except Exception:
+                logger.warning("history flush on shutdown failed", attempt=attempt, retries=self.shutdown_retries)
+                await asyncio.sleep(attempt)
+
+        logger.error("history records were not written on shutdown", records=len(self._buffer))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception:
+                # пачка осталась в буфере, следующая итерация попробует снова
+                pass
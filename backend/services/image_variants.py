@@ -0,0 +1,98 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Optional
+
+from abstractions.services.image_variants import ImageVariantServiceInterface
+from utils.image_paths import variant_paths
+from utils.image_variants import render_variants
+from utils.log import get_logger
+from utils.ttl_cache import TTLCache
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ImageVariantService(ImageVariantServiceInterface):
+    """
+    Уменьшенные WebP-копии картинок товаров (utils.image_variants.VARIANTS).
+    Сжатие — CPU, поэтому идёт в пуле процессов, а не в event loop.
+
+    Пока пул не запущен (скрипты, тесты), schedule ничего не делает:
+    /upload отдаёт вместо отсутствующего варианта оригинал.
+    Задачи живут только в памяти, поэтому /upload при промахе по варианту
+    ставит его заново (после рестарта или падения пула).
+    """
+    images_dir: str = "/app/upload"
+    workers: int = 2
+    quality: int = 80
+    # после неудачи путь не пробуем заново столько секунд
+    retry_after: float = 600
+
+    _pool: Optional[ProcessPoolExecutor] = field(default=None, init=False)
+    _tasks: set[asyncio.Task] = field(default_factory=set, init=False)
+    _pending: set[str] = field(default_factory=set, init=False)
+    _failed: TTLCache[bool] = field(init=False)
+
+    def __post_init__(self):
+        self._failed = TTLCache(maxsize=10_000, ttl=self.retry_after)
+
+    def schedule(self, path: Optional[str]) -> None:
+        if self._pool is None or variant_paths(path) is None:
+            return
+        # одна картинка на странице запрашивается многими клиентами сразу — строим один раз
+        if path in self._pending or self._failed.get(path):
+            return
+
+        self._pending.add(path)
+        task = asyncio.create_task(self._render_logged(path))
+        # держим ссылку, иначе задачу может собрать GC до завершения
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        task.add_done_callback(lambda _: self._pending.discard(path))
+
+    async def render(self, path: str) -> list[str]:
+        loop = asyncio.get_running_loop()
+        source = os.path.join(self.images_dir, path)
+        return await loop.run_in_executor(self._pool, render_variants, source, self.quality)
+
+    async def _render_logged(self, path: str) -> None:
+        try:
+            created = await self.render(path)
+        except BrokenProcessPool:
+            # воркер упал (например, OOM на огромной картинке) — такой пул больше не принимает задачи
+            logger.error("image variant pool is broken, restarting", path=path)
+            self._failed.set(path, True)
+            self._restart_pool()
+            return
+        except Exception:
+            # не картинка или битый файл — остаётся только оригинал
+            logger.warning("image variants were not rendered", path=path, exc_info=True)
+            self._failed.set(path, True)
+            return
+        logger.debug("image variants rendered", path=path, created=created)
+
+    def start(self) -> None:
+        if self._pool is not None:
+            return
+        self._restart_pool()
+
+    def _restart_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+        # spawn, а не fork: форк процесса с запущенным event loop и пулом соединений небезопасен
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    async def close(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown)
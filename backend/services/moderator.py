@@ -1,5 +1,4 @@
-import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import List
 from uuid import UUID
@@ -7,22 +6,33 @@ from uuid import UUID
 from abstractions.repositories import ProductRepositoryInterface
 from abstractions.repositories.increasing_balance import IncreasingBalanceRepositoryInterface
 from abstractions.repositories.moderator_review import ModeratorReviewRepositoryInterface
+from abstractions.repositories.unit_of_work import UnitOfWorkInterface
 from abstractions.services import UserServiceInterface
+from abstractions.services.catalog_cache import CatalogCacheInterface
+from abstractions.services.history_writer import HistoryWriterInterface
 from abstractions.services.moderator import ModeratorServiceInterface
 from abstractions.services.notification import NotificationServiceInterface
-from dependencies.repositories.user_history import get_user_history_repository
+from dependencies.repositories.unit_of_work import get_unit_of_work
+from dependencies.services.catalog_cache import get_catalog_cache
+from dependencies.services.history_writer import get_history_writer
 from domain.dto import UpdateProductDTO, CreatePushDTO, UpdatePushDTO
 from domain.dto.increasing_balance import CreateIncreasingBalanceDTO
 from domain.dto.moderator_review import CreateModeratorReviewDTO
+from domain.dto.user_push import PushAudience
 from domain.dto.user_history import CreateUserHistoryDTO
 from domain.models import Product, User, Push
 from domain.models.moderator_review import ModeratorReview
+from domain.models.product import ProductListItem
+from domain.models.push_stats import PushStats
 from infrastructure.enums.action import Action
 from infrastructure.enums.product_status import ProductStatus
 from routes.requests.moderator import UpdateProductStatusRequest
 from utils.time import now_msk_naive
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
 
-logger = logging.getLogger(__name__)
 @dataclass
 class ModeratorService(ModeratorServiceInterface):
     products_repository: ProductRepositoryInterface
@@ -30,14 +40,17 @@ class ModeratorService(ModeratorServiceInterface):
     moderator_review_repository: ModeratorReviewRepositoryInterface
     notification_service: NotificationServiceInterface
     increasing_balance_repository: IncreasingBalanceRepositoryInterface
+    catalog_cache: CatalogCacheInterface = field(default_factory=get_catalog_cache)
+    unit_of_work: UnitOfWorkInterface = field(default_factory=get_unit_of_work)
+    history_writer: HistoryWriterInterface = field(default_factory=get_history_writer)
 
-    async def get_products(self) -> list[Product]:
-        return await self.products_repository.get_all()
+    async def get_products(self) -> list[ProductListItem]:
+        return await self.products_repository.get_list()
 
     async def get_product(self, product_id: UUID) -> Product:
         return await self.products_repository.get(product_id)
 
-    async def get_products_to_review(self) -> list[Product]:
+    async def get_products_to_review(self) -> list[ProductListItem]:
         return await self.products_repository.get_products_to_review()
 
 
@@ -47,6 +60,23 @@ class ModeratorService(ModeratorServiceInterface):
             moderator_id: UUID,
             request: UpdateProductStatusRequest,
     ):
+        # статус, ревью, история и движение баланса — одной транзакцией
+        async with self.unit_of_work.begin():
+            original_status, final_status, history = await self._apply_review(product_id, moderator_id, request)
+
+        self.catalog_cache.bump()
+        await self.history_writer.write_many(history)
+
+        # 5) Если товар только что стал активным — шлём нотификацию (уже после коммита)
+        if final_status == ProductStatus.ACTIVE and original_status != ProductStatus.ACTIVE:
+            await self.notification_service.send_new_product(product_id)
+
+    async def _apply_review(
+            self,
+            product_id: UUID,
+            moderator_id: UUID,
+            request: UpdateProductStatusRequest,
+    ) -> tuple[ProductStatus, ProductStatus, list[CreateUserHistoryDTO]]:
         # 1) Получаем текущее состояние товара
         product = await self.products_repository.get(product_id)
         original_status = product.status
@@ -55,25 +85,25 @@ class ModeratorService(ModeratorServiceInterface):
 
         # 2) Вычисляем итоговый статус
         if request.status == ProductStatus.ACTIVE:
-            # 2.1) Берём продавца и все его товары
+            # 2.1) Берём продавца и агрегат по его товарам
             seller = await self.user_service.get_user(product.seller_id)
-            seller_products = await self.products_repository.get_by_seller(product.seller_id)
+            ledger = await self.user_service.get_seller_balance(product.seller_id)
 
-            # 2.2) Суммируем уже зарезервированные (активные) раздачи
-            existing_reserved = sum(
-                p.general_repurchases
-                for p in seller_products
-                if p.status == ProductStatus.ACTIVE
-            )
+            # 2.2) Уже зарезервированные (активные) раздачи
+            existing_reserved = ledger.active_plan
 
             # 2.3) Если товар ещё не был активен, добавляем его запрос
             to_reserve = existing_reserved
             if original_status != ProductStatus.ACTIVE:
                 to_reserve += product.general_repurchases
 
-            logger.info(f"Existing reserved: {existing_reserved}, "
-                        f"New request: {product.general_repurchases if original_status != ProductStatus.ACTIVE else 0}, "
-                        f"Total required: {to_reserve}, Seller balance: {seller.balance}")
+            logger.debug(
+                "review reserve check",
+                product_id=product_id,
+                existing_reserved=existing_reserved,
+                total_required=to_reserve,
+                seller_balance=seller.balance,
+            )
 
             # 2.4) Решаем, хватит ли баланса
             if to_reserve > seller.balance:
@@ -109,11 +139,12 @@ class ModeratorService(ModeratorServiceInterface):
             status_after=final_status,
         )
 
-        user_history_repository = get_user_history_repository()
+        # история уходит в буфер уже после коммита
+        history: list[CreateUserHistoryDTO] = []
 
         # +++ 5a. STATUS_CHANGED — если статус реально изменился
         if original_status != updated.status:
-            await user_history_repository.create(CreateUserHistoryDTO(
+            history.append(CreateUserHistoryDTO(
                 user_id=product.seller_id,
                 creator_id=moderator_id,
                 product_id=product_id,
@@ -125,7 +156,7 @@ class ModeratorService(ModeratorServiceInterface):
 
         # +++ 5b. MODERATION_DONE — модератор одобрил (по его запросу), даже если из-за баланса статус стал NOT_PAID
         if approved_by_moderator:
-            await user_history_repository.create(CreateUserHistoryDTO(
+            history.append(CreateUserHistoryDTO(
                 user_id=product.seller_id,
                 creator_id=moderator_id,
                 product_id=product_id,
@@ -137,7 +168,7 @@ class ModeratorService(ModeratorServiceInterface):
 
         # +++ 5c. MODERATION_FAILED — модератор не одобрил (запросил любой не-ACTIVE статус)
         if rejected_by_moderator:
-            await user_history_repository.create(CreateUserHistoryDTO(
+            history.append(CreateUserHistoryDTO(
                 user_id=product.seller_id,
                 creator_id=moderator_id,
                 product_id=product_id,
@@ -149,22 +180,16 @@ class ModeratorService(ModeratorServiceInterface):
 
         await self.moderator_review_repository.create(review_dto)
 
-        # 5) Если товар только что стал активным — шлём нотификацию
-        if final_status == ProductStatus.ACTIVE and original_status != ProductStatus.ACTIVE:
-            await self.notification_service.send_new_product(product_id)
-
-        if review_dto.status_after == ProductStatus.ACTIVE and review_dto.status_before != ProductStatus.ACTIVE:
-            await self.notification_service.send_new_product(product_id)
-
         if final_status == ProductStatus.ACTIVE:
-            logger.info(f"Второй: {product.general_repurchases}")
             create_increasing_balance_dto = CreateIncreasingBalanceDTO(
                 user_id=product.seller_id,
                 sum=-product.remaining_products,
             )
 
-            res = await self.increasing_balance_repository.create(create_increasing_balance_dto)
-            logger.info(f"результат: {res}")
+            await self.increasing_balance_repository.create(create_increasing_balance_dto)
+            logger.debug("reserve written off", product_id=product_id, sum=create_increasing_balance_dto.sum)
+
+        return original_status, final_status, history
 
     async def get_moderator_reviews_by_user(self, user_id: UUID) -> List[ModeratorReview]:
         return await self.moderator_review_repository.get_by_user(user_id)
@@ -202,12 +227,18 @@ class ModeratorService(ModeratorServiceInterface):
     async def create_push(self, push: CreatePushDTO) -> None:
         await self.notification_service.create_push(push)
 
-    async def activate_push(self, push_id: UUID, user_ids: list[UUID]) -> None:
-        await self.notification_service.activate_push(push_id, user_ids)
+    async def activate_push(self, push_id: UUID, audience: PushAudience) -> int:
+        return await self.notification_service.activate_push(push_id, audience)
 
     async def get_pushes(self) -> list[Push]:
         return await self.notification_service.get_pushes()
 
+    async def get_push_stats(self, push_id: UUID) -> PushStats:
+        return await self.notification_service.get_push_stats(push_id)
+
+    async def get_pushes_stats(self) -> list[PushStats]:
+        return await self.notification_service.get_pushes_stats()
+
     async def get_push(self, push_id: UUID) -> Push:
         return await self.notification_service.get_push(push_id)
 
@@ -1,5 +1,6 @@
-import logging
+import asyncio
 from dataclasses import dataclass
+from typing import Optional
 from uuid import UUID
 
 from aiogram import Bot
@@ -14,16 +15,21 @@ from abstractions.repositories import (
     UserRepositoryInterface,
 )
 from abstractions.repositories.push import PushRepositoryInterface
+from abstractions.repositories.push_stats import PushStatsRepositoryInterface
 from abstractions.repositories.user_push import UserPushRepositoryInterface
 from abstractions.services.deeplink import DeeplinkServiceInterface
 from abstractions.services.notification import NotificationServiceInterface
 from abstractions.services.upload import UploadServiceInterface
-from domain.dto import CreatePushDTO, UpdatePushDTO, CreateUserPushDTO
+from domain.dto import CreatePushDTO, UpdatePushDTO
+from domain.dto.user_push import PushAudience
 from domain.models import Push
+from domain.models.push_stats import PushStats
+from domain.models.order_reminder import OrderReminder
 from infrastructure.enums.product_status import ProductStatus
 from settings import settings
+from utils.log import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -34,8 +40,10 @@ class NotificationService(NotificationServiceInterface):
     products_repository: ProductRepositoryInterface
     push_repository: PushRepositoryInterface
     user_push_repository: UserPushRepositoryInterface
+    push_stats_repository: PushStatsRepositoryInterface
     upload_service: UploadServiceInterface
     deeplink_service: DeeplinkServiceInterface
+    reminder_concurrency: int = 20
 
     _bot: Bot = None
 
@@ -132,7 +140,7 @@ class NotificationService(NotificationServiceInterface):
             await self.bot.send_photo(**kwargs)
         except TelegramBadRequest as e:
             # Фоллбек: если канал/топик не найден или нет прав — не валим модерацию
-            logger.warning(f"send_photo failed: {e}. Falling back to send_message without photo")
+            logger.warning("send_photo failed, falling back to send_message without photo", error=str(e))
             try:
                 kwargs = dict(
                     chat_id=channel_id,
@@ -144,16 +152,18 @@ class NotificationService(NotificationServiceInterface):
                     kwargs["message_thread_id"] = thread_id
                 await self.bot.send_message(**kwargs)
             except Exception as e2:
-                logger.error(f"send_message fallback failed: {e2}")
-        except Exception as e:
-            logger.error(f"Unexpected error while sending new product notification: {e}")
+                logger.error("send_message fallback failed", error=str(e2))
+        except Exception:
+            logger.error("new product notification failed", exc_info=True)
 
     async def create_push(self, push: CreatePushDTO) -> None:
         await self.push_repository.create(push)
 
-    async def activate_push(self, push_id: UUID, user_ids: list[UUID]) -> None:
-        dtos = [CreateUserPushDTO(push_id=push_id, user_id=user_id) for user_id in user_ids]
-        await self.user_push_repository.create_many(dtos)
+    async def activate_push(self, push_id: UUID, audience: PushAudience) -> int:
+        # аудитория разрешается в БД одним INSERT ... SELECT
+        queued = await self.user_push_repository.enqueue_audience(push_id, audience)
+        logger.info("push queued", push_id=push_id, users=queued)
+        return queued
 
     async def get_push(self, push_id: UUID) -> Push:
         return await self.push_repository.get(push_id)
@@ -161,6 +171,12 @@ class NotificationService(NotificationServiceInterface):
     async def get_pushes(self) -> list[Push]:
         return await self.push_repository.get_all()
 
+    async def get_push_stats(self, push_id: UUID) -> PushStats:
+        return await self.push_stats_repository.get_by_push(push_id)
+
+    async def get_pushes_stats(self) -> list[PushStats]:
+        return await self.push_stats_repository.get_all()
+
     async def update_push(self, push_id: UUID, push: UpdatePushDTO) -> None:
         return await self.push_repository.update(push_id, push)
 
@@ -171,12 +187,49 @@ class NotificationService(NotificationServiceInterface):
         user = await self.users_repository.get(user_id)
         order = await self.orders_repository.get(order_id)
 
+        # Текст с названием товара и эмодзи
+        product_name = getattr(getattr(order, "product", None), "name", None)
+        if not product_name and order.product_id:
+            try:
+                product = await self.products_repository.get(order.product_id)
+                product_name = getattr(product, "name", None)
+            except Exception:
+                product_name = None
+
+        await self._send_progress_reminder(user.telegram_id, order.id, order.step, product_name)
+
+    async def send_order_progress_reminders(self, reminders: list[OrderReminder]) -> list[OrderReminder]:
+        # данные для сообщений уже выбраны вместе с заказами; шлём параллельно,
+        # но не больше reminder_concurrency сообщений одновременно
+        semaphore = asyncio.Semaphore(self.reminder_concurrency)
+
+        async def _send(reminder: OrderReminder) -> bool:
+            async with semaphore:
+                try:
+                    await self._send_progress_reminder(
+                        reminder.telegram_id, reminder.order_id, reminder.step, reminder.product_name,
+                    )
+                    return True
+                except Exception:
+                    logger.exception("failed to send reminder", order_id=reminder.order_id)
+                    return False
+
+        sent = await asyncio.gather(*(_send(reminder) for reminder in reminders))
+        return [reminder for reminder, ok in zip(reminders, sent) if not ok]
+
+    async def _send_progress_reminder(
+            self,
+            telegram_id: int,
+            order_id: UUID,
+            step: Optional[int],
+            product_name: Optional[str],
+    ) -> None:
         # Подбираем корректный маршрут для продолжения шага
-        if order.step is None or order.step in (0, 1):
+        if step is None or step in (0, 1):
             # Шаг 1 в роутинге идёт как /product/:orderId/step-1
-            path = f"product/{order.id}/step-1"
-        elif 2 <= order.step <= 7:
-            path = f"order/{order.id}/step-{order.step}"
+            path = f"product/{order_id}/step-1"
+        elif 2 <= step <= 7:
+            path = f"order/{order_id}/step-{step}"
         else:
             # Запасной вариант — список покупок
             path = "user/orders"
@@ -190,21 +243,12 @@ class NotificationService(NotificationServiceInterface):
             web_app=WebAppInfo(url=web_app_url),
         )
 
-        # Текст с названием товара и эмодзи
-        product_name = getattr(getattr(order, "product", None), "name", None)
-        if not product_name and order.product_id:
-            try:
-                product = await self.products_repository.get(order.product_id)
-                product_name = getattr(product, "name", None)
-            except Exception:
-                product_name = None
-
         text = (
             f"🛒 Вы начали выкуп товара «{product_name or 'ваш товар'}», но не завершили.\n"
             f"Нажмите кнопку ниже, чтобы продолжить и получить кешбэк 💸"
         )
         await self.bot.send_message(
-            chat_id=user.telegram_id,
+            chat_id=telegram_id,
             text=text,
             reply_markup=kb.as_markup(),
         )
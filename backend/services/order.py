@@ -1,29 +1,39 @@
-import logging
 import random
 import string
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, AsyncIterator
 from uuid import UUID
 
 from fastapi import HTTPException, status
 
 from abstractions.repositories import OrderRepositoryInterface, ProductRepositoryInterface, UserRepositoryInterface
+from abstractions.repositories.unit_of_work import UnitOfWorkInterface
 from abstractions.repositories.user_history import UserHistoryRepositoryInterface
 from abstractions.services import OrderServiceInterface
+from abstractions.services.catalog_cache import CatalogCacheInterface
+from abstractions.services.history_writer import HistoryWriterInterface
 from abstractions.services.notification import NotificationServiceInterface
-from domain.dto import UpdateOrderDTO, CreateOrderDTO, UpdateUserDTO, UpdateProductDTO
+from dependencies.repositories.unit_of_work import get_unit_of_work
+from dependencies.services.catalog_cache import get_catalog_cache
+from dependencies.services.principal_cache import get_principal_cache
+from domain.dto import UpdateOrderDTO, CreateOrderDTO, UpdateUserDTO
 from domain.dto.user_history import CreateUserHistoryDTO
 from domain.models import Order
+from domain.models.order import OrderListItem
+from domain.models.principal import Principal
 from domain.responses.order_report import OrderReport
+from domain.responses.seller_report import SellerReport
 from infrastructure.enums.action import Action
 from infrastructure.enums.order_status import OrderStatus
-from infrastructure.enums.product_status import ProductStatus
 from infrastructure.enums.user_role import UserRole
 from infrastructure.enums.order_status import OrderStatus as OS
 from domain.dto.order import UpdateOrderDTO
+from services.history_writer import HistoryWriter
+from utils.log import get_logger
+from utils.ttl_cache import TTLCache
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 @dataclass
 class OrderService(OrderServiceInterface):
@@ -32,61 +42,74 @@ class OrderService(OrderServiceInterface):
     notification_service: NotificationServiceInterface
     user_repository: UserRepositoryInterface
     user_history_repository: UserHistoryRepositoryInterface
+    catalog_cache: CatalogCacheInterface = field(default_factory=get_catalog_cache)
+    principal_cache: TTLCache[Principal] = field(default_factory=get_principal_cache)
+    unit_of_work: UnitOfWorkInterface = field(default_factory=get_unit_of_work)
+    # без общего буфера история пишется сразу через репозиторий
+    history_writer: Optional[HistoryWriterInterface] = None
+    # сколько заказов напоминание и автоотмена забирают за один запрос
+    inactivity_batch_size: int = 500
+
+    def __post_init__(self):
+        if self.history_writer is None:
+            self.history_writer = HistoryWriter(
+                user_history_repository=self.user_history_repository,
+                sync=True,
+            )
 
     async def create_order(self, dto: CreateOrderDTO) -> UUID:
-        # 1. Проверяем, что товар есть в наличии
-        product = await self.product_repository.get(dto.product_id)
+        # 1. Генерируем уникальный 6-значный код сделки (до резерва, чтобы не держать его дольше нужного)
+        dto.transaction_code = await self.generate_unique_code()
         now = datetime.now()
 
-        # +++ снимок "до"
-        json_before = product.model_dump(mode="json")
-        old_status = product.status
+        # резерв и заказ — одна транзакция: если заказ не вставится, резерв откатится вместе с ней
+        async with self.unit_of_work.begin():
+            # 2. Списываем единицу со склада одним UPDATE: проверка остатка и декремент
+            #    атомарны, поэтому параллельные покупатели не уводят остаток в минус;
+            #    несуществующий товар — NotFoundException из репозитория (404 в роуте)
+            reservation = await self.product_repository.reserve_unit(dto.product_id)
+            if reservation is None:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Товар закончился"
+                )
 
-        if product.remaining_products <= 0:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Товар закончился"
-            )
+            # 3. Создаём заказ (в базе сохранится и код)
+            await self.order_repository.create(dto)
 
-        # 2. Генерируем уникальный 6-значный код сделки
-        dto.transaction_code =  await self.generate_unique_code()
-
-        # 3. Создаём заказ (в базе сохранится и код)
-        await self.order_repository.create(dto)
-
-        # 4. Списываем единицу со склада
-        new_remaining = product.remaining_products - 1
-        await self.product_repository.update(
-            product.id,
-            UpdateProductDTO(
-                remaining_products=new_remaining,
-                status=(
-                    ProductStatus.ARCHIVED
-                    if new_remaining == 0
-                    else product.status
-                )
-            )
+        self.catalog_cache.bump()
+        # история пишется фоном и только для закоммиченного заказа
+        await self.history_writer.write_many(
+            self._order_created_history(dto, reservation.before, reservation.after, now)
         )
 
+        # 4. Возвращаем код для пользователя
+        return dto.id
+
+    @staticmethod
+    def _order_created_history(dto: CreateOrderDTO, before, after, now: datetime) -> list[CreateUserHistoryDTO]:
+        # +++ снимки "до" и "после" уже есть в резерве — перечитывать товар не нужно
+        json_before = before.model_dump(mode="json")
+        history: list[CreateUserHistoryDTO] = []
+
         if dto.step == 0:
-            await self.user_history_repository.create(CreateUserHistoryDTO(
+            history.append(CreateUserHistoryDTO(
                 user_id=dto.user_id,
                 creator_id=dto.user_id,
-                product_id=product.id,
+                product_id=after.id,
                 action=Action.AGREE_TERMS,
                 date=now,
                 json_before=json_before,
             ))
         # +++ если товар закончился — логируем ENDED и STATUS_CHANGED от имени системы
-        if new_remaining == 0:
-            updated = await self.product_repository.get(product.id)
-            json_after = updated.model_dump(mode="json")
+        if after.remaining_products == 0:
+            json_after = after.model_dump(mode="json")
 
             # 1) Товар закончился
-            await self.user_history_repository.create(CreateUserHistoryDTO(
+            history.append(CreateUserHistoryDTO(
                 user_id=dto.seller_id,
                 creator_id=None,
-                product_id=product.id,
+                product_id=after.id,
                 action=Action.ENDED,
                 date=now,
                 json_before=json_before,
@@ -94,19 +117,18 @@ class OrderService(OrderServiceInterface):
             ))
 
             # 2) Статус поменялся на ARCHIVED — фиксируем смену статуса (проверяем факт изменения)
-            if updated.status != old_status:
-                await self.user_history_repository.create(CreateUserHistoryDTO(
+            if after.status != before.status:
+                history.append(CreateUserHistoryDTO(
                     user_id=dto.seller_id,
                     creator_id=None,
-                    product_id=product.id,
+                    product_id=after.id,
                     action=Action.STATUS_CHANGED,
                     date=now,
                     json_before=json_before,
                     json_after=json_after,
                 ))
 
-        # 5. Возвращаем код для пользователя
-        return dto.id
+        return history
 
     async def trigger_inactivity_check(self, force: bool = False, order_id: Optional[UUID] = None) -> None:
         now = datetime.now()
@@ -123,24 +145,43 @@ class OrderService(OrderServiceInterface):
             return
 
         # Обычный режим: по 3 дням + запись REMINDER_SENT и отмена через сутки после напоминания
-        orders = await self.order_repository.get_inactive_orders(now - timedelta(days=3))
-        for order in orders:
-            await self.notification_service.send_order_progress_reminder(order.user_id, order.id)
-            try:
-                await self.user_history_repository.create(CreateUserHistoryDTO(
-                    user_id=order.user_id,
-                    creator_id=None,
-                    product_id=order.product_id,
-                    action=Action.REMINDER_SENT,
-                    date=now,
-                    json_before=None,
-                    json_after=None,
-                ))
-            except Exception:
-                pass
+        await self.process_inactive_orders(
+            remind_before=now - timedelta(days=3),
+            cancel_reminded_before=now - timedelta(days=1),
+        )
+
+    async def process_inactive_orders(self, remind_before: datetime, cancel_reminded_before: datetime) -> None:
+        """
+        Напоминания и автоотмена пачками: каждая пачка забирается одним запросом
+        с SKIP LOCKED, поэтому задачу можно запускать на нескольких репликах.
+        """
+        batch_size = self.inactivity_batch_size
+
+        # 1) напоминания: захват пачки и отметка REMINDER_SENT — один запрос, рассылка — параллельно
+        failed = []
+        while True:
+            reminders = await self.order_repository.claim_reminders(remind_before, limit=batch_size)
+            if reminders:
+                failed.extend(await self.notification_service.send_order_progress_reminders(reminders))
+            if len(reminders) < batch_size:
+                break
+
+        # неотправленные вернём в очередь только после цикла, иначе он заберёт их снова
+        if failed:
+            logger.warning("inactivity reminders were not sent, will retry", count=len(failed))
+            await self.order_repository.release_reminders(failed)
+
+        # 2) автоотмена: статус, возврат раздач и история — один запрос на пачку
+        cancelled = 0
+        while True:
+            order_ids = await self.order_repository.cancel_inactive(cancel_reminded_before, limit=batch_size)
+            cancelled += len(order_ids)
+            if len(order_ids) < batch_size:
+                break
 
-        for order in await self.order_repository.get_inactive_after_reminder(now - timedelta(days=1)):
-            await self.update_order(order.id, UpdateOrderDTO(status=OrderStatus.CANCELLED))
+        if cancelled:
+            logger.info("inactive orders cancelled", count=cancelled)
+            self.catalog_cache.bump()
 
     async def generate_unique_code(self) -> str:
         while True:
@@ -153,6 +194,35 @@ class OrderService(OrderServiceInterface):
         return await self.order_repository.get(order_id)
 
     async def update_order(self, order_id: UUID, dto: UpdateOrderDTO) -> None:
+        # все записи — одной транзакцией; уведомления уходят только после коммита
+        async with self.unit_of_work.begin():
+            restocked, history, role_changed = await self._apply_order_update(order_id, dto)
+
+        if restocked:
+            self.catalog_cache.bump()
+        # только после коммита: иначе параллельный запрос успеет закэшировать старую роль
+        for user_id in role_changed:
+            self.principal_cache.pop(user_id)
+        await self.history_writer.write_many(history)
+
+        if dto.status == OrderStatus.CASHBACK_PAID:
+            await self.notification_service.send_cashback_paid(order_id)
+        if dto.status == OrderStatus.CASHBACK_REJECTED:
+            await self.notification_service.send_cashback_rejected(order_id)
+
+    async def _apply_order_update(
+            self,
+            order_id: UUID,
+            dto: UpdateOrderDTO,
+    ) -> tuple[bool, list[CreateUserHistoryDTO], set[UUID]]:
+        """
+        Изменения заказа и их последствия. Возвращает признак возврата раздачи
+        товару, записи истории и пользователей со сменённой ролью — всё это
+        обрабатывается уже после коммита.
+        """
+        restocked = False
+        role_changed: set[UUID] = set()
+        history: list[CreateUserHistoryDTO] = []
         # 1. прежний статус (нужен для обработки отмены)
         old_order = await self.order_repository.get(order_id)
         old_status = old_order.status
@@ -176,7 +246,7 @@ class OrderService(OrderServiceInterface):
         now = datetime.now()
 
         # +++ шаги 1–7
-        logger.info(f"debug: {dto.step} {dto.step is not None} {dto.step != old_order.step}")
+        logger.debug("order step", order_id=order_id, step=dto.step, old_step=old_order.step)
         if dto.step is not None and dto.step != old_order.step:
             step_to_action = {
                 1: Action.FIRST_STEP_DONE,
@@ -188,9 +258,9 @@ class OrderService(OrderServiceInterface):
                 7: Action.SEVENTH_STEP_DONE,
             }
             action = step_to_action.get(dto.step)
-            print(f"action: {action}")
+            logger.debug("order step action", order_id=order_id, step=dto.step, action=action)
             if action is not None:
-                await self.user_history_repository.create(
+                history.append(
                     CreateUserHistoryDTO(
                         user_id=order.user_id,
                         creator_id=order.user_id,
@@ -204,25 +274,12 @@ class OrderService(OrderServiceInterface):
 
         # ---------- переход в CANCELLED ----------
         if dto.status == OrderStatus.CANCELLED and old_status != OrderStatus.CANCELLED:
-            new_remaining = product.remaining_products + 1
-
-            # если карточка была в архиве и теперь есть остаток – снова активируем
-            new_status = (
-                ProductStatus.ACTIVE
-                if product.status == ProductStatus.ARCHIVED and new_remaining > 0
-                else product.status
-            )
-
-            await self.product_repository.update(
-                product.id,
-                UpdateProductDTO(
-                    remaining_products=new_remaining,
-                    status=new_status
-                )
-            )
+            # одним UPDATE, как и резерв: остаток +1, архивная карточка снова активна
+            await self.product_repository.release_unit(product.id)
+            restocked = True
 
             # Лог: отмена заказа и возврат раздачи
-            await self.user_history_repository.create(
+            history.append(
                 CreateUserHistoryDTO(
                     user_id=order.user_id,
                     creator_id=None,
@@ -240,24 +297,25 @@ class OrderService(OrderServiceInterface):
                 seller.id,
                 UpdateUserDTO(role=UserRole.SELLER)
             )
+            role_changed.add(seller.id)
 
         # ---------- CASHBACK_PAID ----------
         if dto.status == OrderStatus.CASHBACK_PAID:
-            await self.notification_service.send_cashback_paid(order_id)
             await self.user_repository.update(
                 order.user_id,
                 UpdateUserDTO(role=UserRole.CLIENT)
             )
+            role_changed.add(order.user_id)
         if dto.status == OrderStatus.CASHBACK_REJECTED:
-            await self.notification_service.send_cashback_rejected(order_id)
             await self.user_repository.update(
                 order.user_id,
                 UpdateUserDTO(role=UserRole.CLIENT)
             )
+            role_changed.add(order.user_id)
 
         # +++ кэшбэк выплачен
         if dto.status == OrderStatus.CASHBACK_PAID and old_status != OrderStatus.CASHBACK_PAID:
-            await self.user_history_repository.create(
+            history.append(
                 CreateUserHistoryDTO(
                     user_id=order.user_id,
                     creator_id=order.seller_id,  # системное событие
@@ -272,7 +330,7 @@ class OrderService(OrderServiceInterface):
         # +++ кэшбэк отклонён
         if dto.status == OrderStatus.CASHBACK_REJECTED and old_status != OrderStatus.CASHBACK_REJECTED:
 
-            await self.user_history_repository.create(
+            history.append(
                 CreateUserHistoryDTO(
                     user_id=order.user_id,
                     creator_id=order.seller_id,  # системное событие
@@ -284,13 +342,15 @@ class OrderService(OrderServiceInterface):
                 )
             )
 
+        return restocked, history, role_changed
+
     async def delete_order(self, order_id: UUID) -> None:
         await self.order_repository.delete(order_id)
 
-    async def get_orders(self, limit: int = 100, offset: int = 0) -> List[Order]:
-        return await self.order_repository.get_all(limit=limit, offset=offset)
+    async def get_orders(self, limit: int = 100, offset: int = 0) -> list[OrderListItem]:
+        return await self.order_repository.get_list(limit=limit, offset=offset)
 
-    async def get_orders_by_user(self, user_id: UUID) -> List[Order]:
+    async def get_orders_by_user(self, user_id: UUID) -> list[OrderListItem]:
         return await self.order_repository.get_orders_by_user(user_id=user_id)
 
     async def get_user_report(self, order_id: UUID) -> OrderReport:
@@ -302,14 +362,55 @@ class OrderService(OrderServiceInterface):
         order_report = OrderReport.model_validate(order_dict)
         return order_report
 
-    async def get_orders_by_seller(self, seller_id: UUID) -> list[Order]:
+    async def get_orders_by_seller(self, seller_id: UUID) -> list[OrderListItem]:
         orders = await self.order_repository.get_orders_by_seller(seller_id)
         return orders
 
-    async def get_all_orders_by_seller(self, seller_id: UUID) -> list[Order]:
+    async def get_all_orders_by_seller(self, seller_id: UUID) -> list[OrderListItem]:
         orders = await self.order_repository.get_all_orders_by_seller(seller_id)
         return orders
 
+    async def get_seller_report(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+    ) -> SellerReport:
+        return await self.order_repository.get_seller_report(seller_id, date_from=date_from, date_to=date_to)
+
+    async def get_seller_report_orders(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+            status: Optional[OrderStatus] = None,
+            step: Optional[int] = None,
+            product_id: Optional[UUID] = None,
+            limit: int = 50,
+            offset: int = 0,
+    ) -> list[OrderListItem]:
+        return await self.order_repository.get_seller_report_orders(
+            seller_id,
+            date_from=date_from,
+            date_to=date_to,
+            status=status,
+            step=step,
+            product_id=product_id,
+            limit=limit,
+            offset=offset,
+        )
+
+    def stream_seller_orders(
+            self,
+            seller_id: UUID,
+            date_from: Optional[datetime] = None,
+            date_to: Optional[datetime] = None,
+            status: Optional[OrderStatus] = None,
+    ) -> AsyncIterator[OrderListItem]:
+        return self.order_repository.stream_seller_orders(
+            seller_id, date_from=date_from, date_to=date_to, status=status,
+        )
+
     async def get_in_progress_orders_by_seller(self, seller_id: UUID) -> list[Order]:
         orders = await self.order_repository.get_in_progress_orders_by_seller(seller_id)
         return orders
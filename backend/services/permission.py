@@ -12,14 +12,22 @@ class PermissionService(PermissionServiceInterface):
     user_service: UserServiceInterface
 
     async def is_moderator(self, user_id: UUID) -> None:
-        user = await self.user_service.get_user(user_id)
+        user = await self.user_service.get_principal(user_id)
         is_moderator = user.role == UserRole.MODERATOR or user.role == UserRole.ADMIN
 
         if not is_moderator:
             raise PermissionException("Only moderators can do this")
 
+    async def is_seller_or_moderator(self, user_id: UUID, seller_id: UUID) -> None:
+        await self.is_self_or_moderator(user_id, seller_id)
+
+    async def is_self_or_moderator(self, user_id: UUID, owner_id: UUID) -> None:
+        if user_id == owner_id:
+            return
+        await self.is_moderator(user_id)
+
     async def is_admin(self, user_id: UUID) -> None:
-        user = await self.user_service.get_user(user_id)
+        user = await self.user_service.get_principal(user_id)
         is_moderator = user.role == UserRole.ADMIN
 
         if not is_moderator:
@@ -1,5 +1,4 @@
-import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID
@@ -7,22 +6,32 @@ from uuid import UUID
 from abstractions.repositories import ProductRepositoryInterface, UserRepositoryInterface
 from abstractions.repositories.increasing_balance import IncreasingBalanceRepositoryInterface
 from abstractions.repositories.push import PushRepositoryInterface
+from abstractions.repositories.seller_balance import SellerBalanceRepositoryInterface
+from abstractions.repositories.unit_of_work import UnitOfWorkInterface
 from abstractions.repositories.user_history import UserHistoryRepositoryInterface
 from abstractions.repositories.user_push import UserPushRepositoryInterface
 from abstractions.services import ProductServiceInterface
+from abstractions.services.catalog_cache import CatalogCacheInterface
+from abstractions.services.history_writer import HistoryWriterInterface
 from abstractions.services.notification import NotificationServiceInterface
-from dependencies.repositories.user_history import get_user_history_repository
+from dependencies.repositories.unit_of_work import get_unit_of_work
+from dependencies.services.catalog_cache import get_catalog_cache
 from domain.dto import CreateProductDTO, UpdateProductDTO, UpdateUserDTO
 from domain.dto.increasing_balance import CreateIncreasingBalanceDTO
 from domain.dto.user_history import CreateUserHistoryDTO
 from domain.models import Product
+from domain.models.product import ProductListItem
+from domain.responses.product import ProductPage
 from infrastructure.enums.action import Action
 from infrastructure.enums.product_status import ProductStatus
 from sqlalchemy.inspection import inspect
 
 from services.exceptions import ProductNotFoundException
+from services.history_writer import HistoryWriter
+from utils.cursor import decode_keyset_cursor, encode_keyset_cursor, decode_ranked_cursor, encode_ranked_cursor
+from utils.log import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -34,11 +43,33 @@ class ProductService(ProductServiceInterface):
     notification_service: NotificationServiceInterface
     user_history_repository: UserHistoryRepositoryInterface
     increasing_balance_repository: IncreasingBalanceRepositoryInterface
+    seller_balance_repository: SellerBalanceRepositoryInterface
+    catalog_cache: CatalogCacheInterface = field(default_factory=get_catalog_cache)
+    unit_of_work: UnitOfWorkInterface = field(default_factory=get_unit_of_work)
+    # без общего буфера история пишется сразу через репозиторий
+    history_writer: Optional[HistoryWriterInterface] = None
+
+    def __post_init__(self):
+        if self.history_writer is None:
+            self.history_writer = HistoryWriter(
+                user_history_repository=self.user_history_repository,
+                sync=True,
+            )
 
     async def create_product(self, dto: CreateProductDTO) -> UUID:
-        await self.product_repository.create(dto)
-
-        await self.user_history_repository.create(CreateUserHistoryDTO(
+        async with self.unit_of_work.begin():
+            await self.product_repository.create(dto)
+
+            update_user = UpdateUserDTO(
+                is_seller=True,
+            )
+            await self.user_repository.update(
+                obj_id=dto.seller_id,
+                obj=update_user
+            )
+
+        self.catalog_cache.bump()
+        await self.history_writer.write(CreateUserHistoryDTO(
             user_id=dto.seller_id,
             creator_id=dto.seller_id,
             product_id=dto.id,
@@ -47,21 +78,25 @@ class ProductService(ProductServiceInterface):
             json_before=dto.model_dump(mode="json"),
             json_after=None,
         ))
-
-        update_user = UpdateUserDTO(
-            is_seller=True,
-        )
-        await self.user_repository.update(
-            obj_id=dto.seller_id,
-            obj=update_user
-        )
-
         return dto.id
 
     async def get_product(self, product_id: UUID) -> Product:
         return await self.product_repository.get(product_id)
 
     async def update_product(self, product_id: UUID, dto: UpdateProductDTO, user_id: UUID) -> None:
+        # чтение баланса, правка товара и история — одной транзакцией
+        async with self.unit_of_work.begin():
+            history = await self._apply_product_update(product_id, dto, user_id)
+
+        self.catalog_cache.bump()
+        await self.history_writer.write_many(history)
+
+    async def _apply_product_update(
+            self,
+            product_id: UUID,
+            dto: UpdateProductDTO,
+            user_id: UUID,
+    ) -> list[CreateUserHistoryDTO]:
         # 1. Получаем старый продукт и данные по продавцу
         old = await self.product_repository.get(product_id)
         seller_id = old.seller_id
@@ -85,16 +120,18 @@ class ProductService(ProductServiceInterface):
                 and new_status_candidate == ProductStatus.ARCHIVED
         )
 
-        # 2. Рассчитываем уже зарезервированные раздачи (remaining_products для ACTIVE товаров)
-        products = await self.product_repository.get_by_seller(seller_id)
-        reserved_active = sum(
-            p.remaining_products for p in products
-            if p.status == ProductStatus.ACTIVE
-        )
-        logger.info(f"products: {products}\n\nlol\n\n{', '.join(map(lambda p: f'{p.id}: {p.name}: {p.remaining_products}', products))}")
+        # 2. Уже зарезервированные раздачи (remaining_products для ACTIVE товаров) — из агрегата продавца
+        ledger = await self.seller_balance_repository.get_by_seller(seller_id)
+        reserved_active = ledger.reserved_active
         # 3. Определяем свободный остаток
         free_credits = user.balance - reserved_active
-        logger.info(f"free_credits: {free_credits}, balance: {user.balance}, reserved_active: {reserved_active}")
+        logger.debug(
+            "product update credits",
+            product_id=product_id,
+            free_credits=free_credits,
+            balance=user.balance,
+            reserved_active=reserved_active,
+        )
 
         # 4. Проверяем, меняются ли только планы раздач (общий или суточный)
         ignored = {'general_repurchases'}
@@ -105,29 +142,29 @@ class ProductService(ProductServiceInterface):
 
         # 5. Спецлогика для чистого изменения планов раздач
         if not other_changes and dto.general_repurchases is not None:
-            logger.info(f"if")
             if dto.general_repurchases is not None:
-                logger.info(f"dto {dto.general_repurchases}")
-                logger.info(f"old {old.general_repurchases}")
                 delta = dto.general_repurchases - old.general_repurchases
-                logger.info(f"delta {delta}")
+                logger.debug(
+                    "plan change",
+                    product_id=product_id,
+                    old=old.general_repurchases,
+                    new=dto.general_repurchases,
+                    delta=delta,
+                    free_credits=free_credits,
+                )
                 dto.remaining_products = old.remaining_products + delta
                 if delta > 0:
-                    logger.info(f"delta ({delta}) > 0")
                     if free_credits >= delta:
-                        logger.info(f"free credits ({free_credits}) >= delta ({delta})")
                         dto.status = ProductStatus.ACTIVE
                         reserved_active += delta
                         free_credits -= delta
                     else:
-                        logger.info(f"free credits ({free_credits}) < delta ({delta})")
                         dto.status = ProductStatus.NOT_PAID
                         reserved_active -= old.general_repurchases
                         reserved_active += dto.general_repurchases
                         free_credits += old.general_repurchases
                         free_credits -= dto.general_repurchases
                 elif delta < 0:
-                    logger.info(f"delta ({delta}) < 0")
                     dto.status = ProductStatus.ACTIVE
                     reserved_active+=delta
                     free_credits-=delta
@@ -176,12 +213,12 @@ class ProductService(ProductServiceInterface):
                 new.status != old_status and new.status == ProductStatus.ARCHIVED
         )
 
-        # +++ Пишем историю
-        user_history_repository = get_user_history_repository()
+        # +++ Готовим историю — её запишут после коммита
+        history: list[CreateUserHistoryDTO] = []
         now = datetime.now()
 
         if product_was_edited:
-            await user_history_repository.create(CreateUserHistoryDTO(
+            history.append(CreateUserHistoryDTO(
                 user_id=new.seller_id,
                 creator_id=user_id,
                 product_id=product_id,
@@ -192,7 +229,7 @@ class ProductService(ProductServiceInterface):
             ))
 
         if status_changed_to_archived or status_changed_to_archived_real:
-            await user_history_repository.create(CreateUserHistoryDTO(
+            history.append(CreateUserHistoryDTO(
                 user_id=new.seller_id,
                 creator_id=user_id,
                 product_id=product_id,
@@ -202,35 +239,36 @@ class ProductService(ProductServiceInterface):
                 json_after=json_after,
             ))
 
+        return history
+
     async def delete_product(self, product_id: UUID) -> None:
-        product = await self.product_repository.get(product_id)
+        async with self.unit_of_work.begin():
+            product = await self.product_repository.get(product_id)
 
-        logger.info(f"deleting product {product_id}")
+            if not product:
+                raise ProductNotFoundException(f"Product with id {product_id} not found")
 
-        if not product:
-            raise ProductNotFoundException(f"Product with id {product_id} not found")
+            logger.info("deleting product", product_id=product_id, status=product.status)
 
-        logger.info(f"deleting product with status {product.status}")
+            if product.status == ProductStatus.ARCHIVED:
+                user = await self.user_repository.get(product.seller_id)
+                if product.remaining_products > 0:
+                    update_dto = UpdateUserDTO(
+                        balance=user.balance + product.remaining_products,
+                    )
+                    await self.user_repository.update(product.seller_id, update_dto)
+                    logger.debug("archive remainder returned", user_id=user.id, sum=product.remaining_products)
 
-        if product.status == ProductStatus.ARCHIVED:
-            logger.info(f"deleting archive")
-            user = await self.user_repository.get(product.seller_id)
-            logger.info(f"user: {user.id}")
-            if product.remaining_products > 0:
-                update_dto = UpdateUserDTO(
-                    balance=user.balance + product.remaining_products,
-                )
-                await self.user_repository.update(product.seller_id, update_dto)
-                logger.info(f"user {user.id} updated")
+                    create_increasing_balance_dto = CreateIncreasingBalanceDTO(
+                        user_id=product.seller_id,
+                        sum=product.remaining_products,
+                    )
 
-                create_increasing_balance_dto = CreateIncreasingBalanceDTO(
-                    user_id=product.seller_id,
-                    sum=product.remaining_products,
-                )
+                    await self.increasing_balance_repository.create(create_increasing_balance_dto)
 
-                await self.increasing_balance_repository.create(create_increasing_balance_dto)
+            await self.product_repository.delete(product_id)
 
-        await self.product_repository.delete(product_id)
+        self.catalog_cache.bump()
 
     async def get_products(self, limit: int = 100, offset: int = 0) -> List[Product]:
         return await self.product_repository.get_all(limit=limit, offset=offset)
@@ -238,9 +276,39 @@ class ProductService(ProductServiceInterface):
     async def get_by_article(self, article: str) -> Product:
         return await self.product_repository.get_by_article(article)
 
-    async def get_by_seller(self, seller_id: UUID) -> Optional[list[Product]]:
+    async def get_by_seller(self, seller_id: UUID) -> list[ProductListItem]:
         return await self.product_repository.get_by_seller(seller_id)
 
     async def get_active_products(self, limit: int = 100, offset: int = 0, search: Optional[str] = None) -> List[
         Product]:
         return await self.product_repository.get_active_products(limit=limit, offset=offset, search=search)
+
+    async def get_catalog_page(
+            self,
+            limit: int = 100,
+            cursor: Optional[str] = None,
+            search: Optional[str] = None,
+    ) -> ProductPage:
+        after = decode_keyset_cursor(cursor) if cursor else None
+        # берём на одну строку больше, чтобы понять, есть ли следующая страница
+        products = await self.product_repository.get_active_products(
+            limit=limit + 1, offset=0, search=search, after=after,
+        )
+        if len(products) <= limit:
+            return ProductPage(items=products)
+
+        items = products[:limit]
+        last = items[-1]
+        return ProductPage(items=items, next_cursor=encode_keyset_cursor(last.created_at, last.id))
+
+    async def search_products(self, search: str, limit: int = 100, cursor: Optional[str] = None) -> ProductPage:
+        after = decode_ranked_cursor(cursor) if cursor else None
+        hits = await self.product_repository.get_active_products(
+            limit=limit + 1, offset=0, search=search, after=after, ranked=True,
+        )
+        if len(hits) <= limit:
+            return ProductPage(items=hits)
+
+        items = hits[:limit]
+        last = items[-1]
+        return ProductPage(items=items, next_cursor=encode_ranked_cursor(last.rank, last.created_at, last.id))
@@ -1,4 +1,3 @@
-import logging
 from dataclasses import dataclass
 from typing import List
 from uuid import UUID
@@ -13,8 +12,9 @@ from domain.models import Review
 from domain.models.seller_review import SellerReview
 from routes.requests.seller_review import SellerReviewRequest
 from services.exceptions import NoSuchEntity
+from utils.log import get_logger, Payload
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -41,8 +41,7 @@ class SellerReviewService(SellerReviewServiceInterface):
             rating=seller_review_req.rating,
             review=seller_review_req.review,
         )
-        logger.info("AAAAAAAAAAAAAA dto")
-        logger.info(dto)
+        logger.debug("creating seller review", dto=Payload(dto))
         return await self.seller_review_repository.create(dto)
 
     async def get_seller_review(self, review_id: UUID) -> SellerReview:
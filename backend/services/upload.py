@@ -1,43 +1,166 @@
-import logging
+import asyncio
+import hashlib
 import os
+import time
 from dataclasses import dataclass, field
-from typing import Annotated
 from uuid import uuid4
 
 import aiofiles
-from fastapi import UploadFile
+import aiofiles.os
+from fastapi import UploadFile, HTTPException, status
 
+from abstractions.repositories.upload_reference import UploadReferenceRepositoryInterface
 from abstractions.services.upload import UploadServiceInterface
+from utils.files import content_path
+from utils.image_paths import source_path
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# недописанные файлы лежат рядом с готовыми, чтобы rename был атомарным (та же ФС)
+_TMP_PREFIX = ".tmp-"
+
+# по скольку путей за раз сверяем с БД при сборке мусора
+_GC_BATCH_SIZE = 500
 
-logger = logging.getLogger(__name__)
 
 @dataclass
 class UploadService(UploadServiceInterface):
+    """
+    Файлы хранятся по содержимому: <h[:2]>/<h[2:4]>/<sha256>.<ext>.
+    Одинаковые картинки лежат на диске один раз, а путь файла никогда не меняет содержимое.
+    Файлы, на которые больше не ссылается ни одна строка, удаляет collect_garbage.
+    """
+    reference_repository: UploadReferenceRepositoryInterface
     images_dir: str = field(default="/app/upload")
+    max_size: int = 20 * 1024 * 1024
+    chunk_size: int = 64 * 1024
+    # моложе — не трогаем: путь могли ещё не успеть сохранить в БД
+    gc_min_age: int = 3600
 
     async def initialize(self) -> None:
         os.makedirs(self.images_dir, exist_ok=True)
+        # хвосты загрузок, оборванных падением процесса
+        for name in os.listdir(self.images_dir):
+            if name.startswith(_TMP_PREFIX):
+                await self._discard(self.get_file_path(name))
 
     async def upload(self, file: UploadFile) -> str:
-        new_filename, new_filepath = self._get_new_file_path(file.filename)
+        # размер из multipart известен заранее — отказываем, не читая тело
+        if file.size is not None and file.size > self.max_size:
+            raise self._too_large()
+
+        tmp_path = self.get_file_path(f"{_TMP_PREFIX}{uuid4()}")
         try:
-            async with aiofiles.open(new_filepath, "wb") as f:
-                content = await file.read()
-                await f.write(content)
-            return new_filename
-        except Exception:
-            logger.error("There was an error while uploading file", exc_info=True)
+            size, digest = await self._copy_to(file, tmp_path)
+            filename = content_path(digest, file.filename)
+            file_path = self.get_file_path(filename)
+            # такой файл уже есть — свежий mtime защищает его от сборщика мусора
+            deduplicated = await self._touch(file_path)
+            if deduplicated:
+                await self._discard(tmp_path)
+            else:
+                await aiofiles.os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                await aiofiles.os.replace(tmp_path, file_path)
+        except BaseException as e:
+            await self._discard(tmp_path)
+            if not isinstance(e, HTTPException):
+                logger.error("There was an error while uploading file", exc_info=True)
             raise
 
+        logger.debug("file uploaded", filename=filename, size=size, deduplicated=deduplicated)
+        return filename
+
+    async def _copy_to(self, file: UploadFile, path: str) -> tuple[int, str]:
+        """Копирует файл кусками по chunk_size, попутно считая размер и sha256."""
+        size = 0
+        digest = hashlib.sha256()
+        async with aiofiles.open(path, "wb") as out:
+            while chunk := await file.read(self.chunk_size):
+                size += len(chunk)
+                if size > self.max_size:
+                    raise self._too_large()
+                digest.update(chunk)
+                await out.write(chunk)
+        return size, digest.hexdigest()
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Файл больше {self.max_size / (1024 * 1024):g} МБ",
+        )
+
+    @staticmethod
+    async def _touch(path: str) -> bool:
+        """Обновляет mtime существующего файла; False — файла нет (или его только что удалил сборщик)."""
+        try:
+            await asyncio.to_thread(os.utime, path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @staticmethod
+    async def _discard(path: str) -> None:
+        try:
+            await aiofiles.os.remove(path)
+        except FileNotFoundError:
+            pass
+
     def get_file_path(self, filename: str) -> str:
-        return os.path.join(self.images_dir, filename)
-
-    def _get_new_file_path(
-            self,
-            filename: str,
-    ) -> tuple[
-        Annotated[str, 'filename'],
-        Annotated[str, 'file path'],
-    ]:
-        new_filename = f"{uuid4()}.{filename.split('.')[-1]}"
-        return new_filename, self.get_file_path(new_filename)
+        root = os.path.normpath(self.images_dir)
+        path = os.path.normpath(os.path.join(root, filename))
+        # пути теперь с подкаталогами — не выпускаем их за пределы хранилища
+        if os.path.commonpath([root, path]) != root:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Файл не найден")
+        return path
+
+    async def collect_garbage(self) -> int:
+        """
+        Удаляет файлы старше gc_min_age, на которые нет ссылок в БД. Возвращает число удалённых.
+        Одновременно собирает только один процесс (advisory-блокировка), остальные пропускают проход.
+        """
+        async with self.reference_repository.gc_lock() as acquired:
+            if not acquired:
+                logger.info("upload garbage collection skipped: running elsewhere")
+                return 0
+            return await self._collect_garbage()
+
+    async def _collect_garbage(self) -> int:
+        candidates = await asyncio.to_thread(self._list_stale_files)
+        removed = 0
+        for start in range(0, len(candidates), _GC_BATCH_SIZE):
+            batch = candidates[start:start + _GC_BATCH_SIZE]
+            # вариант картинки живёт, пока есть ссылка на её оригинал
+            sources = {filename: source_path(filename) or filename for filename in batch}
+            referenced = await self.reference_repository.get_referenced(set(sources.values()))
+            for filename, source in sources.items():
+                if source in referenced:
+                    continue
+                # между обходом и проверкой ссылок загрузка могла получить этот же файл
+                # дедупликацией (utime) и сохранить путь — такой файл уже не старый
+                if not await asyncio.to_thread(self._is_stale, self.get_file_path(filename)):
+                    continue
+                await self._discard(self.get_file_path(filename))
+                removed += 1
+
+        logger.info("upload garbage collected", checked=len(candidates), removed=removed)
+        return removed
+
+    def _is_stale(self, path: str) -> bool:
+        try:
+            return os.stat(path).st_mtime <= time.time() - self.gc_min_age
+        except FileNotFoundError:
+            return False
+
+    def _list_stale_files(self) -> list[str]:
+        """
+        Относительные пути всех файлов хранилища (и старых uuid-имён тоже), не менявшихся gc_min_age.
+        Временные файлы такого возраста — остатки оборванных записей, ссылок на них нет.
+        """
+        stale = []
+        for root, _, names in os.walk(self.images_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                if self._is_stale(path):
+                    stale.append(os.path.relpath(path, self.images_dir).replace(os.sep, "/"))
+        return stale
@@ -1,24 +1,38 @@
-import logging
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import List, Optional, AsyncIterator
 from uuid import UUID
 
 from abstractions.repositories import ProductRepositoryInterface
 from abstractions.repositories.increasing_balance import IncreasingBalanceRepositoryInterface
+from abstractions.repositories.seller_balance import SellerBalanceRepositoryInterface
+from abstractions.repositories.unit_of_work import UnitOfWorkInterface
 from abstractions.repositories.user import UserRepositoryInterface
 from abstractions.services import UserServiceInterface
+from abstractions.services.catalog_cache import CatalogCacheInterface
 from abstractions.services.notification import NotificationServiceInterface
 from dependencies.repositories.increasing_balance import get_increasing_balance_repository
+from dependencies.repositories.unit_of_work import get_unit_of_work
 from dependencies.repositories.user_history import get_user_history_repository
+from dependencies.services.auth.login_cache import get_login_cache, get_known_user_cache
+from dependencies.services.catalog_cache import get_catalog_cache
+from dependencies.services.principal_cache import get_principal_cache
 from domain.dto import CreateUserDTO, UpdateUserDTO, UpdateProductDTO
 from domain.dto.increasing_balance import CreateIncreasingBalanceDTO
+from domain.dto.user_history import UserHistoryFilter
 from domain.models import User
+from domain.models.principal import Principal
+from domain.models.seller_balance import SellerBalance
+from domain.responses.auth import AuthTokens
+from domain.responses.user_history import UserHistoryPage
 from infrastructure.entities import UserHistory, IncreasingBalance
 from infrastructure.enums.product_status import ProductStatus
 from infrastructure.enums.user_role import UserRole
+from utils.cursor import decode_keyset_cursor, encode_keyset_cursor
 from utils.referral import uuid_to_b64url
+from utils.ttl_cache import TTLCache
+from utils.log import get_logger
 
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 
 @dataclass
@@ -27,8 +41,14 @@ class UserService(UserServiceInterface):
     notification_service: NotificationServiceInterface
     product_repository: ProductRepositoryInterface
     increasing_balance_repository: IncreasingBalanceRepositoryInterface
+    seller_balance_repository: SellerBalanceRepositoryInterface
 
     bot_username: str
+    catalog_cache: CatalogCacheInterface = field(default_factory=get_catalog_cache)
+    principal_cache: TTLCache[Principal] = field(default_factory=get_principal_cache)
+    login_cache: TTLCache[tuple[int, AuthTokens]] = field(default_factory=get_login_cache)
+    known_user_cache: TTLCache[UUID] = field(default_factory=get_known_user_cache)
+    unit_of_work: UnitOfWorkInterface = field(default_factory=get_unit_of_work)
 
     async def create_user(self, dto: CreateUserDTO) -> None:
         return await self.user_repository.create(dto)
@@ -38,9 +58,23 @@ class UserService(UserServiceInterface):
 
     async def update_user(self, user_id: UUID, dto: UpdateUserDTO) -> None:
         await self.user_repository.update(user_id, dto)
+        if dto.role is not None or dto.is_banned is not None:
+            self.principal_cache.pop(user_id)
 
     async def delete_user(self, user_id: UUID) -> None:
         await self.user_repository.delete(user_id)
+        self.principal_cache.pop(user_id)
+        # кэши входа ключуются данными Telegram, а не id — удаления редки, чистим целиком
+        self.login_cache.clear()
+        self.known_user_cache.clear()
+
+    async def get_principal(self, user_id: UUID) -> Principal:
+        principal = self.principal_cache.get(user_id)
+        if principal is None:
+            user = await self.user_repository.get(user_id)
+            principal = Principal.model_validate(user)
+            self.principal_cache.set(user_id, principal)
+        return principal
 
     async def get_users(self, limit: int = 100, offset: int = 0) -> List[User]:
         return await self.user_repository.get_all(limit=limit, offset=offset)
@@ -59,6 +93,7 @@ class UserService(UserServiceInterface):
             obj_id=user_id,
             obj=dto,
         )
+        self.principal_cache.pop(user_id)
 
     async def unban(self, user_id: UUID):
         dto = UpdateUserDTO(
@@ -68,6 +103,7 @@ class UserService(UserServiceInterface):
             obj_id=user_id,
             obj=dto,
         )
+        self.principal_cache.pop(user_id)
 
     async def promote_user(self, user_id: UUID):
         dto = UpdateUserDTO(
@@ -77,6 +113,7 @@ class UserService(UserServiceInterface):
             obj_id=user_id,
             obj=dto,
         )
+        self.principal_cache.pop(user_id)
 
     async def demote_user(self, user_id: UUID) -> None:
         dto = UpdateUserDTO(
@@ -86,6 +123,7 @@ class UserService(UserServiceInterface):
             obj_id=user_id,
             obj=dto,
         )
+        self.principal_cache.pop(user_id)
 
     async def get_banned(self) -> list[User]:
         return await self.user_repository.get_banned()
@@ -100,11 +138,12 @@ class UserService(UserServiceInterface):
         return await self.user_repository.get_moderators()
 
     async def increase_balance(self, user_id: UUID, balance_sum: int):
-        user = await self.user_repository.get(user_id)
-        update_dto = UpdateUserDTO(
-            balance=user.balance + balance_sum,
-        )
-        res = await self.user_repository.update(user_id, update_dto)
+        async with self.unit_of_work.begin():
+            activated = await self._apply_balance_increase(user_id, balance_sum)
+
+        if activated:
+            self.catalog_cache.bump()
+
         try:
             await self.notification_service.send_balance_increased(
                 user_id=user_id,
@@ -113,6 +152,14 @@ class UserService(UserServiceInterface):
         except Exception:
             logger.error("Error while sending push notification", exc_info=True)
 
+    async def _apply_balance_increase(self, user_id: UUID, balance_sum: int) -> bool:
+        user = await self.user_repository.get(user_id)
+        update_dto = UpdateUserDTO(
+            balance=user.balance + balance_sum,
+        )
+        await self.user_repository.update(user_id, update_dto)
+
+        activated = False
         products = await self.product_repository.get_by_seller(user_id)
         necessary_balance = sum(product.remaining_products for product in products if product.status==ProductStatus.ACTIVE
                                 or product.status==ProductStatus.NOT_PAID)
@@ -123,6 +170,7 @@ class UserService(UserServiceInterface):
                         status=ProductStatus.ACTIVE,
                     )
                     await self.product_repository.update(product.id, update_product_dto)
+                    activated = True
         else:
             active_products_sum = sum(product.remaining_products for product in products if product.status == ProductStatus.ACTIVE)
             not_paid_products = [product for product in products if product.status == ProductStatus.NOT_PAID]
@@ -132,6 +180,7 @@ class UserService(UserServiceInterface):
                         status=ProductStatus.ACTIVE,
                     )
                     await self.product_repository.update(product.id, update_product_dto)
+                    activated = True
 
         create_increasing_balance_dto = CreateIncreasingBalanceDTO(
             user_id=user_id,
@@ -139,8 +188,7 @@ class UserService(UserServiceInterface):
         )
 
         await self.increasing_balance_repository.create(create_increasing_balance_dto)
-
-        return res
+        return activated
 
     async def increase_referrer_bonus(self, user_id: UUID, bonus: int) -> None:
         await self.user_repository.increase_referrer_bonus(user_id, bonus)
@@ -159,9 +207,33 @@ class UserService(UserServiceInterface):
         # по желанию добавьте префикс для роутинга/совместимости: start=ref_<token>
         return f'https://t.me/{self.bot_username}?start={token}'
 
-    async def get_user_history(self, user_id: UUID) -> list[UserHistory]:
+    async def get_user_history(
+            self,
+            user_id: UUID,
+            limit: int = 100,
+            cursor: Optional[str] = None,
+            filters: Optional[UserHistoryFilter] = None,
+            with_snapshots: bool = True,
+    ) -> UserHistoryPage:
         user_history_repository = get_user_history_repository()
-        return await user_history_repository.get_by_user(user_id)
+        after = decode_keyset_cursor(cursor) if cursor else None
+        # берём на одну строку больше, чтобы понять, есть ли следующая страница
+        items = await user_history_repository.get_by_user(
+            user_id, limit=limit + 1, after=after, filters=filters, with_snapshots=with_snapshots,
+        )
+        if len(items) <= limit:
+            return UserHistoryPage(items=items)
+
+        items = items[:limit]
+        last = items[-1]
+        return UserHistoryPage(items=items, next_cursor=encode_keyset_cursor(last.date, last.id))
+
+    def stream_user_history(self, user_id: UUID) -> AsyncIterator[UserHistory]:
+        user_history_repository = get_user_history_repository()
+        return user_history_repository.stream_by_user(user_id)
+
+    async def get_seller_balance(self, seller_id: UUID) -> SellerBalance:
+        return await self.seller_balance_repository.get_by_seller(seller_id)
 
     async def get_user_history_balance(self, user_id: UUID) -> Optional[list[IncreasingBalance]]:
         increasing_balance_repository = get_increasing_balance_repository()
@@ -50,12 +50,80 @@ class BotSettings(AbstractSettings):
     free_topic_id: int = Field(..., alias="BOT_FREE_TOPIC_ID")
 
 
+class CacheSettings(AbstractSettings):
+    # сколько секунд живёт закэшированный ответ каталога, даже если версию никто не поднял
+    catalog_ttl: float = 30.0
+    catalog_max_entries: int = 512
+    # роль и бан пользователя для check_for_auth
+    principal_ttl: float = 30.0
+    principal_max_entries: int = 10000
+    # init_data, уже проверенные при входе, -> выданные токены (повторный вход без HMAC и БД)
+    login_ttl: float = 60.0
+    login_max_entries: int = 10000
+    # пользователи, которых уже видели при входе: ensure_user для них не вызываем
+    known_user_ttl: float = 3600.0
+    known_user_max_entries: int = 50000
+
+
+class HistorySettings(AbstractSettings):
+    # записи user_history копятся в памяти и пишутся одним INSERT
+    batch_size: int = 200
+    flush_interval: float = 1.0
+    # при переполнении буфера запрос сам дожидается сброса
+    max_buffer: int = 10000
+    # писать сразу, без буфера (тесты, скрипты)
+    sync: bool = False
+    # сколько раз пытаться сбросить остаток при остановке приложения
+    shutdown_retries: int = 3
+
+
+class InactivitySettings(AbstractSettings):
+    # сколько заказов напоминание/автоотмена забирают за один запрос
+    batch_size: int = 500
+    # сколько напоминаний одновременно уходит в Telegram
+    send_concurrency: int = 20
+
+
+class UploadSettings(AbstractSettings):
+    images_dir: str = "/app/upload"
+    # больше — 413 ещё до записи на диск (nginx пропускает до 50M)
+    max_size: int = 20 * 1024 * 1024
+    # файл копируется кусками — столько памяти занимает одна загрузка
+    chunk_size: int = 64 * 1024
+    # как часто удалять файлы без ссылок в БД, секунды; 0 — не удалять
+    gc_interval: int = 24 * 3600
+    # файлы моложе не удаляются: их путь могли ещё не сохранить
+    gc_min_age: int = 3600
+    # процессы, сжимающие картинки товаров в WebP-варианты
+    variant_workers: int = 2
+    variant_quality: int = 80
+    # сколько клиент кэширует файлы со старыми (не контентными) именами
+    cache_max_age: int = 24 * 3600
+    # internal-location nginx (например "/_upload/"): файлы отдаёт nginx через X-Accel-Redirect; "" — сами
+    accel_redirect_prefix: str = ""
+
+
+class LoggingSettings(AbstractSettings):
+    level: str = "INFO"
+    # одна JSON-строка на запись вместо текста
+    json_format: bool = False
+    # писать тяжёлые данные (модели, списки, init data) целиком, а не сводкой
+    debug_payloads: bool = False
+    # доля записей ниже WARNING, которую оставляем, по имени логгера или его префиксу
+    sample_rates: dict[str, float] = {}
+
+
 class Settings(AbstractSettings):
     db: DBSettings
     jwt: JwtSettings
 
     bot: BotSettings
     web: WebAppSettings
+    cache: CacheSettings
+    history: HistorySettings
+    inactivity: InactivitySettings
+    upload: UploadSettings
+    logging: LoggingSettings
 
     debug: bool = True
 
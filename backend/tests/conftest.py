@@ -1,6 +1,7 @@
 import os
 import sys
-from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, replace
 from uuid import uuid4
 import pytest
 
@@ -58,6 +59,12 @@ class FakeProduct:
         }
 
 
+@dataclass
+class FakeReservation:
+    before: FakeProduct
+    after: FakeProduct
+
+
 class FakeOrderRepo:
     def __init__(self, order: FakeOrder, return_copy: bool = False):
         self._order = order
@@ -94,6 +101,7 @@ class FakeProductRepo:
     def __init__(self, product: FakeProduct):
         self._product = product
         self.updated = []
+        self.released = []
 
     async def get(self, _):
         return self._product
@@ -105,6 +113,41 @@ class FakeProductRepo:
             self._product.status = dto.status
         self.updated.append(dto)
 
+    async def reserve_unit(self, _pid):
+        if self._product.remaining_products <= 0:
+            return None
+        before = replace(self._product)
+        # тот же класс enum, что передал тест (backend.* и корневой импорт — разные модули)
+        statuses = type(self._product.status)
+        self._product.remaining_products -= 1
+        if self._product.remaining_products == 0:
+            self._product.status = statuses.ARCHIVED
+        return FakeReservation(before=before, after=replace(self._product))
+
+    async def release_unit(self, _pid, status=None):
+        self.released.append((_pid, status))
+        statuses = type(self._product.status)
+        self._product.remaining_products += 1
+        if status is not None:
+            self._product.status = status
+        elif self._product.status == statuses.ARCHIVED:
+            self._product.status = statuses.ACTIVE
+
+
+class FakeUnitOfWork:
+    def __init__(self):
+        self.committed = 0
+        self.rolled_back = 0
+
+    @asynccontextmanager
+    async def begin(self):
+        try:
+            yield
+        except BaseException:
+            self.rolled_back += 1
+            raise
+        self.committed += 1
+
 
 class DummyNotification:
     async def send_order_progress_reminder(self, *_):
@@ -155,11 +198,17 @@ class SpyHistory:
     async def create(self, dto):
         self.actions.append(dto.action)
 
+    async def create_many(self, dtos):
+        self.actions.extend(dto.action for dto in dtos)
+
 
 class FakeUserHistoryRepo:
     async def create(self, *_args, **_kwargs):
         return None
 
+    async def create_many(self, *_args, **_kwargs):
+        return None
+
 
 @pytest.fixture
 def order_factory():
@@ -266,6 +315,7 @@ def order_service_factory():
             notification_service=notification,
             user_repository=user_repo,
             user_history_repository=user_history_repo,
+            unit_of_work=FakeUnitOfWork(),
         )
         if unique_code is not None:
             async def _fixed_code() -> str:
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from domain.models.cached_response import CachedResponse
+from services.catalog_cache import CatalogCache
+
+
+@pytest.mark.asyncio
+async def test_waiters_reload_when_leader_is_cancelled():
+    cache = CatalogCache(ttl=60, maxsize=10)
+    started = asyncio.Event()
+    calls = 0
+
+    async def slow_loader():
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(10)
+
+    async def fast_loader():
+        nonlocal calls
+        calls += 1
+        return CachedResponse.build({"ok": True})
+
+    leader = asyncio.create_task(cache.get_or_load("catalog", slow_loader))
+    await started.wait()
+    waiters = [asyncio.create_task(cache.get_or_load("catalog", fast_loader)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    # клиент ведущего отключился — ждущие не должны получить CancelledError
+    leader.cancel()
+    results = await asyncio.gather(*waiters)
+
+    assert leader.cancelled()
+    assert all(r.body == b'{"ok":true}' for r in results)
+    # после отмены загрузка повторилась ровно один раз
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_waiter_cancellation_does_not_cancel_leader():
+    cache = CatalogCache(ttl=60, maxsize=10)
+    release = asyncio.Event()
+
+    async def loader():
+        await release.wait()
+        return CachedResponse.build([1, 2])
+
+    leader = asyncio.create_task(cache.get_or_load("catalog", loader))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_load("catalog", loader))
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    release.set()
+
+    assert (await leader).body == b"[1,2]"
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
@@ -0,0 +1,128 @@
+import csv
+import io
+import zipfile
+from datetime import date, datetime
+from xml.etree import ElementTree
+
+import pytest
+
+from infrastructure.enums.order_status import OrderStatus
+from utils import export
+from utils.export import ExportFormat, export_rows, stream_csv, stream_xlsx
+
+_NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+async def _rows(rows):
+    for row in rows:
+        yield row
+
+
+async def _collect(chunks) -> list[bytes]:
+    return [chunk async for chunk in chunks]
+
+
+def _sheet_rows(data: bytes) -> list[list[str | None]]:
+    """Значения ячеек листа: inline-строки и числа как текст, пустая ячейка — None."""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        root = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+
+    result = []
+    for row in root.iterfind("s:sheetData/s:row", _NS):
+        cells = []
+        for cell in row.iterfind("s:c", _NS):
+            text = cell.find("s:is/s:t", _NS)
+            value = cell.find("s:v", _NS)
+            cells.append(text.text if text is not None else value.text if value is not None else None)
+        result.append(cells)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_csv_roundtrip_with_special_values():
+    rows = [
+        (1, None, OrderStatus.CASHBACK_PAID, datetime(2025, 1, 2, 3, 4, 5), date(2025, 1, 2)),
+        ("запятая, \"кавычки\"\nи перенос", 2.5, True, "", "ok"),
+    ]
+
+    data = b"".join(await _collect(stream_csv(("a", "b", "c", "d", "e"), _rows(rows))))
+
+    assert data.startswith("\ufeff".encode())
+    parsed = list(csv.reader(io.StringIO(data.decode().removeprefix("\ufeff"))))
+    assert parsed == [
+        ["a", "b", "c", "d", "e"],
+        ["1", "", OrderStatus.CASHBACK_PAID.value, "2025-01-02 03:04:05", "2025-01-02"],
+        ["запятая, \"кавычки\"\nи перенос", "2.5", "True", "", "ok"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_neutralises_formula_cells():
+    rows = [
+        ("=HYPERLINK(\"http://x\")", "+7 999", "-2+3", "@SUM(A1)", "\tcmd", "\rcmd"),
+        (-5, -2.5, "обычный", "a=b", "", None),
+    ]
+
+    data = b"".join(await _collect(stream_csv(("a", "b", "c", "d", "e", "f"), _rows(rows))))
+
+    parsed = list(csv.reader(io.StringIO(data.decode().removeprefix("\ufeff"), newline="")))
+    assert parsed[1:] == [
+        ["'=HYPERLINK(\"http://x\")", "'+7 999", "'-2+3", "'@SUM(A1)", "'\tcmd", "'\rcmd"],
+        # числа — не пользовательский текст, их не трогаем
+        ["-5", "-2.5", "обычный", "a=b", "", ""],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_is_streamed_in_chunks(monkeypatch):
+    monkeypatch.setattr(export, "ROWS_PER_CHUNK", 10)
+
+    chunks = await _collect(stream_csv(("n",), _rows((i,) for i in range(25))))
+
+    # две полные пачки по 10 строк и остаток
+    assert len(chunks) == 3
+    parsed = list(csv.reader(io.StringIO(b"".join(chunks).decode().removeprefix("\ufeff"))))
+    assert parsed == [["n"]] + [[str(i)] for i in range(25)]
+
+
+@pytest.mark.asyncio
+async def test_xlsx_opens_and_keeps_values():
+    rows = [
+        (1, 2.5, None, True),
+        ("<b>&amp;\"'</b>", OrderStatus.CASHBACK_PAID, datetime(2025, 1, 2, 3, 4, 5), "x\x00y\x1fz\tw"),
+    ]
+
+    data = b"".join(await _collect(stream_xlsx(("a", "b", "c", "d"), _rows(rows), sheet='Заказы "Q1"')))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert {"[Content_Types].xml", "_rels/.rels", "xl/workbook.xml",
+                "xl/_rels/workbook.xml.rels", "xl/worksheets/sheet1.xml"} <= set(archive.namelist())
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    assert workbook.find("s:sheets/s:sheet", _NS).get("name") == 'Заказы "Q1"'
+
+    assert _sheet_rows(data) == [
+        ["a", "b", "c", "d"],
+        ["1", "2.5", None, "True"],
+        # разметка экранирована, а запрещённые в XML управляющие символы вырезаны (таб остаётся)
+        ["<b>&amp;\"'</b>", OrderStatus.CASHBACK_PAID.value, "2025-01-02 03:04:05", "xyz\tw"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_xlsx_with_many_rows(monkeypatch):
+    monkeypatch.setattr(export, "ROWS_PER_CHUNK", 50)
+
+    chunks = await _collect(export_rows(ExportFormat.XLSX, ("n", "name"), _rows((i, f"row {i}") for i in range(500))))
+
+    assert len(chunks) > 2
+    rows = _sheet_rows(b"".join(chunks))
+    assert len(rows) == 501
+    assert rows[-1] == ["499", "row 499"]
+
+
+@pytest.mark.asyncio
+async def test_xlsx_empty_export_has_header_only():
+    rows = _sheet_rows(b"".join(await _collect(stream_xlsx(("a",), _rows([])))))
+
+    assert rows == [["a"]]
@@ -0,0 +1,54 @@
+from urllib.parse import quote
+
+import pytest
+from starlette.requests import Request
+
+from routes.utils import content_disposition, file_response
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+
+def _request(headers: dict[str, str] | None = None) -> Request:
+    raw = [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+def test_content_disposition_has_ascii_fallback_and_rfc5987_name():
+    value = content_disposition("attachment", 'отчёт "май".csv')
+
+    assert value == (
+        'attachment; filename="_____ _____.csv"; '
+        f"filename*=UTF-8''{quote('отчёт \"май\".csv', safe='')}"
+    )
+
+
+def test_content_disposition_keeps_ascii_name():
+    assert content_disposition("inline", "a b.png") == "inline; filename=\"a b.png\"; filename*=UTF-8''a%20b.png"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("accel", ["", "/_upload/"])
+async def test_file_response_headers(tmp_path, accel):
+    path = tmp_path / "фото.png"
+    path.write_bytes(PNG)
+
+    response = await file_response(_request(), str(path), "фото.png", "public, max-age=60", accel)
+
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["content-disposition"] == content_disposition("inline", "фото.png")
+    if accel:
+        assert response.headers["x-accel-redirect"] == "/_upload/" + quote("фото.png")
+
+
+@pytest.mark.asyncio
+async def test_file_response_not_modified(tmp_path):
+    path = tmp_path / "a.png"
+    path.write_bytes(PNG)
+    etag = (await file_response(_request(), str(path), "a.png", "no-cache")).headers["etag"]
+
+    response = await file_response(_request({"If-None-Match": etag}), str(path), "a.png", "no-cache")
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
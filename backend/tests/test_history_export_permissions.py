@@ -0,0 +1,72 @@
+from uuid import uuid4
+
+import pytest
+from starlette.requests import Request
+
+import routes.user as user_routes
+from domain.models.principal import Principal
+from infrastructure.enums.user_role import UserRole
+from services.exceptions import PermissionException
+from services.permission import PermissionService
+from utils.export import ExportFormat
+
+
+class PrincipalUserService:
+    def __init__(self, *principals: Principal):
+        self.principals = {p.id: p for p in principals}
+        self.streamed = []
+
+    async def get_principal(self, user_id):
+        return self.principals[user_id]
+
+    def stream_user_history(self, user_id):
+        self.streamed.append(user_id)
+
+        async def empty():
+            return
+            yield
+
+        return empty()
+
+
+def _request(principal: Principal) -> Request:
+    # так запрос приходит из check_for_auth
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [], "state": {"principal": principal}})
+
+
+def _principal(role: UserRole) -> Principal:
+    return Principal(id=uuid4(), role=role, is_banned=False)
+
+
+@pytest.fixture
+def users(monkeypatch):
+    owner, other, moderator = _principal(UserRole.USER), _principal(UserRole.USER), _principal(UserRole.MODERATOR)
+    service = PrincipalUserService(owner, other, moderator)
+    monkeypatch.setattr(user_routes, "get_user_service", lambda: service)
+    return service, owner, other, moderator
+
+
+@pytest.mark.asyncio
+async def test_other_user_cannot_export_history(users):
+    service, owner, other, _ = users
+
+    # PermissionException middleware отдаёт как 403
+    with pytest.raises(PermissionException):
+        await user_routes.export_user_history(
+            owner.id, _request(other), ExportFormat.CSV, permission_service=PermissionService(service),
+        )
+    assert service.streamed == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("caller", ["owner", "moderator"])
+async def test_owner_and_moderator_can_export_history(users, caller):
+    service, owner, _, moderator = users
+    principal = owner if caller == "owner" else moderator
+
+    response = await user_routes.export_user_history(
+        owner.id, _request(principal), ExportFormat.CSV, permission_service=PermissionService(service),
+    )
+
+    assert response.status_code == 200
+    assert service.streamed == [owner.id]
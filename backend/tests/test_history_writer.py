@@ -0,0 +1,49 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from domain.dto.user_history import CreateUserHistoryDTO
+from infrastructure.enums.action import Action
+from services.history_writer import HistoryWriter
+
+
+class FlakyHistoryRepo:
+    def __init__(self):
+        self.down = True
+        self.written = []
+
+    async def create_many(self, dtos):
+        if self.down:
+            raise RuntimeError("db is down")
+        self.written.extend(dtos)
+
+
+def _record() -> CreateUserHistoryDTO:
+    return CreateUserHistoryDTO(
+        user_id=uuid4(),
+        creator_id=None,
+        product_id=uuid4(),
+        action=Action.PRODUCT_CHANGED,
+        date=datetime.now(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_buffer_is_capped_while_db_is_down():
+    repo = FlakyHistoryRepo()
+    writer = HistoryWriter(user_history_repository=repo, batch_size=2, max_buffer=5, flush_interval=3600)
+    writer.start()
+
+    records = [_record() for _ in range(12)]
+    for record in records:
+        await writer.write(record)
+
+    # самые старые записи отброшены, буфер не вышел за предел
+    assert len(writer._buffer) <= 5
+    assert writer._buffer == records[-len(writer._buffer):]
+
+    repo.down = False
+    await writer.close()
+    assert repo.written == records[-len(repo.written):]
+    assert writer._buffer == []
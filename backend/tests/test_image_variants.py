@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from services.image_variants import ImageVariantService
+
+
+class RecordingVariantService(ImageVariantService):
+    def __init__(self, fail: bool = False):
+        super().__init__(images_dir="/nonexistent")
+        self._pool = object()  # пул «запущен», сам render подменён
+        self.fail = fail
+        self.rendered: list[str] = []
+        self.release = asyncio.Event()
+
+    async def render(self, path: str) -> list[str]:
+        self.rendered.append(path)
+        await self.release.wait()
+        if self.fail:
+            raise ValueError("not an image")
+        return [path]
+
+
+@pytest.mark.asyncio
+async def test_schedule_renders_missing_variants_once_per_path():
+    service = RecordingVariantService()
+
+    # несколько промахов /upload по вариантам одной картинки
+    for _ in range(3):
+        service.schedule("abc.jpg")
+    await asyncio.sleep(0)
+    assert service.rendered == ["abc.jpg"]
+
+    service.release.set()
+    await asyncio.gather(*service._tasks)
+
+    # после завершения задача снова ставится, например после рестарта
+    service.schedule("abc.jpg")
+    await asyncio.gather(*service._tasks)
+    assert service.rendered == ["abc.jpg", "abc.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_schedule_does_not_retry_failed_path_right_away():
+    service = RecordingVariantService(fail=True)
+    service.release.set()
+
+    service.schedule("notes.txt")
+    await asyncio.gather(*service._tasks)
+    service.schedule("notes.txt")
+    await asyncio.sleep(0)
+
+    assert service.rendered == ["notes.txt"]
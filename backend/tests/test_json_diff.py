@@ -0,0 +1,101 @@
+from utils.json_diff import CONTEXT_KEYS, apply_patch, diff_snapshots, reconstruct
+
+
+def _product(**changes) -> dict:
+    product = {
+        "id": "p1",
+        "name": "Кроссовки",
+        "status": "active",
+        "price": 100,
+        "tags": ["shoes", "sale"],
+        "seller": {"id": "s1", "nickname": "shop", "contacts": {"tg": "@shop", "phone": None}},
+    }
+    product.update(changes)
+    return product
+
+
+def test_roundtrip_nested_dicts_and_lists():
+    before = _product()
+    after = _product(
+        price=90,
+        tags=["shoes"],
+        seller={"id": "s1", "nickname": "shop", "contacts": {"tg": "@new_shop", "phone": None}},
+    )
+
+    backward, forward = diff_snapshots(before, after)
+
+    assert apply_patch(before, forward) == after
+    assert apply_patch(after, backward) == before
+    # вложенный словарь — только изменённая ветка, список — целиком
+    assert forward["seller"] == {"contacts": {"tg": "@new_shop"}}
+    assert forward["tags"] == ["shoes"]
+    assert "nickname" not in forward["seller"]
+
+
+def test_unchanged_fields_are_dropped_but_context_keys_kept():
+    backward, forward = diff_snapshots(_product(), _product(price=90))
+
+    assert forward == {"id": "p1", "name": "Кроссовки", "status": "active", "price": 90}
+    assert backward == {"id": "p1", "name": "Кроссовки", "status": "active", "price": 100}
+    # step нет ни в одном снимке — в патч его не добавляем
+    assert "step" in CONTEXT_KEYS and "step" not in forward
+
+
+def test_deleted_key_becomes_null():
+    before = _product(note="hello")
+    after = _product()
+
+    backward, forward = diff_snapshots(before, after)
+
+    # удаление ключа хранится как null: патч не отличает «удалили» от «обнулили»
+    assert forward["note"] is None
+    assert apply_patch(before, forward) == {**after, "note": None}
+    assert apply_patch(after, backward) == before
+
+
+def test_added_key_is_nulled_by_backward_patch():
+    before = _product()
+    after = _product(note="hello")
+
+    backward, forward = diff_snapshots(before, after)
+
+    assert apply_patch(before, forward) == after
+    assert apply_patch(after, backward) == {**before, "note": None}
+
+
+def test_dict_replaced_by_scalar_and_back():
+    before = _product(meta={"a": 1})
+    after = _product(meta="plain")
+
+    backward, forward = diff_snapshots(before, after)
+
+    assert apply_patch(before, forward) == after
+    assert apply_patch(after, backward) == before
+
+
+def test_single_snapshot_is_kept_as_is():
+    created = _product()
+
+    assert diff_snapshots(None, created) == (None, created)
+    assert diff_snapshots(created, None) == (created, None)
+
+
+def test_apply_patch_does_not_mutate_state():
+    state = _product()
+    snapshot = _product()
+
+    apply_patch(state, {"seller": {"contacts": {"tg": "@x"}}, "price": 1})
+
+    assert state == snapshot
+
+
+def test_reconstruct_walks_history_backwards():
+    v1 = _product()
+    v2 = _product(price=90)
+    v3 = _product(price=90, status="archived", seller={"id": "s2", "nickname": "other", "contacts": {}})
+
+    backward_12, _ = diff_snapshots(v1, v2)
+    backward_23, _ = diff_snapshots(v2, v3)
+
+    assert reconstruct(v3, [backward_23]) == v2
+    assert reconstruct(v3, [backward_23, backward_12]) == v1
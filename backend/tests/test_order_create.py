@@ -4,6 +4,7 @@ import pytest
 
 from domain.dto import CreateOrderDTO
 from infrastructure.enums.product_status import ProductStatus
+from infrastructure.repositories.exceptions import NotFoundException
 
 
 @pytest.mark.asyncio
@@ -45,3 +46,90 @@ async def test_create_order_happy_path_decrements_and_archives_on_zero(order_ser
     assert len(ord_repo.created) == 1
     assert prod_repo._product.remaining_products == 0
     assert prod_repo._product.status == ProductStatus.ARCHIVED
+
+
+@pytest.mark.asyncio
+async def test_create_order_bumps_catalog_version(order_service_factory, product_factory, product_repo_factory,
+                                                  order_repo_factory, order_factory,
+                                                  dummy_notification, dummy_user_repo, patch_history_fake):
+    product = product_factory(remaining=2, status=ProductStatus.ACTIVE)
+    prod_repo = product_repo_factory(product)
+    ord_repo = order_repo_factory(order_factory(status=None, step=0))
+    svc = order_service_factory(ord_repo, prod_repo, dummy_notification, dummy_user_repo, unique_code="ABC123")
+
+    version = svc.catalog_cache.version
+    dto = CreateOrderDTO(user_id=uuid4(), product_id=uuid4(), seller_id=uuid4(), step=0)
+    await svc.create_order(dto)
+
+    assert svc.catalog_cache.version == version + 1
+
+
+@pytest.mark.asyncio
+async def test_create_order_rolls_back_when_insert_fails(order_service_factory, product_factory,
+                                                         product_repo_factory, order_repo_factory, order_factory,
+                                                         dummy_notification, dummy_user_repo, spy_history):
+    product = product_factory(remaining=1, status=ProductStatus.ACTIVE)
+    prod_repo = product_repo_factory(product)
+    ord_repo = order_repo_factory(order_factory(status=None, step=0))
+
+    async def _broken_create(_dto):
+        raise RuntimeError("insert failed")
+    ord_repo.create = _broken_create
+
+    svc = order_service_factory(ord_repo, prod_repo, dummy_notification, dummy_user_repo,
+                                user_history_repo=spy_history, unique_code="ABC123")
+    dto = CreateOrderDTO(user_id=uuid4(), product_id=uuid4(), seller_id=uuid4(), step=0)
+
+    with pytest.raises(RuntimeError):
+        await svc.create_order(dto)
+
+    # резерв и заказ в одной транзакции: она откатывается целиком, история не пишется
+    assert svc.unit_of_work.rolled_back == 1
+    assert svc.unit_of_work.committed == 0
+    assert spy_history.actions == []
+
+
+@pytest.mark.asyncio
+async def test_create_order_history_is_buffered_until_flush(order_service_factory, product_factory,
+                                                            product_repo_factory, order_repo_factory, order_factory,
+                                                            dummy_notification, dummy_user_repo, spy_history):
+    from services.history_writer import HistoryWriter
+
+    product = product_factory(remaining=1, status=ProductStatus.ACTIVE)
+    prod_repo = product_repo_factory(product)
+    ord_repo = order_repo_factory(order_factory(status=None, step=0))
+    svc = order_service_factory(ord_repo, prod_repo, dummy_notification, dummy_user_repo, unique_code="ABC123")
+
+    writer = HistoryWriter(user_history_repository=spy_history, flush_interval=3600)
+    writer.start()
+    svc.history_writer = writer
+
+    dto = CreateOrderDTO(user_id=uuid4(), product_id=uuid4(), seller_id=uuid4(), step=0)
+    await svc.create_order(dto)
+
+    # заказ создан, а история ещё в буфере
+    assert spy_history.actions == []
+
+    await writer.close()
+    assert len(spy_history.actions) == 3
+
+
+@pytest.mark.asyncio
+async def test_create_order_missing_product_raises_not_found(order_service_factory, product_factory, product_repo_factory,
+                                                             order_repo_factory, order_factory,
+                                                             dummy_notification, dummy_user_repo, patch_history_fake):
+    prod_repo = product_repo_factory(product_factory(remaining=1, status=ProductStatus.ACTIVE))
+
+    async def _missing(_pid):
+        raise NotFoundException
+
+    prod_repo.reserve_unit = _missing
+    ord_repo = order_repo_factory(order_factory(status=None, step=0))
+    svc = order_service_factory(ord_repo, prod_repo, dummy_notification, dummy_user_repo, unique_code="ABC123")
+
+    dto = CreateOrderDTO(user_id=uuid4(), product_id=uuid4(), seller_id=uuid4(), step=0)
+
+    # не 409 «закончился»: роут превращает это в 404
+    with pytest.raises(NotFoundException):
+        await svc.create_order(dto)
+    assert ord_repo.created == []
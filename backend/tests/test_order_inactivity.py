@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from domain.models.order_reminder import OrderReminder
+from tests.conftest import FakeUnitOfWork, FakeUserHistoryRepo, DummyUserRepo
+from services.order import OrderService
+
+
+def _reminder() -> OrderReminder:
+    return OrderReminder(order_id=uuid4(), user_id=uuid4(), product_id=uuid4(),
+                         telegram_id=1, step=0, reminded_at=datetime.now())
+
+
+class FakeInactiveOrderRepo:
+    def __init__(self, due: list[OrderReminder], stale: int = 0):
+        self.due = due
+        self.stale = stale
+        self.released = []
+
+    async def claim_reminders(self, _cutoff, limit):
+        batch, self.due = self.due[:limit], self.due[limit:]
+        return batch
+
+    async def release_reminders(self, reminders):
+        self.released.extend(reminders)
+
+    async def cancel_inactive(self, _cutoff, limit):
+        count = min(limit, self.stale)
+        self.stale -= count
+        return [uuid4() for _ in range(count)]
+
+
+class FlakyNotification:
+    def __init__(self, fail_every: int):
+        self.fail_every = fail_every
+        self.batches = []
+
+    async def send_order_progress_reminders(self, reminders):
+        self.batches.append(len(reminders))
+        return reminders[::self.fail_every]
+
+
+def _service(order_repo, notification) -> OrderService:
+    return OrderService(
+        order_repository=order_repo,
+        product_repository=None,
+        notification_service=notification,
+        user_repository=DummyUserRepo(),
+        user_history_repository=FakeUserHistoryRepo(),
+        unit_of_work=FakeUnitOfWork(),
+        inactivity_batch_size=2,
+    )
+
+
+@pytest.mark.asyncio
+async def test_reminders_are_sent_in_batches_and_failures_released():
+    due = [_reminder() for _ in range(5)]
+    repo = FakeInactiveOrderRepo(due)
+    notification = FlakyNotification(fail_every=2)
+    svc = _service(repo, notification)
+
+    now = datetime.now()
+    await svc.process_inactive_orders(now - timedelta(days=3), now - timedelta(days=1))
+
+    assert notification.batches == [2, 2, 1]
+    # неотправленные возвращаются в очередь один раз, после всех пачек
+    assert len(repo.released) == 3
+
+
+@pytest.mark.asyncio
+async def test_cancel_inactive_runs_until_drained_and_bumps_catalog():
+    repo = FakeInactiveOrderRepo([], stale=5)
+    svc = _service(repo, FlakyNotification(fail_every=1))
+
+    version = svc.catalog_cache.version
+    now = datetime.now()
+    await svc.process_inactive_orders(now - timedelta(days=3), now - timedelta(days=1))
+
+    assert repo.stale == 0
+    assert svc.catalog_cache.version == version + 1
@@ -7,6 +7,7 @@ from infrastructure.enums.order_status import OrderStatus
 from infrastructure.enums.product_status import ProductStatus
 from infrastructure.enums.user_role import UserRole
 from tests.conftest import DummyNotification
+from utils.ttl_cache import TTLCache
 
 @pytest.mark.asyncio
 async def test_step5_promotes_seller_to_seller_role(order_factory, order_repo_factory,
@@ -24,3 +25,29 @@ async def test_step5_promotes_seller_to_seller_role(order_factory, order_repo_fa
 
     assert any(dto.role == UserRole.SELLER for _, dto in user_repo.updates)
 
+
+
+@pytest.mark.asyncio
+async def test_step5_drops_cached_principal_of_promoted_seller(order_factory, order_repo_factory,
+                                                               spy_user_repo_user, product_factory, product_repo_factory,
+                                                               order_service_factory, patch_history_fake):
+    order = order_factory(status=OrderStatus.CASHBACK_NOT_PAID, step=4)
+    prod = product_factory(seller_id=order.seller_id)
+    svc = order_service_factory(order_repo_factory(order), product_repo_factory(prod), DummyNotification(),
+                                spy_user_repo_user, patch_history_fake)
+    svc.principal_cache = TTLCache(maxsize=10, ttl=60)
+    seller_id = uuid4()
+    spy_user_repo_user.get = lambda _: _user(seller_id)
+    svc.principal_cache.set(seller_id, "stale")
+    svc.principal_cache.set(order.user_id, "other")
+
+    await svc.update_order(order.id, UpdateOrderDTO(step=5))
+
+    # следующий запрос продавца прочитает новую роль из БД, а не старую из кэша
+    assert [uid for uid, dto in spy_user_repo_user.updates if dto.role == UserRole.SELLER] == [seller_id]
+    assert svc.principal_cache.get(seller_id) is None
+    assert svc.principal_cache.get(order.user_id) == "other"
+
+
+async def _user(user_id: UUID):
+    return type("U", (), {"role": UserRole.USER, "id": user_id})()
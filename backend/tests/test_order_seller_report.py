@@ -0,0 +1,58 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from domain.responses.seller_report import SellerReport, ProductConversion
+from infrastructure.enums.order_status import OrderStatus
+from tests.conftest import (
+    FakeOrder, FakeOrderRepo,
+    FakeProduct, FakeProductRepo,
+    DummyNotification, DummyUserRepo,
+)
+
+
+class ReportOrderRepo(FakeOrderRepo):
+    def __init__(self, order: FakeOrder):
+        super().__init__(order)
+        self.report_calls = []
+
+    async def get_seller_report(self, seller_id, date_from=None, date_to=None):
+        self.report_calls.append((seller_id, date_from, date_to))
+        return SellerReport(
+            seller_id=seller_id,
+            date_from=date_from,
+            date_to=date_to,
+            products=[
+                ProductConversion(product_id=uuid4(), orders=4, completed=3, paid=1, cancelled=1),
+                ProductConversion(product_id=None, orders=0, completed=0, paid=0, cancelled=0),
+            ],
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_seller_report_passes_period_and_computes_conversion(order_service_factory):
+    # Arrange
+    seller_id = uuid4()
+    order = FakeOrder(
+        id=uuid4(),
+        product_id=uuid4(),
+        user_id=uuid4(),
+        seller_id=seller_id,
+        status=OrderStatus.CASHBACK_PAID,
+    )
+    repo = ReportOrderRepo(order)
+    svc = order_service_factory(
+        repo,
+        FakeProductRepo(FakeProduct(id=order.product_id, seller_id=seller_id, remaining_products=1, status=None)),
+        DummyNotification(),
+        DummyUserRepo(),
+    )
+    date_from, date_to = datetime(2025, 11, 1), datetime(2025, 12, 1)
+
+    # Act
+    report = await svc.get_seller_report(seller_id, date_from=date_from, date_to=date_to)
+
+    # Assert
+    assert repo.report_calls == [(seller_id, date_from, date_to)]
+    assert [p.conversion for p in report.products] == [0.25, 0.0]
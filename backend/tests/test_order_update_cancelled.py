@@ -39,6 +39,9 @@ async def test_update_order_cancelled_returns_item_to_stock_and_activates_when_a
     await svc.update_order(order.id, UpdateOrderDTO(status=OrderStatus.CANCELLED))
 
     # Assert
+    # остаток возвращается атомарно, а не чтением и записью числа
+    assert prod_repo.released == [(product.id, None)]
+    assert prod_repo.updated == []
     assert prod_repo._product.remaining_products == 1
     assert prod_repo._product.status == ProductStatus.ACTIVE
 
@@ -0,0 +1,68 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from domain.models.product import ProductSearchHit
+from services.product import ProductService
+from utils.cursor import decode_ranked_cursor, encode_keyset_cursor, encode_ranked_cursor
+
+
+class RankedProductRepo:
+    def __init__(self, hits):
+        self.hits = hits
+        self.calls = []
+
+    async def get_active_products(self, limit=100, offset=0, search=None, after=None, ranked=False):
+        self.calls.append({"limit": limit, "offset": offset, "search": search, "after": after, "ranked": ranked})
+        return self.hits[:limit]
+
+
+def make_service(repo) -> ProductService:
+    return ProductService(
+        product_repository=repo,
+        user_repository=None,
+        push_repository=None,
+        user_push_repository=None,
+        notification_service=None,
+        user_history_repository=None,
+        increasing_balance_repository=None,
+        seller_balance_repository=None,
+        catalog_cache=None,
+        unit_of_work=None,
+    )
+
+
+def hit(rank: float) -> ProductSearchHit:
+    return ProductSearchHit.model_construct(id=uuid4(), created_at=datetime(2025, 11, 1), rank=rank)
+
+
+def test_ranked_cursor_roundtrip_keeps_float4_rank():
+    # ts_rank_cd — real; asyncpg отдаёт его как double, и курсор должен вернуть то же значение
+    rank, position, obj_id = 0.0607927106320858, datetime(2025, 11, 1, 12, 30), uuid4()
+
+    assert decode_ranked_cursor(encode_ranked_cursor(rank, position, obj_id)) == (rank, position, obj_id)
+
+
+def test_ranked_cursor_rejects_catalog_cursor():
+    with pytest.raises(ValueError):
+        decode_ranked_cursor(encode_keyset_cursor(datetime(2025, 11, 1), uuid4()))
+
+
+@pytest.mark.asyncio
+async def test_search_products_pages_by_rank_keyset():
+    hits = [hit(0.5), hit(0.3), hit(0.3)]
+    repo = RankedProductRepo(hits)
+    svc = make_service(repo)
+
+    page = await svc.search_products("чехол", limit=2)
+
+    assert page.items == hits[:2]
+    assert repo.calls[-1] == {"limit": 3, "offset": 0, "search": "чехол", "after": None, "ranked": True}
+    assert decode_ranked_cursor(page.next_cursor) == (0.3, hits[1].created_at, hits[1].id)
+
+    repo.hits = hits[2:]
+    last = await svc.search_products("чехол", limit=2, cursor=page.next_cursor)
+
+    assert repo.calls[-1]["after"] == (0.3, hits[1].created_at, hits[1].id)
+    assert last.items == hits[2:] and last.next_cursor is None
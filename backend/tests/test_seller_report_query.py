@@ -0,0 +1,125 @@
+from contextlib import asynccontextmanager
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from infrastructure.enums.order_status import OrderStatus
+from infrastructure.repositories.order import OrderRepository
+
+
+class CannedResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def mappings(self):
+        return self
+
+
+class CannedSession:
+    """Отдаёт заранее заготовленные строки в порядке запросов и запоминает сами запросы."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return CannedResult(self.results.pop(0))
+
+
+def make_repository(*results):
+    session = CannedSession(*results)
+
+    @asynccontextmanager
+    async def session_maker():
+        yield session
+
+    return OrderRepository(session_maker=session_maker), session
+
+
+def render(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_seller_report_maps_grouped_rows():
+    seller_id, product_id = uuid4(), uuid4()
+    # строки в том виде, в каком их возвращает asyncpg: одна строка на пару (статус, шаг)
+    status_rows = [
+        (OrderStatus.CASHBACK_PAID, 7, 3, 450.0),
+        (OrderStatus.CASHBACK_NOT_PAID, 7, 2, 300.0),
+        # заказ без товара: coalesce в запросе дал 0, а не NULL
+        (OrderStatus.PAYMENT_CONFIRMED, 7, 1, 0.0),
+        (OrderStatus.CANCELLED, 2, 4, 600.0),
+        (OrderStatus.CANCELLED, 3, 1, 150.0),
+    ]
+    day_rows = [
+        (datetime(2025, 11, 3), 2, 300.0),
+        (datetime(2025, 11, 5), 1, 150.0),
+    ]
+    product_rows = [
+        {"product_id": product_id, "orders": 10, "completed": 5, "paid": 3, "cancelled": 5, "article": "123", "name": "Чехол"},
+        {"product_id": None, "orders": 1, "completed": 1, "paid": 0, "cancelled": 0, "article": None, "name": None},
+    ]
+    repository, _ = make_repository(status_rows, day_rows, product_rows)
+
+    report = await repository.get_seller_report(seller_id, datetime(2025, 11, 1), datetime(2025, 12, 1))
+
+    assert report.total_orders == 11
+    assert {(s.status, s.count) for s in report.by_status} == {
+        (OrderStatus.CASHBACK_PAID, 3),
+        (OrderStatus.CASHBACK_NOT_PAID, 2),
+        (OrderStatus.PAYMENT_CONFIRMED, 1),
+        (OrderStatus.CANCELLED, 5),
+    }
+    assert [(s.step, s.count) for s in report.by_step] == [(2, 4), (3, 1), (7, 6)]
+    assert report.cashback_pending == 300.0
+    assert [(d.day.isoformat(), d.orders, d.cashback) for d in report.paid_by_day] == [
+        ("2025-11-03", 2, 300.0),
+        ("2025-11-05", 1, 150.0),
+    ]
+    # выплаты считаются по paid_at и могут не совпадать с заказами, созданными в периоде
+    assert report.cashback_paid == 450.0
+    assert [(p.product_id, p.conversion) for p in report.products] == [(product_id, 0.3), (None, 0.0)]
+
+
+@pytest.mark.asyncio
+async def test_seller_report_empty_period():
+    repository, _ = make_repository([], [], [])
+
+    report = await repository.get_seller_report(uuid4())
+
+    assert report.total_orders == 0
+    assert report.by_status == [] and report.by_step == [] and report.products == []
+    assert report.cashback_paid == 0 and report.cashback_pending == 0
+
+
+@pytest.mark.asyncio
+async def test_seller_report_queries_group_and_filter_in_db():
+    repository, session = make_repository([], [], [])
+
+    await repository.get_seller_report(uuid4(), datetime(2025, 11, 1), datetime(2025, 12, 1))
+
+    by_status_step, paid_by_day, products = map(render, session.statements)
+
+    # заказы без товара не теряются, а их кешбэк считается нулём
+    assert "LEFT OUTER JOIN products ON products.id = orders.product_id" in by_status_step
+    assert "sum(coalesce(products.wb_price - products.price, %(coalesce_1)s))" in by_status_step
+    assert "GROUP BY orders.status, orders.step" in by_status_step
+    assert "orders.created_at >= %(created_at_1)s AND orders.created_at < %(created_at_2)s" in by_status_step
+    assert "paid_at" not in by_status_step
+
+    assert "sum(coalesce(products.wb_price - products.price, %(coalesce_1)s))" in paid_by_day
+    assert "orders.paid_at >= %(paid_at_1)s AND orders.paid_at < %(paid_at_2)s" in paid_by_day
+    assert "orders.paid_at IS NOT NULL" in paid_by_day
+    assert "GROUP BY date_trunc(%(date_trunc_1)s, orders.paid_at)" in paid_by_day
+    assert "created_at" not in paid_by_day
+
+    assert "GROUP BY orders.product_id" in products
+    assert "orders.created_at >= %(created_at_1)s" in products
+    assert "LEFT OUTER JOIN products ON products.id = anon_1.product_id" in products
@@ -0,0 +1,40 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+def _encode(values: list) -> str:
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _decode(token: str) -> list:
+    pad = '=' * (-len(token) % 4)
+    return json.loads(base64.urlsafe_b64decode(token + pad))
+
+
+def encode_keyset_cursor(position: datetime, obj_id: UUID) -> str:
+    # (дата, id) последней отданной строки → непрозрачный base64url-токен
+    return _encode([position.isoformat(), str(obj_id)])
+
+
+def decode_keyset_cursor(token: str) -> tuple[datetime, UUID]:
+    try:
+        position, obj_id = _decode(token)
+        return datetime.fromisoformat(position), UUID(obj_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_ranked_cursor(rank: float, position: datetime, obj_id: UUID) -> str:
+    # выдача по релевантности: (rank, дата, id) последней строки; float из json возвращается без потерь
+    return _encode([rank, position.isoformat(), str(obj_id)])
+
+
+def decode_ranked_cursor(token: str) -> tuple[float, datetime, UUID]:
+    try:
+        rank, position, obj_id = _decode(token)
+        return float(rank), datetime.fromisoformat(position), UUID(obj_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
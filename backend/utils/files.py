@@ -0,0 +1,110 @@
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from utils.image_paths import VARIANTS
+
+_EXTENSION = re.compile(r"[a-z0-9]{1,10}")
+# <h[:2]>/<h[2:4]>/<sha256>.<ext>, у вариантов картинок ещё .<вариант>.webp
+_CONTENT_ADDRESSED = re.compile(
+    r"(?P<a>[0-9a-f]{2})/(?P<b>[0-9a-f]{2})/(?P<digest>[0-9a-f]{64})\.[a-z0-9]{1,10}"
+    rf"(?P<variant>\.(?:{'|'.join(VARIANTS)})\.webp)?"
+)
+
+# сигнатура в начале файла -> content-type; всё остальное отдаём как octet-stream
+_SIGNATURES = (
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    (0, b"%PDF-", "application/pdf"),
+    (0, b"BM", "image/bmp"),
+)
+# бренды ISO BMFF (байты 8..12 после "ftyp")
+_FTYP_BRANDS = {
+    b"avif": "image/avif",
+    b"avis": "image/avif",
+    b"heic": "image/heic",
+    b"heix": "image/heic",
+    b"mif1": "image/heif",
+    b"qt  ": "video/quicktime",
+}
+SNIFF_BYTES = 32
+DEFAULT_MEDIA_TYPE = "application/octet-stream"
+
+# сколько описаний файлов держим в памяти процесса
+_INFO_CACHE_SIZE = 4096
+
+
+def content_path(digest: str, filename: Optional[str]) -> str:
+    """Путь в хранилище по sha256; расширение оставляем, по нему файл узнают в каталоге."""
+    extension = os.path.splitext(filename or "")[1][1:].lower()
+    if not _EXTENSION.fullmatch(extension):
+        extension = "bin"
+    return f"{digest[:2]}/{digest[2:4]}/{digest}.{extension}"
+
+
+def is_content_addressed(path: str) -> bool:
+    """Имя выведено из содержимого — по этому пути никогда не появятся другие байты."""
+    match = _CONTENT_ADDRESSED.fullmatch(path)
+    return match is not None and match["digest"].startswith(match["a"] + match["b"])
+
+
+def sniff_media_type(head: bytes) -> str:
+    for offset, signature, media_type in _SIGNATURES:
+        if head.startswith(signature, offset):
+            return media_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp":
+        return _FTYP_BRANDS.get(head[8:12], "video/mp4")
+    return DEFAULT_MEDIA_TYPE
+
+
+@dataclass(frozen=True)
+class FileInfo:
+    size: int
+    mtime: float
+    media_type: str
+    # сильный ETag: sha256 содержимого в кавычках
+    etag: str
+
+
+_info_cache: OrderedDict[tuple[str, int, int], FileInfo] = OrderedDict()
+
+
+def get_file_info(path: str, relative_path: str) -> FileInfo:
+    """
+    Тип и ETag файла. Блокирующая (читает файл) — вызывать через to_thread.
+    Результат кэшируется по (путь, mtime, размер), так что файл читается один раз.
+    """
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    info = _info_cache.get(key)
+    if info is not None:
+        _info_cache.move_to_end(key)
+        return info
+
+    with open(path, "rb") as file:
+        head = file.read(SNIFF_BYTES)
+        match = _CONTENT_ADDRESSED.fullmatch(relative_path)
+        if match is not None and match["variant"] is None:
+            # оригинал в хранилище: хеш уже в имени
+            digest = match["digest"]
+        else:
+            file.seek(0)
+            digest = hashlib.file_digest(file, "sha256").hexdigest()
+
+    info = FileInfo(
+        size=stat.st_size,
+        mtime=stat.st_mtime,
+        media_type=sniff_media_type(head),
+        etag=f'"{digest}"',
+    )
+    _info_cache[key] = info
+    if len(_info_cache) > _INFO_CACHE_SIZE:
+        _info_cache.popitem(last=False)
+    return info
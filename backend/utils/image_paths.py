@@ -0,0 +1,29 @@
+from typing import Optional
+
+# вариант -> наибольшая сторона в пикселях
+VARIANTS = {
+    "thumb": 240,
+    "card": 640,
+    "full": 1600,
+}
+
+
+def variant_path(path: str, variant: str) -> str:
+    """Вариант лежит рядом с оригиналом: <путь оригинала>.<вариант>.webp."""
+    return f"{path}.{variant}.webp"
+
+
+def variant_paths(path: Optional[str]) -> Optional[dict[str, str]]:
+    """Пути всех вариантов картинки; для внешних ссылок и пустого пути — None."""
+    if not path or path.startswith("http"):
+        return None
+    return {variant: variant_path(path, variant) for variant in VARIANTS}
+
+
+def source_path(path: str) -> Optional[str]:
+    """Путь оригинала, если path — вариант; иначе None."""
+    for variant in VARIANTS:
+        suffix = f".{variant}.webp"
+        if path.endswith(suffix):
+            return path[:-len(suffix)]
+    return None
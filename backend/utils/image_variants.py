@@ -0,0 +1,33 @@
+import os
+
+from PIL import Image, ImageOps
+
+from utils.image_paths import VARIANTS, variant_path
+
+_TMP_PREFIX = ".tmp-"
+
+
+def render_variants(source: str, quality: int) -> list[str]:
+    """
+    Выполняется в процессе пула: уменьшает картинку до всех VARIANTS и пишет их в WebP.
+    Уже существующие варианты пропускает. Возвращает имена созданных вариантов.
+    """
+    created = []
+    with Image.open(source) as opened:
+        # фото с телефона часто повёрнуты тегом EXIF, а не пикселями
+        image = ImageOps.exif_transpose(opened)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+        # от большего к меньшему: каждый следующий уменьшаем из предыдущего, а не из оригинала
+        for variant, size in sorted(VARIANTS.items(), key=lambda item: -item[1]):
+            target = variant_path(source, variant)
+            image.thumbnail((size, size), Image.Resampling.LANCZOS)
+            if os.path.exists(target):
+                continue
+
+            tmp = os.path.join(os.path.dirname(target), _TMP_PREFIX + os.path.basename(target))
+            image.save(tmp, "WEBP", quality=quality, method=4)
+            os.replace(tmp, target)
+            created.append(variant)
+    return created
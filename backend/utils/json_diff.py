@@ -0,0 +1,61 @@
+from typing import Any, Iterable, Optional
+
+# поля, которые остаются в обоих снимках даже без изменений — по ним история читается без догрузки объекта
+CONTEXT_KEYS = ('id', 'name', 'status', 'step')
+
+
+def _patch(src: dict, dst: dict) -> dict:
+    """Изменения, превращающие src в dst: только отличающиеся ключи, вложенные словари — рекурсивно."""
+    patch = {}
+    for key in src.keys() | dst.keys():
+        old, new = src.get(key), dst.get(key)
+        if isinstance(old, dict) and isinstance(new, dict):
+            nested = _patch(old, new)
+            if nested:
+                patch[key] = nested
+        elif old != new or (key in src) != (key in dst):
+            patch[key] = new
+    return patch
+
+
+def diff_snapshots(
+        before: Optional[dict],
+        after: Optional[dict],
+) -> tuple[Optional[dict], Optional[dict]]:
+    """
+    Сжимает пару снимков до изменённых полей (плюс CONTEXT_KEYS).
+    json_after — патч «до → после», json_before — обратный патч.
+    Если снимок один (создание, удаление), пара возвращается как есть.
+    """
+    if before is None or after is None:
+        return before, after
+
+    forward = _patch(before, after)
+    backward = _patch(after, before)
+    for key in CONTEXT_KEYS:
+        if key in before and key not in backward:
+            backward[key] = before[key]
+        if key in after and key not in forward:
+            forward[key] = after[key]
+    return backward, forward
+
+
+def apply_patch(state: dict, patch: dict) -> dict:
+    """Новый словарь: state с наложенным patch. None в патче — значение null, а не удаление ключа."""
+    result = dict(state)
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = apply_patch(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+def reconstruct(state: dict, patches: Iterable[dict]) -> dict:
+    """
+    Восстанавливает снимок, накладывая патчи по очереди. Например, состояние товара
+    до правки: текущий снимок и json_before записей истории от новых к старым.
+    """
+    for patch in patches:
+        state = apply_patch(state, patch)
+    return state
@@ -0,0 +1,134 @@
+import json
+import logging
+import random
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+# служебные аргументы logging, всё остальное в вызове — поля записи
+_LOGGING_KWARGS = {'exc_info', 'stack_info', 'stacklevel', 'extra'}
+
+_debug_payloads = False
+
+
+class Payload:
+    """
+    Тяжёлые данные для лога (модели, списки, init data).
+    Строка собирается только при форматировании записи, и целиком —
+    только если включён debug_payloads, иначе пишется краткая сводка.
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __str__(self) -> str:
+        if not _debug_payloads:
+            return self._summary()
+        return json.dumps(_to_jsonable(self.value), ensure_ascii=False, default=str)
+
+    def to_json(self) -> Any:
+        return _to_jsonable(self.value) if _debug_payloads else self._summary()
+
+    def _summary(self) -> str:
+        if isinstance(self.value, (list, tuple, set, dict)):
+            return f'<{type(self.value).__name__} of {len(self.value)}>'
+        return f'<{type(self.value).__name__}>'
+
+
+def _to_jsonable(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    if isinstance(value, (list, tuple, set)):
+        return [_to_jsonable(x) for x in value]
+    if isinstance(value, dict):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    return value
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """
+    logger.info("orders listed", seller_id=seller_id, count=len(orders)):
+    сообщение постоянное, данные — именованными полями. Если уровень
+    выключен, ни поля, ни строка не вычисляются.
+    """
+
+    def process(self, msg, kwargs):
+        fields = {k: kwargs.pop(k) for k in list(kwargs) if k not in _LOGGING_KWARGS}
+        if fields:
+            kwargs['extra'] = {**(kwargs.get('extra') or {}), 'fields': fields}
+        return msg, kwargs
+
+
+def get_logger(name: str) -> StructuredLogger:
+    return StructuredLogger(logging.getLogger(name), {})
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Пропускает только долю записей ниже WARNING для указанных логгеров.
+    Ключ — имя логгера или его префикс ("infrastructure.repositories"), берётся самый длинный.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: dict[str, Optional[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate is None or random.random() < rate
+
+    def _rate(self, name: str) -> Optional[float]:
+        if name not in self._resolved:
+            candidates = [p for p in self.rates if name == p or name.startswith(p + '.')]
+            self._resolved[name] = self.rates[max(candidates, key=len)] if candidates else None
+        return self._resolved[name]
+
+
+class StructuredFormatter(logging.Formatter):
+    """Текст: «сообщение key=value ...»; json: одна строка-объект на запись."""
+
+    def __init__(self, as_json: bool = False):
+        super().__init__('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        self.as_json = as_json
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, 'fields', None) or {}
+        if self.as_json:
+            entry = {
+                'ts': self.formatTime(record),
+                'level': record.levelname,
+                'logger': record.name,
+                'msg': record.getMessage(),
+                **{k: v.to_json() if isinstance(v, Payload) else v for k, v in fields.items()},
+            }
+            if record.exc_info:
+                entry['exc'] = self.formatException(record.exc_info)
+            return json.dumps(entry, ensure_ascii=False, default=str)
+
+        line = super().format(record)
+        if fields:
+            line += ' ' + ' '.join(f'{k}={v}' for k, v in fields.items())
+        return line
+
+
+def setup_logging(
+        level: str = 'INFO',
+        as_json: bool = False,
+        debug_payloads: bool = False,
+        sample_rates: Optional[dict[str, float]] = None,
+) -> None:
+    global _debug_payloads
+    _debug_payloads = debug_payloads
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(StructuredFormatter(as_json=as_json))
+    if sample_rates:
+        handler.addFilter(SamplingFilter(sample_rates))
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
@@ -19,6 +19,8 @@ interface Product {
     payment_time: string;
     review_requirements: string;
     image_path?: string;
+    // уменьшенные WebP-копии image_path (пути относительно /upload)
+    image_variants?: { thumb: string; card: string; full: string } | null;
     seller_id: string;
     created_at: string;
     updated_at: string;
@@ -421,8 +421,9 @@ function CatalogPage() {
                                                     src={
                                                         // product.image_path.startsWith('http')
                                                         //   ? product.image_path :
-                                                        GetUploadLink(product.image_path)
+                                                        GetUploadLink(product.image_variants?.card ?? product.image_path)
                                                     }
+                                                    loading="lazy"
                                                     alt={product.name}
                                                     className="w-full h-full object-cover"
                                                 />
@@ -493,8 +494,9 @@ function CatalogPage() {
                                                     src={
                                                         product.image_path.startsWith('http')
                                                             ? product.image_path
-                                                            : GetUploadLink(product.image_path)
+                                                            : GetUploadLink(product.image_variants?.card ?? product.image_path)
                                                     }
+                                                    loading="lazy"
                                                     alt={product.name}
                                                     className="w-full h-full object-cover"
                                                 />
@@ -186,6 +186,8 @@ export default function ModeratorUserDetailPage() {
 
     const [history, setHistory] = useState<UserHistory[]>([]);
     const [historyLoading, setHistoryLoading] = useState(true);
+    const [historyCursor, setHistoryCursor] = useState<string | null>(null);
+    const [historyMoreLoading, setHistoryMoreLoading] = useState(false);
     const [balanceHistory, setBalanceHistory] = useState<BalanceHistory[]>([]);
 
     const [creatorMap, setCreatorMap] = useState<Record<string, { nickname: string; role: UserRole }>>({});
@@ -742,11 +744,28 @@ export default function ModeratorUserDetailPage() {
         if (!userId) return;
         setHistoryLoading(true);
         getUserHistory(userId)
-            .then(res => setHistory(res.data || []))
+            .then(res => {
+                setHistory(res.data || []);
+                setHistoryCursor(res.headers['x-next-cursor'] ?? null);
+            })
             .catch(console.error)
             .finally(() => setHistoryLoading(false));
     }, [userId]);
 
+    const loadMoreHistory = async () => {
+        if (!userId || !historyCursor) return;
+        setHistoryMoreLoading(true);
+        try {
+            const res = await getUserHistory(userId, historyCursor);
+            setHistory(prev => [...prev, ...(res.data || [])]);
+            setHistoryCursor(res.headers['x-next-cursor'] ?? null);
+        } catch (e) {
+            console.error(e);
+        } finally {
+            setHistoryMoreLoading(false);
+        }
+    };
+
 
     if (loading || !user) return <div className="fixed inset-0 z-50 flex items-center justify-center">
         <div className="h-10 w-10 rounded-full border-4 border-gray-300 border-t-gray-600 always-spin"/>
@@ -1454,6 +1473,18 @@ export default function ModeratorUserDetailPage() {
                 </Collapsible>
             )}
 
+            {historyCursor && !historyLoading && (
+                <div className="flex justify-center">
+                    <button
+                        onClick={loadMoreHistory}
+                        disabled={historyMoreLoading}
+                        className="px-3 py-1 rounded border border-gray-300 hover:bg-gray-50 text-sm disabled:opacity-50"
+                    >
+                        {historyMoreLoading ? 'Загрузка…' : 'Загрузить более раннюю историю'}
+                    </button>
+                </div>
+            )}
+
 
             {imgOpen && imgSrc && (
                 <div className="fixed inset-0 z-[60] flex items-center justify-center bg-black/60">
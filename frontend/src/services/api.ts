@@ -442,8 +442,11 @@ export async function resolveDeeplink(startParam: string) {
     });
 }
 
-export function getUserHistory(userId: string) {
-    return apiClient.get(`/users/${userId}/history`);
+export function getUserHistory(userId: string, cursor?: string) {
+    // страницы от новых к старым; курсор следующей — в заголовке X-Next-Cursor
+    return apiClient.get(`/users/${userId}/history`, {
+        params: cursor ? {cursor} : undefined,
+    });
 }
 
 export function getUserBalanceHistory(userId: string) {
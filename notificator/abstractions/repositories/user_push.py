@@ -4,7 +4,7 @@ from typing import Optional
 from uuid import UUID
 
 from abstractions.repositories import CRUDRepositoryInterface
-from domain.dto.user_push import CreateUserPushDTO, UpdateUserPushDTO
+from domain.dto.user_push import CreateUserPushDTO, UpdateUserPushDTO, UserPushStatusDTO
 from domain.models.user_push import UserPush
 from infrastructure.db.enums.push_status import PushStatus
 
@@ -14,7 +14,18 @@ class UserPushRepositoryInterface(
     ABC,
 ):
     @abstractmethod
-    async def get_queued_pushes(self, size: int = 10) -> list[UserPush]:
+    async def claim_queued_pushes(self, size: int = 10) -> list[UserPush]:
+        """Забирает пачку PLANNED-пушей и переводит их в IN_PROGRESS."""
+        ...
+
+    @abstractmethod
+    async def set_statuses(self, updates: list[UserPushStatusDTO]) -> None:
+        """Применяет итоги доставки пачкой."""
+        ...
+
+    @abstractmethod
+    async def requeue_stale(self, older_than: datetime) -> int:
+        """Возвращает в очередь пуши, застрявшие в IN_PROGRESS после падения реплики."""
         ...
 
     @abstractmethod
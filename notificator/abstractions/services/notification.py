@@ -7,3 +7,7 @@ class NotificationServiceInterface(ABC):
     @abstractmethod
     async def send_notification(self, notification: UserPush) -> None:
         ...
+
+    @abstractmethod
+    async def close(self) -> None:
+        ...
@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+
+class RateLimiterInterface(ABC):
+    @abstractmethod
+    async def acquire(self, chat_id: int) -> None:
+        """Ждёт, пока можно отправить сообщение в этот чат, не нарушая лимиты бота."""
+        ...
+
+    @abstractmethod
+    def pause(self, seconds: float) -> None:
+        """Останавливает все отправки на время, которое Telegram вернул в retry_after."""
+        ...
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+
+from domain.dto.user_push import UserPushStatusDTO
+
+
+class StatusWriterInterface(ABC):
+    @abstractmethod
+    async def write(self, dto: UserPushStatusDTO) -> None:
+        """Ставит итог доставки в очередь на запись."""
+        ...
+
+    @abstractmethod
+    async def flush(self) -> None:
+        """Записывает всё накопленное."""
+        ...
+
+    @abstractmethod
+    def start(self) -> None:
+        ...
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Останавливает фоновую запись и сбрасывает остаток буфера."""
+        ...
@@ -2,9 +2,14 @@ from abstractions.services.consumer import ConsumerInterface
 from dependencies.repositories.user_push import get_user_push_repository
 from dependencies.services.notification import get_notificator
 from services.consumer import Consumer
+from settings import settings
 
 
 def get_consumer() -> ConsumerInterface:
     return Consumer(
         notification_repository=get_user_push_repository(),
+        workers=settings.delivery.workers,
+        batch_size=settings.delivery.batch_size,
+        stale_after=settings.delivery.stale_after,
+        requeue_interval=settings.delivery.requeue_interval,
     )
@@ -1,5 +1,6 @@
 from abstractions.services.notification import NotificationServiceInterface
-from dependencies.repositories.user_push import get_user_push_repository
+from dependencies.services.rate_limiter import get_rate_limiter
+from dependencies.services.status_writer import get_status_writer
 from services.notification import Notificator
 from settings import settings
 
@@ -7,5 +8,9 @@ from settings import settings
 def get_notificator() -> NotificationServiceInterface:
     return Notificator(
         token=settings.bot.token,
-        notifications_repository=get_user_push_repository(),
+        status_writer=get_status_writer(),
+        rate_limiter=get_rate_limiter(),
+        max_retries=settings.delivery.max_retries,
+        http2=settings.delivery.http2,
+        max_connections=settings.delivery.max_connections,
     )
@@ -0,0 +1,14 @@
+from abstractions.services.rate_limiter import RateLimiterInterface
+from services.rate_limiter import TelegramRateLimiter
+from settings import settings
+
+# лимиты Telegram считаются на бота, поэтому в процессе один ограничитель на всех воркеров
+_rate_limiter = TelegramRateLimiter(
+    global_rate=settings.delivery.global_rate,
+    global_burst=settings.delivery.global_burst,
+    per_chat_interval=settings.delivery.per_chat_interval,
+)
+
+
+def get_rate_limiter() -> RateLimiterInterface:
+    return _rate_limiter
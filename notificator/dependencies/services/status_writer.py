@@ -0,0 +1,15 @@
+from abstractions.services.status_writer import StatusWriterInterface
+from dependencies.repositories.user_push import get_user_push_repository
+from services.status_writer import StatusWriter
+from settings import settings
+
+# один буфер на процесс — его делят все воркеры
+_status_writer = StatusWriter(
+    user_push_repository=get_user_push_repository(),
+    batch_size=settings.delivery.status_batch_size,
+    flush_interval=settings.delivery.status_flush_interval,
+)
+
+
+def get_status_writer() -> StatusWriterInterface:
+    return _status_writer
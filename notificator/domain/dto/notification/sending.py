@@ -15,3 +15,5 @@ class SendMessageDto(BaseModel):
 class MessageSendingResultDto(BaseModel):
     sent_at: Optional[datetime] = None
     error: Optional[str] = None
+    # Telegram ответил 429 — через сколько секунд можно повторить
+    retry_after: Optional[float] = None
@@ -2,6 +2,8 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
+from pydantic import BaseModel
+
 from infrastructure.db.enums.push_status import PushStatus
 from .abstract import CreateDTO, UpdateDTO
 from domain.models import User, Push
@@ -19,3 +21,10 @@ class UpdateUserPushDTO(UpdateDTO):
     user_id: Optional[UUID] = None
     sent_at: Optional[datetime] = None
     status: Optional[PushStatus] = None
+
+
+class UserPushStatusDTO(BaseModel):
+    # итог доставки одного пуша; sent_at только для DELIVERED
+    user_push_id: UUID
+    status: PushStatus
+    sent_at: Optional[datetime] = None
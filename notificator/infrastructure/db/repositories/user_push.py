@@ -3,10 +3,10 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update, values, column, func, cast, DateTime
 
 from abstractions.repositories.user_push import UserPushRepositoryInterface
-from domain.dto.user_push import CreateUserPushDTO, UpdateUserPushDTO
+from domain.dto.user_push import CreateUserPushDTO, UpdateUserPushDTO, UserPushStatusDTO
 from domain.models import UserPush as UserPushModel, User as UserModel, Push as PushModel
 from infrastructure.db.entities import UserPush, User, Push
 from infrastructure.db.enums.push_status import PushStatus
@@ -30,18 +30,95 @@ class UserPushRepository(
                 if sent_at:
                     user_push.sent_at = sent_at
 
-    async def get_queued_pushes(self, size: int = 10) -> list[UserPush]:
-        async with self.session_maker() as session:
-            res = await session.execute(
-                select(self.entity)
-                .where(self.entity.status == PushStatus.PLANNED)
-                .options(*self.options)
-                .order_by(self.entity.created_at)
-                .limit(size)
+    async def claim_queued_pushes(self, size: int = 10) -> list[UserPushModel]:
+        # один запрос: SKIP LOCKED выбирает пачку, UPDATE ... RETURNING переводит её
+        # в IN_PROGRESS, а join подтягивает получателя и текст пуша
+        due = (
+            select(self.entity.id)
+            .where(self.entity.status == PushStatus.PLANNED)
+            .order_by(self.entity.created_at)
+            .limit(size)
+            .with_for_update(skip_locked=True)
+        )
+        claimed = (
+            update(self.entity)
+            .where(self.entity.id.in_(due.scalar_subquery()))
+            .values(status=PushStatus.IN_PROGRESS, updated_at=datetime.now())
+            .returning(
+                self.entity.id,
+                self.entity.push_id,
+                self.entity.user_id,
+                self.entity.sent_at,
+                self.entity.status,
+                self.entity.created_at,
+                self.entity.updated_at,
             )
-            res = res.unique().scalars().all()
+            .cte('claimed')
+        )
+        stmt = (
+            select(claimed, User, Push)
+            .join(User, User.id == claimed.c.user_id)
+            .join(Push, Push.id == claimed.c.push_id)
+            .order_by(claimed.c.created_at)
+        )
+        async with self.session_maker() as session:
+            async with session.begin():
+                rows = (await session.execute(stmt)).all()
 
-        return [self.entity_to_model(x) for x in res]  # noqa
+                return [
+                    UserPushModel(
+                        id=row.id,
+                        push_id=row.push_id,
+                        user_id=row.user_id,
+                        sent_at=row.sent_at,
+                        status=row.status,
+                        user=self._map_user(row.User),
+                        push=self._map_push(row.Push),
+                        created_at=row.created_at,
+                        updated_at=row.updated_at,
+                    )
+                    for row in rows
+                ]
+
+    async def set_statuses(self, updates: list[UserPushStatusDTO]) -> None:
+        # все результаты пачки — одним UPDATE ... FROM (VALUES ...)
+        if not updates:
+            return
+
+        rows = values(
+            column('id', self.entity.id.type),
+            column('status', self.entity.status.type),
+            column('sent_at', DateTime()),
+            name='results',
+        ).data([(dto.user_push_id, dto.status, dto.sent_at) for dto in updates])
+
+        async with self.session_maker() as session:
+            async with session.begin():
+                await session.execute(
+                    update(self.entity)
+                    .where(self.entity.id == rows.c.id)
+                    .values(
+                        status=rows.c.status,
+                        # явный тип: если в пачке одни FAILED, колонка VALUES из NULL — и PG считает её text
+                        sent_at=func.coalesce(cast(rows.c.sent_at, DateTime), self.entity.sent_at),
+                        updated_at=datetime.now(),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+
+    async def requeue_stale(self, older_than: datetime) -> int:
+        async with self.session_maker() as session:
+            async with session.begin():
+                res = await session.execute(
+                    update(self.entity)
+                    .where(
+                        self.entity.status == PushStatus.IN_PROGRESS,
+                        self.entity.updated_at < older_than,
+                    )
+                    .values(status=PushStatus.PLANNED, updated_at=datetime.now())
+                )
+
+        return res.rowcount
 
     def create_dto_to_entity(self, dto: CreateUserPushDTO) -> UserPush:
         return UserPush(
@@ -55,40 +132,42 @@ class UserPushRepository(
         )
 
     def entity_to_model(self, entity: UserPush) -> UserPushModel:
-        def _map_user(user: User) -> UserModel:
-            return UserModel(
-                id=user.id,
-                telegram_id=user.telegram_id,
-                nickname=user.nickname,
-                role=user.role,
-                balance=user.balance,
-                is_banned=user.is_banned,
-                is_seller=user.is_seller,
-                created_at=user.created_at,
-                updated_at=user.updated_at,
-            )
-
-        def _map_push(push: Push) -> PushModel:
-            return PushModel(
-                id=push.id,
-                title=push.title,
-                text=push.text,
-                creator_id=push.creator_id,
-                image_path=push.image_path,
-                button_text=push.button_text,
-                button_link=push.button_link,
-                created_at=push.created_at,
-                updated_at=push.updated_at
-            )
-
         return UserPushModel(
             id=entity.id,
             push_id=entity.push_id,
             user_id=entity.user_id,
             sent_at=entity.sent_at,
             status=entity.status,
-            user=_map_user(entity.user) if entity.user else None,
-            push=_map_push(entity.push) if entity.push else None,
+            user=self._map_user(entity.user) if entity.user else None,
+            push=self._map_push(entity.push) if entity.push else None,
             created_at=entity.created_at,
             updated_at=entity.updated_at
         )
+
+    @staticmethod
+    def _map_user(user: User) -> UserModel:
+        return UserModel(
+            id=user.id,
+            telegram_id=user.telegram_id,
+            nickname=user.nickname,
+            role=user.role,
+            balance=user.balance,
+            is_banned=user.is_banned,
+            is_seller=user.is_seller,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    @staticmethod
+    def _map_push(push: Push) -> PushModel:
+        return PushModel(
+            id=push.id,
+            title=push.title,
+            text=push.text,
+            creator_id=push.creator_id,
+            image_path=push.image_path,
+            button_text=push.button_text,
+            button_link=push.button_link,
+            created_at=push.created_at,
+            updated_at=push.updated_at
+        )
@@ -3,6 +3,7 @@ import logging
 
 from dependencies.services.consumer import get_consumer
 from dependencies.services.notification import get_notificator
+from dependencies.services.status_writer import get_status_writer
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(
@@ -16,6 +17,8 @@ async def main():
 
     consumer = get_consumer()
     notificator = get_notificator()
+    status_writer = get_status_writer()
+    status_writer.start()
 
     logger.info("Service initialized, starting...")
 
@@ -26,6 +29,8 @@ async def main():
     except Exception as e:
         logger.error("Unexpected exception", exc_info=True)
     finally:
+        await status_writer.close()
+        await notificator.close()
         logger.info("Service has been successfully shut down")
 
 
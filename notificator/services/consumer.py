@@ -1,11 +1,15 @@
+import asyncio
 import logging
+import time
 from asyncio import sleep
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from typing import NoReturn
 
 from abstractions.repositories.user_push import UserPushRepositoryInterface
 from abstractions.services.consumer import ConsumerInterface
 from abstractions.services.notification import NotificationServiceInterface
+from domain.models.user_push import UserPush
 
 logger = logging.getLogger(__name__)
 
@@ -13,15 +17,56 @@ logger = logging.getLogger(__name__)
 class Consumer(ConsumerInterface):
     notification_repository: UserPushRepositoryInterface
 
+    # пауза, когда очередь пуста
     global_notification_delay: int = field(default=1)
-    inner_notification_delay: int = field(default=1)
+    workers: int = field(default=16)
+    batch_size: int = field(default=100)
+    stale_after: int = field(default=600)
+    # как часто (сек.) возвращать зависшие IN_PROGRESS в очередь: упавшая реплика
+    # или незаписанный итог доставки не должны ждать перезапуска
+    requeue_interval: float = field(default=60)
 
     async def execute(self, notificator: NotificationServiceInterface) -> NoReturn:
         logger.info("Consumer started")
+
+        # темп задаёт ограничитель в notificator, воркеры лишь держат нужное число отправок в полёте
+        queue: asyncio.Queue[UserPush] = asyncio.Queue(maxsize=self.batch_size)
+        workers = [
+            asyncio.create_task(self._worker(queue, notificator))
+            for _ in range(self.workers)
+        ]
+        next_requeue = 0.0
+        try:
+            while True:
+                if time.monotonic() >= next_requeue:
+                    await self._requeue_stale()
+                    next_requeue = time.monotonic() + self.requeue_interval
+
+                notifications_to_send = await self.notification_repository.claim_queued_pushes(self.batch_size)
+                for notification in notifications_to_send:
+                    # очередь ограничена: не забираем из БД больше, чем успеваем отправить
+                    await queue.put(notification)
+
+                if len(notifications_to_send) < self.batch_size:
+                    await sleep(self.global_notification_delay)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    async def _requeue_stale(self) -> None:
+        requeued = await self.notification_repository.requeue_stale(
+            datetime.now() - timedelta(seconds=self.stale_after),
+        )
+        if requeued:
+            logger.warning(f"Requeued {requeued} stale pushes")
+
+    @staticmethod
+    async def _worker(queue: asyncio.Queue, notificator: NotificationServiceInterface) -> NoReturn:
         while True:
-            notifications_to_send = await self.notification_repository.get_queued_pushes()
-            for notification in notifications_to_send:
+            notification = await queue.get()
+            try:
                 await notificator.send_notification(notification)
-                await sleep(self.inner_notification_delay)
-
-            await sleep(self.global_notification_delay)
+            except Exception:
+                logger.exception(f"Failed to deliver push {notification.id}")
+            finally:
+                queue.task_done()
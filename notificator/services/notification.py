@@ -1,16 +1,19 @@
+import asyncio
 import json
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 import os
 
-from httpx import AsyncClient
+from httpx import AsyncClient, Limits, Response
 
-from abstractions.repositories.user_push import UserPushRepositoryInterface
 from abstractions.services.notification import NotificationServiceInterface
+from abstractions.services.rate_limiter import RateLimiterInterface
+from abstractions.services.status_writer import StatusWriterInterface
 from dependencies.services.upload import get_upload_service
 from domain.dto.notification import SendMessageDto, MessageSendingResultDto
+from domain.dto.user_push import UserPushStatusDTO
 from domain.models.user_push import UserPush
 from infrastructure.db.enums.push_status import PushStatus
 
@@ -20,34 +23,78 @@ logger = logging.getLogger(__name__)
 @dataclass
 class Notificator(NotificationServiceInterface):
     token: str
-    notifications_repository: UserPushRepositoryInterface
+    status_writer: StatusWriterInterface
+    rate_limiter: RateLimiterInterface
+    max_retries: int = 5
+    http2: bool = True
+    max_connections: int = 32
+
+    _client: Optional[AsyncClient] = None
+    # file_id загруженных картинок по image_path пуша — повторно файл не отправляем
+    _photo_file_ids: dict[str, str] = field(default_factory=dict)
+    _photo_locks: dict[str, asyncio.Lock] = field(default_factory=dict)
+
+    @property
+    def client(self) -> AsyncClient:
+        # один пул соединений на процесс вместо нового TCP/TLS на каждое сообщение
+        if self._client is None:
+            limits = Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            )
+            try:
+                self._client = AsyncClient(http2=self.http2, limits=limits, timeout=30)
+            except ImportError:
+                logger.warning("h2 is not installed, falling back to HTTP/1.1")
+                self._client = AsyncClient(limits=limits, timeout=30)
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def send_notification(self, notification: UserPush) -> None:
         async def set_status(status: PushStatus, sent_at: Optional[datetime] = None):
-            await self.notifications_repository.set_status(
+            # статус уходит в буфер, в БД его запишут пачкой
+            await self.status_writer.write(UserPushStatusDTO(
                 user_push_id=notification.id,
                 status=status,
                 sent_at=sent_at,
-            )
-
-        await set_status(PushStatus.IN_PROGRESS)
+            ))
 
+        # в IN_PROGRESS пуш перевели при захвате из очереди
         upload_service = get_upload_service()
         message = SendMessageDto(
             text=notification.push.text,
             chat_id=notification.user.telegram_id,
-            image_path=upload_service.get_filepath(notification.push.image_path),
+            image_path=(
+                upload_service.get_filepath(notification.push.image_path)
+                if notification.push.image_path else None
+            ),
             button_text=notification.push.button_text,
             button_link=notification.push.button_link,
         )
 
-        result = await self._send_message(message)
+        result = await self._send_with_limits(message)
         if result.sent_at:
             await set_status(PushStatus.DELIVERED, datetime.now())
         if result.error:
             await set_status(PushStatus.FAILED)
             logger.error(result.error)
 
+    async def _send_with_limits(self, message: SendMessageDto) -> MessageSendingResultDto:
+        for _ in range(self.max_retries + 1):
+            await self.rate_limiter.acquire(message.chat_id)
+            result = await self._send_message(message)
+            if result.retry_after is None:
+                return result
+
+            # 429 — лимит превышен: ждут все воркеры, а не только этот
+            self.rate_limiter.pause(result.retry_after)
+
+        return MessageSendingResultDto(error=f"Too many requests, gave up after {self.max_retries} retries")
+
     async def _send_message(self, message: SendMessageDto) -> MessageSendingResultDto:
         try:
             reply_markup = None
@@ -56,34 +103,69 @@ class Notificator(NotificationServiceInterface):
                 inline_keyboard = [[{"text": message.button_text, "web_app": {"url": message.button_link}}]]
                 reply_markup = json.dumps({"inline_keyboard": inline_keyboard})
 
-            async with AsyncClient() as client:
-                if message.image_path:
-                    with open(message.image_path, "rb") as image_file:
-                        filename = os.path.basename(message.image_path)
-                        files = {
-                            "photo": (filename, image_file, "application/octet-stream")
-                        }
-                        data = {
-                            "chat_id": message.chat_id,
-                            "caption": message.text,
-                        }
-                        if reply_markup:
-                            data["reply_markup"] = reply_markup
-                        url = f'https://api.telegram.org/bot{self.token}/sendPhoto'
-                        response = await client.post(url, data=data, files=files)
-                else:
-                    params = {
-                        "chat_id": message.chat_id,
-                        "text": message.text,
-                    }
-                    if reply_markup:
-                        params["reply_markup"] = reply_markup
-                    url = f'https://api.telegram.org/bot{self.token}/sendMessage'
-                    response = await client.post(url, params=params)
-
-                response.raise_for_status()
+            if message.image_path:
+                response = await self._send_photo(message, reply_markup)
+            else:
+                params = {
+                    "chat_id": message.chat_id,
+                    "text": message.text,
+                }
+                if reply_markup:
+                    params["reply_markup"] = reply_markup
+                response = await self.client.post(self._api_url("sendMessage"), params=params)
+
+            if response.status_code == 429:
+                parameters = response.json().get("parameters") or {}
+                return MessageSendingResultDto(retry_after=float(parameters.get("retry_after", 1)))
+
+            response.raise_for_status()
 
             return MessageSendingResultDto(sent_at=datetime.now())
         except Exception as e:
             logger.exception("Error sending message")
             return MessageSendingResultDto(error=str(e))
+
+    async def _send_photo(self, message: SendMessageDto, reply_markup: Optional[str]) -> Response:
+        data = {
+            "chat_id": message.chat_id,
+            "caption": message.text,
+        }
+        if reply_markup:
+            data["reply_markup"] = reply_markup
+
+        file_id = self._photo_file_ids.get(message.image_path)
+        if file_id is None:
+            # картинку загружает только первый получатель, остальные ждут его file_id
+            lock = self._photo_locks.setdefault(message.image_path, asyncio.Lock())
+            async with lock:
+                file_id = self._photo_file_ids.get(message.image_path)
+                if file_id is None:
+                    return await self._upload_photo(message.image_path, data)
+
+        response = await self.client.post(self._api_url("sendPhoto"), data={**data, "photo": file_id})
+        if response.status_code == 400:
+            # file_id больше не принимается — забываем его и загружаем файл заново
+            logger.warning(f"Cached file_id for {message.image_path} was rejected, uploading again")
+            self._photo_file_ids.pop(message.image_path, None)
+            return await self._upload_photo(message.image_path, data)
+
+        return response
+
+    async def _upload_photo(self, image_path: str, data: dict) -> Response:
+        with open(image_path, "rb") as image_file:
+            filename = os.path.basename(image_path)
+            files = {
+                "photo": (filename, image_file, "application/octet-stream")
+            }
+            response = await self.client.post(self._api_url("sendPhoto"), data=data, files=files)
+
+        if response.is_success:
+            # самый крупный размер из ответа — тот, что Telegram будет отдавать по file_id
+            photos = response.json().get("result", {}).get("photo") or []
+            if photos:
+                self._photo_file_ids[image_path] = photos[-1]["file_id"]
+
+        return response
+
+    def _api_url(self, method: str) -> str:
+        return f'https://api.telegram.org/bot{self.token}/{method}'
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from time import monotonic
+
+from abstractions.services.rate_limiter import RateLimiterInterface
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TelegramRateLimiter(RateLimiterInterface):
+    """
+    Token bucket на весь бот (global_rate сообщений в секунду, всплеск до global_burst)
+    плюс не чаще одного сообщения в per_chat_interval секунд в один чат.
+    """
+    global_rate: float = 30.0
+    global_burst: int = 30
+    per_chat_interval: float = 1.0
+    # после стольких чатов забываем те, чьё окно уже прошло
+    max_tracked_chats: int = 10000
+
+    _tokens: float = field(init=False)
+    _updated_at: float = field(default_factory=monotonic, init=False)
+    _paused_until: float = field(default=0.0, init=False)
+    _chat_next_at: dict[int, float] = field(default_factory=dict, init=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+
+    def __post_init__(self):
+        self._tokens = float(self.global_burst)
+
+    async def acquire(self, chat_id: int) -> None:
+        # слот в чате бронируем сразу, чтобы параллельные отправки в тот же чат встали друг за другом
+        now = monotonic()
+        chat_at = max(now, self._chat_next_at.get(chat_id, 0.0))
+        self._chat_next_at[chat_id] = chat_at + self.per_chat_interval
+        if len(self._chat_next_at) > self.max_tracked_chats:
+            self._forget_idle_chats(now)
+
+        if chat_at > now:
+            await asyncio.sleep(chat_at - now)
+
+        # общий лимит: ожидающие проходят по очереди в порядке захвата блокировки
+        async with self._lock:
+            while True:
+                now = monotonic()
+                if self._paused_until > now:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.global_rate)
+
+    def pause(self, seconds: float) -> None:
+        until = monotonic() + seconds
+        if until > self._paused_until:
+            logger.warning(f"Telegram asked to retry after {seconds}s, pausing deliveries")
+            self._paused_until = until
+            # после паузы не отправляем накопившийся всплеск разом
+            self._tokens = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(float(self.global_burst), self._tokens + elapsed * self.global_rate)
+
+    def _forget_idle_chats(self, now: float) -> None:
+        self._chat_next_at = {
+            chat_id: next_at
+            for chat_id, next_at in self._chat_next_at.items()
+            if next_at > now
+        }
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Optional
+from uuid import UUID
+
+from abstractions.repositories.user_push import UserPushRepositoryInterface
+from abstractions.services.status_writer import StatusWriterInterface
+from domain.dto.user_push import UserPushStatusDTO
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StatusWriter(StatusWriterInterface):
+    """
+    Итоги доставки копятся по user_push_id (новый итог того же пуша заменяет старый)
+    и раз в flush_interval уходят в БД пачками по batch_size через set_statuses.
+
+    Потерять итог не страшно: пуш останется IN_PROGRESS, и консьюмер (раз в requeue_interval)
+    вернёт его в очередь, когда пройдёт stale_after. Поэтому при остановке — одна попытка записи, без повторов.
+    """
+    user_push_repository: UserPushRepositoryInterface
+    batch_size: int = 500
+    flush_interval: float = 0.5
+
+    _pending: dict[UUID, UserPushStatusDTO] = field(default_factory=dict, init=False)
+    _task: Optional[asyncio.Task] = field(default=None, init=False)
+
+    async def write(self, dto: UserPushStatusDTO) -> None:
+        # фоновая запись не запущена — пишем сразу
+        if self._task is None:
+            await self.user_push_repository.set_statuses([dto])
+            return
+
+        self._pending[dto.user_push_id] = dto
+
+    async def flush(self) -> None:
+        pending, self._pending = list(self._pending.values()), {}
+        for start in range(0, len(pending), self.batch_size):
+            try:
+                await self.user_push_repository.set_statuses(pending[start:start + self.batch_size])
+            except BaseException:
+                # незаписанное возвращаем, но итоги, пришедшие за время записи, новее — их не трогаем
+                for dto in pending[start:]:
+                    self._pending.setdefault(dto.user_push_id, dto)
+                raise
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        try:
+            await self.flush()
+        except Exception:
+            logger.error(
+                f"{len(self._pending)} push statuses were not written on shutdown, "
+                f"they will be requeued as stale",
+                exc_info=True,
+            )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.warning(f"Failed to write {len(self._pending)} push statuses, retrying", exc_info=True)
@@ -38,10 +38,34 @@ class BotTokenSettings(AbstractSettings):
                 return self.local
 
 
+class DeliverySettings(AbstractSettings):
+    # параллельные отправки в процессе
+    workers: int = 16
+    # сколько пушей забирает из очереди один запрос
+    batch_size: int = 100
+    # лимиты Telegram на бота; при нескольких репликах делим global_rate между ними
+    global_rate: float = 30.0
+    global_burst: int = 30
+    per_chat_interval: float = 1.0
+    # повторы после 429 до пометки FAILED
+    max_retries: int = 5
+    # IN_PROGRESS дольше этого (сек.) — реплика упала, возвращаем пуш в очередь
+    stale_after: int = 600
+    # как часто (сек.) консьюмер проверяет зависшие пуши
+    requeue_interval: float = 60.0
+    # общий пул соединений к api.telegram.org
+    http2: bool = True
+    max_connections: int = 32
+    # итоги доставки пишутся пачками: не больше status_batch_size за раз и не реже status_flush_interval (сек.)
+    status_batch_size: int = 500
+    status_flush_interval: float = 0.5
+
+
 class Settings(AbstractSettings):
     db: DBSettings
 
     bot: BotTokenSettings
+    delivery: DeliverySettings
 
     debug: bool = True
 
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# модули notificator импортируются от корня сервиса, как в Dockerfile
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from services.consumer import Consumer
+
+
+class IdleUserPushRepo:
+    def __init__(self):
+        self.requeue_calls = []
+
+    async def requeue_stale(self, older_than):
+        self.requeue_calls.append(older_than)
+        return 0
+
+    async def claim_queued_pushes(self, limit):
+        return []
+
+
+@pytest.mark.asyncio
+async def test_consumer_requeues_stale_pushes_periodically():
+    repo = IdleUserPushRepo()
+    consumer = Consumer(
+        notification_repository=repo,
+        global_notification_delay=0.01,
+        workers=1,
+        requeue_interval=0.05,
+    )
+
+    task = asyncio.create_task(consumer.execute(notificator=None))
+    await asyncio.sleep(0.18)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # при старте и дальше по интервалу, а не только один раз
+    assert 3 <= len(repo.requeue_calls) <= 5
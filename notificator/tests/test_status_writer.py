@@ -0,0 +1,67 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from domain.dto.user_push import UserPushStatusDTO
+from infrastructure.db.enums.push_status import PushStatus
+from services.status_writer import StatusWriter
+
+
+class FakeUserPushRepo:
+    def __init__(self, fail: int = 0):
+        self.batches = []
+        self.fail = fail
+
+    async def set_statuses(self, updates):
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("db is down")
+        self.batches.append(list(updates))
+
+
+def _status(push_id, status=PushStatus.DELIVERED):
+    return UserPushStatusDTO(user_push_id=push_id, status=status, sent_at=datetime.now())
+
+
+@pytest.mark.asyncio
+async def test_writes_immediately_until_started():
+    repo = FakeUserPushRepo()
+    writer = StatusWriter(user_push_repository=repo)
+
+    await writer.write(_status(uuid4()))
+
+    assert len(repo.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_latest_status_per_push_wins_and_batches_are_split():
+    repo = FakeUserPushRepo()
+    writer = StatusWriter(user_push_repository=repo, batch_size=2, flush_interval=3600)
+    writer.start()
+    repeated = uuid4()
+
+    await writer.write(_status(repeated, PushStatus.FAILED))
+    for _ in range(2):
+        await writer.write(_status(uuid4()))
+    await writer.write(_status(repeated, PushStatus.DELIVERED))
+    await writer.close()
+
+    written = [dto for batch in repo.batches for dto in batch]
+    assert [len(batch) for batch in repo.batches] == [2, 1]
+    assert [dto.status for dto in written if dto.user_push_id == repeated] == [PushStatus.DELIVERED]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_statuses_without_overwriting_newer():
+    repo = FakeUserPushRepo(fail=1)
+    writer = StatusWriter(user_push_repository=repo, flush_interval=3600)
+    writer.start()
+    push_id = uuid4()
+
+    await writer.write(_status(push_id, PushStatus.FAILED))
+    with pytest.raises(RuntimeError):
+        await writer.flush()
+    await writer.close()
+
+    assert [dto.status for batch in repo.batches for dto in batch] == [PushStatus.FAILED]
@@ -0,0 +1,59 @@
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from domain.dto.user_push import UserPushStatusDTO
+from infrastructure.db.enums.push_status import PushStatus
+from infrastructure.db.repositories.user_push import UserPushRepository
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    @asynccontextmanager
+    async def begin(self):
+        yield
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+
+def make_repository():
+    session = RecordingSession()
+
+    @asynccontextmanager
+    async def session_maker():
+        yield session
+
+    return UserPushRepository(session_maker=session_maker), session
+
+
+def render(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_all_failed_batch_casts_sent_at():
+    repository, session = make_repository()
+
+    await repository.set_statuses([
+        UserPushStatusDTO(user_push_id=uuid4(), status=PushStatus.FAILED),
+        UserPushStatusDTO(user_push_id=uuid4(), status=PushStatus.FAILED),
+    ])
+
+    assert len(session.statements) == 1
+    sql = render(session.statements[0])
+    # без CAST колонка VALUES из одних NULL — text, и COALESCE с timestamp падает
+    assert "coalesce(CAST(results.sent_at AS TIMESTAMP WITHOUT TIME ZONE), user_pushes.sent_at)" in sql
+
+
+@pytest.mark.asyncio
+async def test_empty_batch_is_noop():
+    repository, session = make_repository()
+
+    await repository.set_statuses([])
+
+    assert session.statements == []